@@ -1,4 +1,4 @@
-"""SimpleLog defines the Logger and SingleLogger classes for multi-sink,
+"""SimpleLog defines the Logger, SingleLogger and AsyncLogger classes for multi-sink,
 thread-safe, formatted logging in Python applications.
 
 Usage Examples
@@ -163,6 +163,19 @@ bind() — Structured Context Logging
         2024-01-01 12:00:00 - api-server <WARNING>  [requestId=abc user=alice] slow query detected
         2024-01-01 12:00:00 - api-server <DEBUG>   [requestId=abc user=alice table=orders] executing query
 
+    With ``recordFormat="json"`` every record is one JSON object per line
+    (NDJSON) and the bound context becomes a ``context`` member instead of
+    a text prefix.
+
+    .. code-block:: python
+
+        l = Logger("api-server", logToFile=False, recordFormat="json")
+        l.bind(requestId="abc").info("request received")
+
+    .. code-block:: text
+
+        {"timestamp":"2024-01-01 12:00:00","logger":"api-server","logType":"info","level":10.0,"message":"request received","context":{"requestId":"abc"}}
+
 
 catch() — Exception Capture
 =============================
@@ -340,7 +353,22 @@ enqueue — Non-blocking Mode
                     maxQueueSize=100, queueFullPolicy="block",
                     queueBlockTimeout=2.0)
 
-        l2.flush(); l3.flush(); l4.flush()
+        ## group commit — one write and one flush per sink per batch
+        l5 = Logger("batched", enqueue=True, logToFile=False,
+                    groupCommit=True, batchMaxRecords=4096, batchLatency=0.005)
+
+        ## one queue and writer thread per sink — a slow sink only stalls itself
+        l6 = Logger("sharded", enqueue=True, logToFile=False,
+                    sinkWorkers=True, maxQueueSize=1000, queueFullPolicy="drop")
+        l6.add_sink("audit", open("audit.log", "a"), workerGroup="disk")
+
+        l2.flush(); l3.flush(); l4.flush(); l5.flush(); l6.flush()
+        print(l5.batchStatistics)
+        print(l6.sinkQueues)
+
+        ## lock-free ring buffer between callers and the writer thread
+        l7 = Logger("ring", enqueue=True, logToFile=False,
+                    queueBackend="ring", maxQueueSize=10000, queueFullPolicy="drop")
 
     **Output (stderr, when queue is full with policy="warn"):**
 
@@ -349,6 +377,33 @@ enqueue — Non-blocking Mode
         pysimplelog WARNING: queue full, record dropped (1 total dropped)
 
 
+RotationPolicy — Time-based Rotation
+======================================
+    Pass a ``RotationPolicy`` to rotate the log file on a schedule aligned
+    to the logger timezone, optionally combined with a size limit. The file
+    sink compares one precomputed epoch per record.
+
+    .. code-block:: python
+
+        from pysimplelog import Logger, RotationPolicy
+
+        ## new file every day at midnight in Europe/Paris, keep a week
+        l = Logger("daily", timezone="Europe/Paris", logFileRoll=7,
+                   rotationPolicy=RotationPolicy(when="day"))
+
+        ## new file every hour or whenever the current one reaches 100 MB
+        l2 = Logger("hybrid", rotationPolicy=RotationPolicy(maxSize="100MB", when="hour"))
+
+    Rotated files can be compressed in the background with ``compression``
+    set to ``'gzip'``, ``'bz2'`` or ``'lzma'``. ``logFileRoll`` counts
+    compressed files like any other.
+
+    .. code-block:: python
+
+        l3 = Logger("archived", logFileRoll=30, compression="gzip",
+                    rotationPolicy=RotationPolicy(when="midnight"))
+
+
 callerInfo — Caller Tagging
 ==============================
     Set ``callerInfo=True`` to prepend the source file, line number, and
@@ -387,12 +442,128 @@ callerInfo — Caller Tagging
         2024-01-01 12:00:00 - my-app <DEBUG> [handler.py:3 in handle_request] [requestId=req-001] request started
 
 
+RateLimit — Overload Protection
+=================================
+    ``set_rate_limit()`` attaches a token bucket to log types or sinks so an
+    error loop cannot flood the logs. Dropped records are counted and
+    announced once the limit lets records through again, by flush() and
+    at exit, or after ``summaryInterval`` seconds.
+
+    .. code-block:: python
+
+        from pysimplelog import Logger, RateLimit
+
+        l = Logger("my-app", logToFile=False)
+
+        ## at most 10 error records per second from every call site,
+        ## with bursts of up to 50; drops are announced within 5 seconds
+        ## even if the loop stops
+        l.set_rate_limit(RateLimit(10, burst=50, perCallSite=True, summaryInterval=5),
+                         logTypes=["error"])
+
+        ## a slow user sink never receives more than 100 records per second
+        l.add_sink("alerts", alertHandler)
+        l.set_rate_limit(RateLimit(100), sinks=["alerts"])
+
+    **Output** once the loop calms down:
+
+    .. code-block:: text
+
+        2024-01-01 12:00:01 - my-app <ERROR> 48213 similar messages from worker.py:88 in poll suppressed by the rate limit
+
+    Identical records that only differ in their timestamp can instead be
+    collapsed per sink, so a storm of the same error costs two lines of
+    log file rather than a rotation:
+
+    .. code-block:: python
+
+        l = Logger("my-app", duplicateWindow=30)
+        for _ in range(1000):
+            l.error("connection refused")
+        l.info("reconnected")
+
+    .. code-block:: text
+
+        2024-01-01 12:00:01 - my-app <ERROR> connection refused
+        2024-01-01 12:00:04 - my-app <ERROR> last message repeated 999 times
+        2024-01-01 12:00:04 - my-app <INFO> reconnected
+
+    High-volume log types can be sampled before their records are built,
+    keeping whole requests when the sample follows a bound context key:
+
+    .. code-block:: python
+
+        from pysimplelog import Logger, Sampling
+
+        l = Logger("my-app")
+        ## 1% of the requests keep their debug records, all of them
+        l.set_sampling(Sampling(ratio=0.01, contextKey="requestId"), logTypes=["debug"])
+        ## the first 100 info records of every second
+        l.set_sampling(Sampling(firstN=100), logTypes=["info"])
+        l.bind(requestId="r-42").debug("cache miss")
+
+    Debug records can stay off disk and still be there when they matter:
+    the flight recorder keeps the last records the file sink filters out
+    and writes them before the next error.
+
+    .. code-block:: python
+
+        l = Logger("my-app", fileMinLevel=10)
+        l.set_flight_recorder(500, triggerLevel="error", contextKey="requestId")
+
+
+AsyncLogger — asyncio Services
+================================
+    ``AsyncLogger`` always runs in enqueue mode and adds awaitable logging
+    methods. A full queue under the ``'block'`` policy makes the awaiting
+    task wait instead of parking the event loop thread.
+
+    .. code-block:: python
+
+        from pysimplelog import AsyncLogger
+
+        logger = AsyncLogger("service", maxQueueSize=10000, queueFullPolicy="block")
+
+        async def handle(requestId):
+            log = logger.bind(requestId=requestId)
+            await log.ainfo("request started")
+            await log.aerror("upstream timed out")
+
+        async def shutdown():
+            await logger.aflush()
+
+
 """
 # python standard distribution imports
-import os, sys, copy, re, atexit, threading, traceback, functools, inspect
-from datetime import datetime
+import os, sys, copy, re, time, atexit, threading, traceback, functools, inspect
+import gzip, shutil, mmap, io
+from random import random as _random
+from zlib import crc32 as _crc32
+from datetime import datetime, timedelta
+from json import JSONEncoder, dumps as _json_dumps
+# C-accelerated JSON string escaper (quotes included) -- measured faster
+# than any pure-Python check for strings that need no escaping
+from json.encoder import encode_basestring as _json_string
 
 import queue as _queue_module
+from collections import deque, OrderedDict
+
+# fcntl is POSIX only — multiprocess mode is unavailable without it
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# bz2 and lzma are optional parts of CPython builds — their compression
+# methods are unavailable without them
+try:
+    import bz2
+except ImportError:
+    bz2 = None
+try:
+    import lzma
+except ImportError:
+    lzma = None
 
 # Python 2 compatibility aliases — kept so that isinstance(x, basestring)
 # and isinstance(x, long) calls continue to work in any subclasses that
@@ -416,6 +587,9 @@ _QUEUE_STOP = object()
 _SINK_STDOUT = -1   # key for the built-in stdout sink
 _SINK_FILE   =  0   # key for the built-in file sink
 
+# rings kept by a per-thread or per-context flight recorder
+_RECORDER_MAX_RINGS = 1024
+
 # useful definitions
 def _is_number(number):
     """Return True if value can be interpreted as a Python number."""
@@ -428,6 +602,36 @@ def _is_number(number):
     else:
         return True
 
+# size suffixes accepted by _parse_size, binary multiples like the MB
+# unit logFileMaxSize has always used
+_SIZE_UNITS = {'B': 1, 'K': 1024, 'KB': 1024, 'M': 1024**2, 'MB': 1024**2,
+               'G': 1024**3, 'GB': 1024**3}
+_SIZE_RE    = re.compile(r"^\s*(\d+(?:\.\d*)?|\.\d+)\s*([KMG]?B|[KMG])\s*$", re.IGNORECASE)
+
+# str.isascii() is O(1) but only exists from Python 3.7
+_HAS_ISASCII = hasattr(str, 'isascii')
+
+# largest run of records the binary file mode encodes at once
+_BINARY_CHUNK_SIZE = 65536
+
+def _parse_size(size):
+    """Convert a size string such as '512KB', '10 MB' or '1.5GB' to bytes.
+
+    :Parameters:
+        #. size (string): A number followed by one of B, KB, MB, GB (or K,
+           M, G), case insensitive. Multiples are powers of 1024.
+
+    :Returns:
+        #. result (integer): The size in bytes.
+
+    :Raises:
+        #. ValueError: If *size* cannot be parsed.
+    """
+    match = _SIZE_RE.match(size)
+    if match is None:
+        raise ValueError("size '%s' must be a number followed by B, KB, MB or GB" % size)
+    return int(float(match.group(1)) * _SIZE_UNITS[match.group(2).upper()])
+
 def _normalize_path(path):
     """Normalise backslash sequences in a file path for Windows compatibility."""
     if os.sep=='\\':
@@ -438,33 +642,97 @@ def _normalize_path(path):
 # Resolved once at import time so frame-walking comparisons skip string work.
 _THIS_FILE = os.path.abspath(__file__)
 
+# sys._getframe is a CPython implementation detail; inspect.currentframe()
+# is the portable spelling and returns None where frames are unavailable
+_getframe = getattr(sys, '_getframe', None) or (lambda depth=0: inspect.currentframe())
+
+# Caller-info caches shared by every Logger. Dict reads and writes are
+# atomic under the GIL, so concurrent threads at worst compute an entry
+# twice. Both are cleared wholesale once they grow past _CALLER_CACHE_SIZE
+# so dynamically generated code cannot make them grow without bound. They
+# are keyed by strings, whose hash is cached, and never by code objects,
+# whose hash covers their constants and costs as much as the whole walk
+_CALLER_CACHE_SIZE = 65536
+_INTERNAL_FILES    = {}   # co_filename -> True if it is SimpleLog.py
+_CALLER_STRINGS    = {}   # (co_filename, lineno, co_name) -> '[file:line in func] '
 
-def _get_caller_str():
-    """Walk the call stack and return a formatted caller string.
+
+def _get_caller_site(offset=0):
+    """Return the call site that triggered the log call, as a cache key.
 
     Finds the first frame whose file is not SimpleLog.py -- that is the
-    line in user code that triggered the log call. Uses inspect.stack()
-    with context=0 (no source lines read from disk) for efficiency.
-    Only called when Logger.callerInfo is True.
+    line in user code that triggered the log call. Frames are walked
+    lazily through f_back starting from sys._getframe(), so no FrameInfo
+    objects are built for the rest of the stack, and whether a file is
+    SimpleLog.py is memoised, so a frame costs one dict lookup.
+
+    :Parameters:
+        #. offset (integer): Number of additional non-SimpleLog frames to
+           skip, for application wrappers around the logger.
+
+    :Returns:
+        #. result (None, tuple): (co_filename, lineno, co_name) of the
+           frame, or None if it cannot be determined. _caller_tag()
+           turns it into a tag.
+    """
+    try:
+        frame = _getframe(1)
+    except ValueError:
+        return None
+    internalFiles = _INTERNAL_FILES
+    while frame is not None:
+        code     = frame.f_code
+        filename = code.co_filename
+        internal = internalFiles.get(filename)
+        if internal is None:
+            if len(internalFiles) >= _CALLER_CACHE_SIZE:
+                internalFiles.clear()
+            internal = internalFiles[filename] = os.path.abspath(filename) == _THIS_FILE
+        if not internal:
+            if not offset:
+                return (filename, frame.f_lineno, code.co_name)
+            offset -= 1
+        frame = frame.f_back
+    return None
+
+
+def _caller_tag(site):
+    """Return the memoised '[file:line in func] ' tag of a _get_caller_site() key."""
+    result = _CALLER_STRINGS.get(site)
+    if result is None:
+        if len(_CALLER_STRINGS) >= _CALLER_CACHE_SIZE:
+            _CALLER_STRINGS.clear()
+        result = _CALLER_STRINGS[site] = '[%s:%d in %s] ' % (
+            os.path.basename(site[0]), site[1], site[2])
+    return result
+
+
+def _get_caller_str(offset=0):
+    """Walk the call stack and return a formatted caller string.
+
+    See _get_caller_site(). A warm call costs one dict lookup per frame
+    and one for the tag. Only called when Logger.callerInfo is True.
+
+    :Parameters:
+        #. offset (integer): Number of additional non-SimpleLog frames to
+           skip, for application wrappers around the logger.
 
     :Returns:
         #. result (str): e.g. '[routes.py:142 in handle_request] ' including
         trailing space so it sits neatly before the message. Returns an
         empty string if the frame cannot be determined.
     """
-    try:
-        for frameInfo in inspect.stack(context=0):
-            # frameInfo[1] is filename, [2] is lineno, [3] is function name
-            if os.path.abspath(frameInfo[1]) != _THIS_FILE:
-                fName = os.path.basename(frameInfo[1])
-                fLine = frameInfo[2]
-                fFunc = frameInfo[3]
-                return '[%s:%d in %s] ' % (fName, fLine, fFunc)
-    except Exception:
-        pass
-    return ''
+    site = _get_caller_site(offset)
+    if site is None:
+        return ''
+    return _caller_tag(site)
 
 
+# json record encoder for data and context members. json.dumps() with any
+# non-default option builds a new JSONEncoder per call
+_json_encode = JSONEncoder(ensure_ascii=False, allow_nan=False,
+                           separators=(',', ':'), default=str).encode
+
 # Compiled once at import time — used by _sanitize_message on every log call
 _CONTROL_CHAR_RE = re.compile(
     r'\x1b(?:\[[0-9;]*[mGKHFABCDsuJrhl]|\(B|[A-Z])'  # ANSI + VT escape sequences
@@ -494,6 +762,90 @@ def _sanitize_message(message):
         return message
     return _CONTROL_CHAR_RE.sub('', message)
 
+def _format_args(message, args):
+    """Merge %-style *args* into *message* like the standard logging module.
+
+    *args* is a tuple, a mapping, or a single value. A message that does
+    not match its arguments is logged with the arguments appended instead
+    of raising in the caller, or in the writer thread when formatting is
+    deferred.
+    """
+    try:
+        return ('%s' % (message,)) % args
+    except (TypeError, ValueError, KeyError) as error:
+        return '%s [args %r not formatted: %s]' % (message, args, error)
+
+def _duplicate_key(logType, message, data, tback, args, context):
+    """Return the key duplicate collapsing compares records by.
+
+    Records with data or a traceback are never collapsed and get None.
+    Otherwise the key is the logType, the message with its *args* merged
+    and the bound *context*, so records with equal keys differ only in
+    their timestamp.
+    """
+    if data is not None or tback is not None:
+        return None
+    if args is not None:
+        message = _format_args(message, args)
+    elif message.__class__ is not str:
+        message = '%s' % (message,)
+    return (logType, message, context)
+
+# Types whose instances cannot change after log() returns. Deferred
+# formatting keeps references to such arguments and copies nothing else
+_IMMUTABLE_TYPES = frozenset((str, bytes, int, float, bool, complex,
+                              type(None), datetime, timedelta))
+
+def _snapshot(value):
+    """Return a value safe to format later on another thread, or _UNSAFE.
+
+    Immutable values, and tuples or frozensets of them, are returned as
+    they are. A dict of immutable values, the mapping form of %-style
+    arguments, is copied. Anything else might be mutated by the caller
+    before the writer thread formats it and yields _UNSAFE.
+    """
+    cls = value.__class__
+    if cls in _IMMUTABLE_TYPES:
+        return value
+    if cls is tuple or cls is frozenset:
+        for v in value:
+            if v.__class__ not in _IMMUTABLE_TYPES and _snapshot(v) is _UNSAFE:
+                return _UNSAFE
+        return value
+    if cls is dict:
+        for v in value.values():
+            if v.__class__ not in _IMMUTABLE_TYPES and _snapshot(v) is _UNSAFE:
+                return _UNSAFE
+        return dict(value)
+    return _UNSAFE
+
+# marks a value _snapshot() cannot make safe to format later
+_UNSAFE = object()
+
+
+class _RecordTime(threading.local):
+    """Per-thread time of the record being formatted.
+
+    Set by enqueue writer threads while they format a deferred _LogRecord
+    so that _get_datetimestamp() stamps it with the time of the log()
+    call. None everywhere else, meaning now.
+    """
+    value = None
+
+_RECORD_TIME = _RecordTime()
+
+
+class _AsyncBacklog(threading.local):
+    """Backlog of the awaitable AsyncLogger call running on this thread.
+
+    None outside such a call. While set, a record meeting a full queue
+    under the 'block' policy is appended to it instead of parking the
+    thread, which is running an event loop.
+    """
+    records = None
+
+_ASYNC_BACKLOG = _AsyncBacklog()
+
 
 
 class _Sink(object):
@@ -527,16 +879,35 @@ class _Sink(object):
         #. isFileSink (bool): True only for _SINK_FILE. Signals the
            dispatch loop to run rotation checks after each write.
            Always False for stdout and user-added sinks.
+        #. durability (None, _Durability): Flush/fsync policy of this
+           sink. None means the logger-wide durability applies.
+        #. workerGroup (None, str): Name of the writer lane this sink
+           shares with other sinks when Logger.sinkWorkers is True. None
+           gives the sink a lane of its own.
     """
 
     def __init__(self, handler, enabled, logTypeFlags,
-                 minLevel=None, maxLevel=None, sinkType='stdout'):
+                 minLevel=None, maxLevel=None, sinkType='stdout',
+                 durability=None, workerGroup=None):
         self.handler      = handler
         self.enabled      = enabled
         self.logTypeFlags = logTypeFlags
         self.minLevel     = minLevel
         self.maxLevel     = maxLevel
         self.sinkType     = sinkType   # 'stdout' | 'file' | 'user'
+        self.durability   = durability
+        self.workerGroup  = workerGroup
+        # _SinkLane serving this sink, set only when sinkWorkers is True
+        self.lane         = None
+        # fsync bookkeeping for 'flush' durability triggers
+        self.unsynced     = 0
+        self.lastSync     = time.time()
+        # _TokenBucket set by Logger.set_rate_limit(sinks=...), or None
+        self.bucket       = None
+        # _Sampler set by Logger.set_sampling(sinks=...), or None
+        self.sampler      = None
+        # _Collapser set by Logger.set_duplicate_window(), or None
+        self.collapser    = None
 
     @property
     def isFileSink(self):
@@ -550,6 +921,866 @@ class _Sink(object):
         )
 
 
+class _Durability(object):
+    """Internal description of when a sink stream is flushed and fsync'ed.
+
+    Not part of the public API. Built by Logger.set_durability() and
+    stored either as the logger-wide default or on an individual _Sink.
+
+    :Parameters:
+        #. mode (string): ``'none'`` never flushes after a write,
+           ``'flush'`` calls stream.flush() after every write and
+           ``'fsync'`` additionally calls os.fsync() after every write.
+        #. every (None, integer): In ``'flush'`` mode, fsync once this many
+           records were written since the last fsync.
+        #. interval (None, float): In ``'flush'`` mode, fsync when at least
+           this many seconds elapsed since the last fsync.
+        #. level (None, float): In ``'flush'`` mode, fsync after any record
+           whose level is greater or equal to this value.
+    """
+    __slots__ = ('mode', 'every', 'interval', 'level')
+
+    def __init__(self, mode, every=None, interval=None, level=None):
+        self.mode     = mode
+        self.every    = every
+        self.interval = interval
+        self.level    = level
+
+    def __repr__(self):
+        return (
+            '_Durability(mode=%r, every=%r, interval=%r, level=%r)'
+            % (self.mode, self.every, self.interval, self.level)
+        )
+
+
+# variable parts masked by countConstraintKey='template': UUIDs, 0x
+# numbers, long hex digests, then any run of digits
+_COUNT_TEMPLATE_RE = re.compile(
+    r'[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}'
+    r'|0[xX][0-9a-fA-F]+|\b[0-9a-fA-F]{16,}\b|\d+'
+)
+
+
+class _CountTracker(object):
+    """Internal bounded, thread-safe store of countConstraint counts.
+
+    Not part of the public API. Keeps the number of calls seen per key
+    in an OrderedDict used as an LRU: a key is moved to the end on every
+    call and the least recently used key is evicted once *capacity* keys
+    are held. An evicted message starts counting again from zero.
+
+    :Parameters:
+        #. capacity (None, integer): Maximum number of keys. None keeps
+           every key, like releases before the tracker existed.
+        #. keyMode (string): ``'message'`` counts the message as given,
+           ``'template'`` masks numbers and identifiers first so that
+           messages differing only in ids share one count.
+    """
+    __slots__ = ('capacity', 'keyMode', 'counts', 'evictions', 'suppressed', 'lock')
+
+    def __init__(self, capacity, keyMode):
+        self.capacity   = capacity
+        self.keyMode    = keyMode
+        self.counts     = OrderedDict()
+        self.evictions  = 0
+        self.suppressed = 0
+        self.lock       = threading.Lock()
+
+    def key(self, message):
+        """Return the key *message* is counted under."""
+        if self.keyMode == 'template':
+            return _COUNT_TEMPLATE_RE.sub('#', message if message.__class__ is str else str(message))
+        return message
+
+    def allow(self, message, limit):
+        """Count one call of *message* and return whether it may be logged."""
+        key = self.key(message)
+        with self.lock:
+            counts = self.counts
+            calls  = counts.get(key)
+            if calls is None:
+                calls = 0
+                if self.capacity is not None and len(counts) >= self.capacity:
+                    counts.popitem(last=False)
+                    self.evictions += 1
+            else:
+                counts.move_to_end(key)
+            counts[key] = calls + 1
+            if calls < limit:
+                return True
+            self.suppressed += 1
+            return False
+
+    def resize(self, capacity):
+        """Set the capacity, evicting the least recently used keys."""
+        with self.lock:
+            self.capacity = capacity
+            while capacity is not None and len(self.counts) > capacity:
+                self.counts.popitem(last=False)
+                self.evictions += 1
+
+    def statistics(self):
+        """Return the counters and an estimate of the memory held, in bytes."""
+        with self.lock:
+            items = list(self.counts.items())
+            stats = {'entries':    len(items),
+                     'capacity':   self.capacity,
+                     'evictions':  self.evictions,
+                     'suppressed': self.suppressed}
+            size  = sys.getsizeof(self.counts)
+        size += sum(sys.getsizeof(k) + sys.getsizeof(v) for k, v in items)
+        stats['memoryBytes'] = size
+        return stats
+
+    def __repr__(self):
+        return (
+            '_CountTracker(keyMode=%r, entries=%d, capacity=%r)'
+            % (self.keyMode, len(self.counts), self.capacity)
+        )
+
+
+class _TokenBucket(object):
+    """Internal token bucket enforcing one RateLimit.
+
+    Not part of the public API. Tokens refill at rate per second up to
+    burst and every admitted record takes one, so a check costs a clock
+    read and a few float operations. Buckets take no lock: concurrent
+    callers may admit a record more or less than the exact budget.
+
+    :Parameters:
+        #. limit (RateLimit): The rate, burst and clock to apply.
+    """
+    __slots__ = ('limit', 'rate', 'burst', 'clock', 'tokens', 'stamp', 'suppressed', 'total',
+                 'logType')
+
+    def __init__(self, limit):
+        self.limit      = limit
+        self.rate       = limit.rate
+        self.burst      = limit.burst
+        self.clock      = limit.clock
+        self.tokens     = limit.burst
+        self.stamp      = limit.clock()
+        self.suppressed = 0   # since the last summary
+        self.total      = 0
+        self.logType    = None   # of the last suppressed record
+
+    def take(self, logType=None):
+        """Take one token and return True, or count a suppression and return False.
+
+        :Parameters:
+            #. logType (None, string): logType of the record, kept for the
+               summary of a sink bucket.
+        """
+        now    = self.clock()
+        tokens = self.tokens + (now - self.stamp) * self.rate
+        self.stamp = now
+        if tokens >= 1.0:
+            self.tokens = (tokens if tokens < self.burst else self.burst) - 1.0
+            return True
+        self.tokens      = tokens
+        self.suppressed += 1
+        self.total      += 1
+        self.logType     = logType
+        return False
+
+
+class _RateLimiter(object):
+    """Internal per-logType holder of a RateLimit and its bucket(s).
+
+    Not part of the public API. Holds a single bucket, or with
+    perCallSite one bucket per _get_caller_site() key, cleared wholesale
+    once it holds _CALLER_CACHE_SIZE sites.
+    """
+    __slots__ = ('limit', 'bucket', 'sites')
+
+    def __init__(self, limit):
+        self.limit  = limit
+        self.bucket = None if limit.perCallSite else _TokenBucket(limit)
+        self.sites  = {}
+
+    def site_bucket(self, site):
+        """Return the bucket of the call site *site*."""
+        bucket = self.sites.get(site)
+        if bucket is None:
+            if len(self.sites) >= _CALLER_CACHE_SIZE:
+                self.sites.clear()
+            bucket = self.sites[site] = _TokenBucket(self.limit)
+        return bucket
+
+    def pending(self):
+        """Return (site, bucket) pairs of the buckets with unannounced drops."""
+        if self.bucket is not None:
+            return [(None, self.bucket)] if self.bucket.suppressed else []
+        return [(site, b) for site, b in list(self.sites.items()) if b.suppressed]
+
+    @property
+    def suppressed(self):
+        """Total records suppressed by this limiter."""
+        if self.bucket is not None:
+            return self.bucket.total
+        return sum(b.total for b in list(self.sites.values()))
+
+
+class _Sampler(object):
+    """Internal state of one Sampling attached to a logType or a sink.
+
+    Not part of the public API. keep() costs a random number, a crc32 of
+    the context value or a clock read. Like _TokenBucket it takes no
+    lock, so firstN may let a record more or less through under
+    concurrent calls.
+
+    :Parameters:
+        #. sampling (Sampling): The rule to apply.
+    """
+    __slots__ = ('sampling', 'ratio', 'firstN', 'window', 'clock', 'contextKey',
+                 'windowStart', 'count', 'sampledOut')
+
+    def __init__(self, sampling):
+        self.sampling    = sampling
+        self.ratio       = sampling.ratio
+        self.firstN      = sampling.firstN
+        self.window      = sampling.window
+        self.clock       = sampling.clock
+        self.contextKey  = sampling.contextKey
+        self.windowStart = sampling.clock()
+        self.count       = 0
+        self.sampledOut  = 0
+
+    def keep(self, context):
+        """Return True if the record is kept, else count it and return False.
+
+        :Parameters:
+            #. context (None, dict): Context of the bound logger the record
+               was logged through, read when the rule has a contextKey.
+        """
+        if self.firstN is not None:
+            now = self.clock()
+            if now - self.windowStart >= self.window:
+                self.windowStart, self.count = now, 0
+            if self.count < self.firstN:
+                self.count += 1
+                return True
+        elif self.contextKey is not None and context and self.contextKey in context:
+            value = context[self.contextKey]
+            if _crc32(('%s' % (value,)).encode('utf-8')) < self.ratio * 4294967296.0:
+                return True
+        elif _random() < self.ratio:
+            return True
+        self.sampledOut += 1
+        return False
+
+
+class _Collapser(object):
+    """Internal state of duplicate collapsing on one sink.
+
+    Not part of the public API. Holds the key of the last record written
+    to the sink and how many identical records were dropped since, so the
+    memory used is one key per sink. A record repeats the last one when
+    its key is equal and it was logged less than window seconds after the
+    record that started the run. The lock orders the repeats check with
+    the writes of the sink when several threads dispatch to it; it is
+    reentrant so a user sink that logs from write() cannot deadlock.
+
+    :Parameters:
+        #. window (number): Seconds during which repeats are collapsed.
+    """
+    __slots__ = ('window', 'lock', 'key', 'first', 'repeated', 'collapsed')
+
+    def __init__(self, window):
+        self.window    = window
+        self.lock      = threading.RLock()
+        self.key       = None
+        self.first     = 0.0
+        self.repeated  = 0   # in the current run
+        self.collapsed = 0
+
+    def repeats(self, key, timestamp):
+        """Return True and count the record if it repeats the last one."""
+        if key is not None and key == self.key and timestamp - self.first < self.window:
+            self.repeated  += 1
+            self.collapsed += 1
+            return True
+        return False
+
+    def restart(self, key, timestamp):
+        """Start a run with *key* and return the (logType, repeats) it ends, or None."""
+        previous, repeated = self.key, self.repeated
+        self.key, self.first, self.repeated = key, timestamp, 0
+        if repeated:
+            return previous[0], repeated
+        return None
+
+    def __repr__(self):
+        return '_Collapser(window=%r, collapsed=%d)' % (self.window, self.collapsed)
+
+
+class _RecordRing(object):
+    """Internal fixed-size ring of _LogRecord objects.
+
+    Not part of the public API. The slot list is allocated once; a full
+    ring overwrites its oldest record.
+    """
+    __slots__ = ('slots', 'index', 'size')
+
+    def __init__(self, capacity):
+        self.slots = [None] * capacity
+        self.index = 0
+        self.size  = 0
+
+    def append(self, record):
+        """Store *record*, returning True if it overwrote the oldest one."""
+        slots = self.slots
+        index = self.index
+        slots[index] = record
+        index += 1
+        self.index = index if index < len(slots) else 0
+        if self.size == len(slots):
+            return True
+        self.size += 1
+        return False
+
+    def drain(self):
+        """Return the stored records, oldest first, and empty the ring."""
+        slots, size = self.slots, self.size
+        start   = (self.index - size) % len(slots)
+        records = [slots[(start + i) % len(slots)] for i in range(size)]
+        for i in range(len(slots)):
+            slots[i] = None
+        self.index = self.size = 0
+        return records
+
+
+class _FlightRecorder(object):
+    """Internal state of the flight recorder set by Logger.set_flight_recorder().
+
+    Not part of the public API. Holds one _RecordRing, or one per thread
+    or per value of a bound context key, the least recently used of
+    which is discarded once _RECORDER_MAX_RINGS rings exist.
+
+    :Parameters:
+        #. capacity (integer): Records kept by every ring.
+        #. triggerLevel (number): Level of the records that dump a ring.
+        #. perThread (boolean): Keep a ring per thread.
+        #. contextKey (None, string): Keep a ring per value bound under
+           this key with Logger.bind().
+    """
+
+    def __init__(self, capacity, triggerLevel, perThread, contextKey):
+        self.capacity     = capacity
+        self.triggerLevel = triggerLevel
+        self.perThread    = perThread
+        self.contextKey   = contextKey
+        self.keyed        = perThread or contextKey is not None
+        self.lock         = threading.Lock()
+        self.rings        = OrderedDict()
+        self.recorded     = 0
+        self.overwritten  = 0
+        self.dumps        = 0
+
+    def ring_key(self, context):
+        """Return the key of the ring serving a record logged with *context*."""
+        if self.perThread:
+            return threading.current_thread().ident
+        if self.contextKey is not None and context:
+            return context.get(self.contextKey)
+        return None
+
+    def append(self, record, context):
+        """Keep *record* in the ring of *context*."""
+        key = self.ring_key(context) if self.keyed else None
+        with self.lock:
+            ring = self.rings.get(key)
+            if ring is None:
+                if len(self.rings) >= _RECORDER_MAX_RINGS:
+                    self.rings.popitem(last=False)
+                ring = self.rings[key] = _RecordRing(self.capacity)
+            elif self.keyed:
+                self.rings.move_to_end(key)
+            self.recorded += 1
+            if ring.append(record):
+                self.overwritten += 1
+
+    def drain(self, context):
+        """Return and forget the records of the ring of *context*, oldest first."""
+        with self.lock:
+            ring = self.rings.pop(self.ring_key(context), None)
+            if ring is None:
+                return []
+            self.dumps += 1
+            return ring.drain()
+
+    def buffered(self):
+        """Number of records held by all rings."""
+        with self.lock:
+            return sum(ring.size for ring in self.rings.values())
+
+
+class _SinkLane(object):
+    """Internal queue and writer thread serving one group of sinks.
+
+    Not part of the public API. Created by Logger when sinkWorkers is
+    True so that a slow sink only backs up its own queue.
+
+    A lane whose last sink was removed is retired: its stop sentinel is
+    queued and a record that a log() call still holding the previous
+    routing table queues after it is written by that caller, see
+    Logger.__drain_retired_lane().
+
+    :Parameters:
+        #. name (string): Lane name, used in the thread name and in
+           queue-full warnings.
+        #. queue (queue.Queue): The bounded queue drained by *worker*.
+    """
+    __slots__ = ('name', 'queue', 'worker', 'dropped', 'sinks', 'retired')
+
+    def __init__(self, name, queue):
+        self.name    = name
+        self.queue   = queue
+        self.worker  = None
+        self.dropped = 0       # guarded by Logger.__droppedLock
+        self.sinks   = 0       # number of registered sinks using this lane
+        self.retired = False   # set once the stop sentinel is queued
+
+    def __repr__(self):
+        return (
+            '_SinkLane(name=%r, sinks=%r, dropped=%r)'
+            % (self.name, self.sinks, self.dropped)
+        )
+
+
+class _LogRecord(object):
+    """Internal record queued for the enqueue writer threads.
+
+    Not part of the public API. Built by log() and force_log() when
+    enqueue is True; the writer dispatches *text* to *sinks*. *text* is
+    None until a deferred record is formatted by the writer thread.
+
+    :Parameters:
+        #. timestamp (float): Epoch seconds of the log() call.
+        #. level (None, number): Level of *logType*.
+        #. logType (string): The log type name.
+        #. message (object): The message as passed to log().
+        #. args (None, object): %-style arguments for *message*.
+        #. data (None, object): Optional data payload.
+        #. tback (None, str, list): Optional traceback.
+        #. caller (string): Caller tag, or an empty string.
+        #. context (None, dict): Bound context of a json record.
+        #. sinks (tuple): The _Sink objects the record is routed to.
+        #. version (integer): Generation of the _SinkTable *sinks* was
+           read from.
+
+    *key* is the duplicate-collapsing key of the record, set with its
+    text while a sink collapses duplicates, see _duplicate_key().
+    """
+    __slots__ = ('timestamp', 'level', 'logType', 'message', 'args', 'data',
+                 'tback', 'caller', 'context', 'sinks', 'version', 'text', 'key')
+
+    def __init__(self, timestamp, level, logType, message, args, data,
+                 tback, caller, context, sinks, version):
+        self.timestamp = timestamp
+        self.level     = level
+        self.logType   = logType
+        self.message   = message
+        self.args      = args
+        self.data      = data
+        self.tback     = tback
+        self.caller    = caller
+        self.context   = context
+        self.sinks     = sinks
+        self.version   = version
+        self.text      = None
+        self.key       = None
+
+    def routed(self, sinks):
+        """Return this record routed to *sinks*, copied if they differ."""
+        if sinks is self.sinks:
+            return self
+        record = _LogRecord(self.timestamp, self.level, self.logType, self.message,
+                            self.args, self.data, self.tback, self.caller,
+                            self.context, sinks, self.version)
+        record.text = self.text
+        record.key  = self.key
+        return record
+
+    def __repr__(self):
+        return (
+            '_LogRecord(logType=%r, timestamp=%r, sinks=%d, version=%r)'
+            % (self.logType, self.timestamp, len(self.sinks), self.version)
+        )
+
+
+class _SinkTable(object):
+    """Internal immutable snapshot of the per-logType routing cache.
+
+    Not part of the public API. Logger.__rebuild_active_sinks builds a
+    new table on every routing change and swaps it in with a single
+    attribute assignment, so log() reads one consistent table without a
+    lock or a copy while add_sink() and friends run on other threads.
+
+    :Parameters:
+        #. active (dict): logType -> tuple of the _Sink objects receiving it.
+        #. lanes (dict): logType -> list of (_SinkLane, tuple of _Sink)
+           pairs when sinkWorkers is True, empty otherwise.
+        #. generation (integer): Incremented by every rebuild; carried by
+           queued records as their sink-set version.
+        #. recorded (frozenset): logTypes kept by the flight recorder.
+        #. triggers (frozenset): logTypes that dump the flight recorder.
+    """
+    __slots__ = ('active', 'lanes', 'generation', 'recorded', 'triggers')
+
+    def __init__(self, active, lanes, generation, recorded=frozenset(), triggers=frozenset()):
+        self.active     = active
+        self.lanes      = lanes
+        self.generation = generation
+        self.recorded   = recorded
+        self.triggers   = triggers
+
+    def __repr__(self):
+        return '_SinkTable(logTypes=%d, generation=%r)' % (len(self.active), self.generation)
+
+
+class _RingQueue(object):
+    """Internal single-consumer queue used when Logger.queueBackend is 'ring'.
+
+    Not part of the public API. Exposes the subset of the queue.Queue
+    interface used by the enqueue worker -- put(), put_nowait(), get(),
+    get_nowait(), task_done(), join(), qsize() and a writable maxsize --
+    and raises queue.Full and queue.Empty like queue.Queue does.
+
+    Records live in a collections.deque whose append() and popleft() are
+    atomic, so the common put() takes no lock at all. Locks are only
+    taken on slow paths: a producer parked on a full queue under the
+    'block' policy, the consumer parked on an empty queue, and join().
+    The capacity check is not atomic with the append, so under heavy
+    contention the queue may briefly exceed maxsize by at most the number
+    of producer threads racing for the last slot.
+
+    Exactly one thread may call get(); every Logger queue is drained by
+    its own writer thread so that always holds.
+
+    :Parameters:
+        #. maxsize (integer): Capacity. 0 means unbounded.
+    """
+
+    def __init__(self, maxsize=0):
+        self.maxsize   = maxsize
+        self._items    = deque()
+        # consumer wake-up: set by producers only while the consumer waits
+        self._ready    = threading.Event()
+        self._waiting  = False
+        # producers parked on a full queue ('block' policy)
+        self._notFull  = threading.Condition(threading.Lock())
+        self._blocked  = 0
+        # join() bookkeeping; _gets and _dones are written by the consumer only
+        self._gets     = 0
+        self._dones    = 0
+        self._allDone  = threading.Condition(threading.Lock())
+        self._joiners  = 0
+
+    def qsize(self):
+        return len(self._items)
+
+    def put(self, item, block=True, timeout=None):
+        maxsize = self.maxsize
+        if maxsize > 0 and len(self._items) >= maxsize:
+            if not block:
+                raise _queue_module.Full
+            self._wait_not_full(timeout)
+        self._items.append(item)
+        if self._waiting:
+            self._ready.set()
+
+    def put_nowait(self, item):
+        self.put(item, block=False)
+
+    def _wait_not_full(self, timeout):
+        deadline = None if timeout is None else time.time() + timeout
+        with self._notFull:
+            self._blocked += 1
+            try:
+                while 0 < self.maxsize <= len(self._items):
+                    if deadline is None:
+                        self._notFull.wait()
+                    else:
+                        remaining = deadline - time.time()
+                        if remaining <= 0:
+                            raise _queue_module.Full
+                        self._notFull.wait(remaining)
+            finally:
+                self._blocked -= 1
+
+    def get(self, block=True, timeout=None):
+        items    = self._items
+        deadline = None if timeout is None else time.time() + timeout
+        while True:
+            # count the get before popping so join() never sees an empty
+            # queue while a record is between popleft() and task_done()
+            self._gets += 1
+            try:
+                item = items.popleft()
+            except IndexError:
+                self._gets -= 1
+            else:
+                if self._blocked:
+                    with self._notFull:
+                        self._notFull.notify()
+                return item
+            if not block:
+                raise _queue_module.Empty
+            remaining = None
+            if deadline is not None:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    raise _queue_module.Empty
+            # announce the wait before the final emptiness check so a
+            # producer appending after that check always sets the event
+            self._ready.clear()
+            self._waiting = True
+            if not items:
+                self._ready.wait(remaining)
+            self._waiting = False
+
+    def get_nowait(self):
+        return self.get(block=False)
+
+    def task_done(self):
+        self._dones += 1
+        if self._joiners:
+            with self._allDone:
+                self._allDone.notify_all()
+
+    def join(self):
+        with self._allDone:
+            self._joiners += 1
+            try:
+                while self._items or self._gets != self._dones:
+                    self._allDone.wait()
+            finally:
+                self._joiners -= 1
+
+
+# rotated log file compression methods: name -> (suffix, module)
+_COMPRESSION_METHODS = {'gzip': ('.gz',  gzip),
+                        'bz2':  ('.bz2', bz2),
+                        'lzma': ('.xz',  lzma)}
+_COMPRESSED_SUFFIXES = tuple(v[0] for v in _COMPRESSION_METHODS.values())
+
+
+class _Compressor(object):
+    """Internal pool compressing rotated log files in the background.
+
+    Not part of the public API. Created by Logger when compression is set.
+    Jobs are queued by the logging thread at rotation time and run on at
+    most *maxJobs* daemon threads, started on demand. zlib, bz2 and lzma
+    release the GIL while they compress, so the threads do not stall the
+    logging threads.
+
+    A file is compressed to '<path><suffix>.tmp' first. The temporary
+    file is renamed and the original removed under the owning logger's
+    rotation lock, so a file rolled away meanwhile is never resurrected
+    as a compressed copy.
+
+    :Parameters:
+        #. method (string): One of the _COMPRESSION_METHODS keys.
+        #. maxJobs (integer): Maximum number of files compressed at once.
+    """
+
+    def __init__(self, method, maxJobs):
+        self.method   = method
+        self.suffix   = _COMPRESSION_METHODS[method][0]
+        self.maxJobs  = maxJobs
+        self.failed   = 0
+        self._module  = _COMPRESSION_METHODS[method][1]
+        self._queue   = _queue_module.Queue()
+        self._threads = []
+        self._pending = set()
+        self._lock    = threading.Lock()
+
+    def __repr__(self):
+        return (
+            '_Compressor(method=%r, maxJobs=%r, pending=%r)'
+            % (self.method, self.maxJobs, len(self._pending))
+        )
+
+    @property
+    def pending(self):
+        return len(self._pending)
+
+    def submit(self, path, lock):
+        """Queue *path* for compression unless it is already queued."""
+        with self._lock:
+            if path in self._pending:
+                return
+            self._pending.add(path)
+            if len(self._threads) < self.maxJobs:
+                worker = threading.Thread(target=self._run,
+                                          name="pysimplelog-compressor")
+                worker.daemon = True
+                worker.start()
+                self._threads.append(worker)
+        self._queue.put((path, lock))
+
+    def join(self):
+        """Wait for every queued file to be compressed."""
+        self._queue.join()
+
+    def close(self):
+        """Stop the threads once the files already queued are compressed."""
+        with self._lock:
+            threads, self._threads = self._threads, []
+        for _ in threads:
+            self._queue.put(None)
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            try:
+                if job is None:
+                    return
+                self._compress(*job)
+            finally:
+                self._queue.task_done()
+
+    def _compress(self, path, lock):
+        target = path + self.suffix
+        tmp    = target + '.tmp'
+        try:
+            with open(path, 'rb') as src, self._module.open(tmp, 'wb') as dst:
+                shutil.copyfileobj(src, dst, 1048576)
+            with lock:
+                if os.path.isfile(path):
+                    os.replace(tmp, target)
+                    os.remove(path)
+                else:
+                    os.remove(tmp)
+        except OSError:
+            # the file was rolled away before it was opened, or the disk
+            # is full -- the original is kept uncompressed
+            self.failed += 1
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+        finally:
+            with self._lock:
+                self._pending.discard(path)
+
+
+class _MmapSegment(object):
+    """Internal file-like writer used when Logger.fileMode is 'mmap'.
+
+    Not part of the public API. The log file is preallocated to
+    *capacity* bytes and mapped into memory; records are copied at the
+    cursor of the map, so no system call is made per record. The file
+    sink calls map.write() itself and falls back on write(), which grows
+    the file by *growth* bytes and remaps it, when a record does not
+    fit. *used* is the cursor when the map was created or closed.
+    close() truncates the file to the bytes written.
+
+    Stores into the shared mapping are visible to readers of the file at
+    once, so flush() does nothing; fileno() lets os.fsync() write the
+    dirty pages to disk.
+
+    A process that dies before close() leaves the file padded with NUL
+    bytes up to its capacity. Every record ends with a newline, so the
+    padding is the run of NUL bytes after the last newline, even when the
+    data or traceback text of a record holds NUL bytes: a reopened
+    segment resumes after its last record, see used_length().
+
+    :Parameters:
+        #. path (string): The log file path.
+        #. capacity (None, integer): Size to preallocate. None preallocates
+           *growth* bytes past the data already in the file.
+        #. growth (integer): Bytes added when a record does not fit.
+    """
+    __slots__ = ('fd', 'map', 'used', 'capacity', 'growth')
+
+    def __init__(self, path, capacity, growth):
+        self.fd     = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        self.map    = None
+        self.growth = growth
+        try:
+            self.used = self.used_length(self.fd, os.fstat(self.fd).st_size)
+            if capacity is None:
+                capacity = self.used + growth
+            self.capacity = max(capacity, self.used, 1)
+            self._map()
+        except BaseException:
+            os.close(self.fd)
+            raise
+
+    def __repr__(self):
+        return '_MmapSegment(used=%r, capacity=%r)' % (self.used, self.capacity)
+
+    @staticmethod
+    def used_length(fd, size):
+        """Return the length of the first *size* bytes of *fd* without
+        their trailing NUL padding, reading backwards in 64 KB chunks."""
+        end = size
+        while end > 0:
+            start = max(0, end - 65536)
+            os.lseek(fd, start, os.SEEK_SET)
+            chunk = os.read(fd, end - start).rstrip(b'\0')
+            if chunk:
+                return start + len(chunk)
+            end = start
+        return 0
+
+    def _map(self):
+        if os.fstat(self.fd).st_size < self.capacity:
+            try:
+                os.posix_fallocate(self.fd, 0, self.capacity)
+            except (AttributeError, OSError):
+                # not POSIX, or a file system without fallocate support
+                os.ftruncate(self.fd, self.capacity)
+        self.map = mmap.mmap(self.fd, self.capacity)
+        self.map.seek(self.used)
+
+    def write(self, data):
+        # mmap.write() copies at the map's own cursor in C and raises
+        # ValueError, leaving the map untouched, when data does not fit
+        try:
+            return self.map.write(data)
+        except ValueError:
+            self.used = self.map.tell()
+            self.map.close()
+            self.capacity = max(self.used + len(data), self.capacity + self.growth)
+            self._map()
+            return self.map.write(data)
+
+    def flush(self):
+        pass
+
+    def fileno(self):
+        return self.fd
+
+    def close(self):
+        if self.map is None:
+            return
+        try:
+            self.used = self.map.tell()
+            self.map.close()
+            os.ftruncate(self.fd, self.used)
+        finally:
+            self.map = None
+            os.close(self.fd)
+
+
+def _trim_log_file(path):
+    """Cut the NUL padding an interrupted 'mmap' segment left at the end of *path*."""
+    try:
+        fd = os.open(path, os.O_RDWR)
+    except OSError:
+        return
+    try:
+        size = os.fstat(fd).st_size
+        used = _MmapSegment.used_length(fd, size)
+        if used < size:
+            os.ftruncate(fd, used)
+    finally:
+        os.close(fd)
+
+
 class _CatchContext(object):
     """Context manager and decorator returned by Logger.catch().
 
@@ -593,9 +1824,11 @@ class _BoundLogger(object):
     """Lightweight context-aware wrapper returned by Logger.bind().
 
     Prepends a fixed set of key=value pairs to every message before
-    delegating to the parent Logger. The wrapper holds no queue, no
-    file handle, and no configuration state of its own -- all I/O is
-    performed by the parent Logger unchanged.
+    delegating to the parent Logger. When the parent's recordFormat is
+    'json' the pairs are handed over as the record's context member
+    instead. The wrapper holds no queue, no file handle, and no
+    configuration state of its own -- all I/O is performed by the parent
+    Logger unchanged.
 
     Instances are immutable after construction and therefore inherently
     thread-safe. Nested bind() calls produce a new _BoundLogger with a
@@ -633,12 +1866,15 @@ class _BoundLogger(object):
         pairs = ' '.join('%s=%s' % (k, v) for k, v in self.__context.items())
         return '[' + pairs + '] '
 
-    def __prefixed(self, message):
+    def __prefixed(self, message, args=None):
         """Prepend the context prefix to a message.
 
         :Parameters:
             #. message (object): The raw message. Non-string types are
                coerced via str() so the prefix concatenation is safe.
+            #. args (None, object): The %-style arguments of the call.
+               When given, '%' in the prefix is escaped so the context
+               values are never read as format specifiers.
 
         :Returns:
             #. result (str): Prefix + message as a single string, or the
@@ -647,6 +1883,8 @@ class _BoundLogger(object):
         prefix = self.__build_prefix()
         if not prefix:
             return message
+        if args is not None:
+            prefix = prefix.replace('%', '%%')
         return prefix + str(message)
 
     # ── context nesting ──────────────────────────────────────────────
@@ -666,15 +1904,16 @@ class _BoundLogger(object):
         """
         merged = dict(self.__context)
         merged.update(extra)
-        return _BoundLogger(self.__parent, merged)
+        return self.__class__(self.__parent, merged)
 
     # ── core logging ─────────────────────────────────────────────────
 
-    def log(self, logType, message, data=None, tback=None, countConstraint=None):
+    def log(self, logType, message, data=None, tback=None, countConstraint=None, args=None):
         """Log a prefixed message at the given logType.
 
-        Prepends the context prefix then delegates entirely to
-        parent.log(). All level filtering, count constraints,
+        Prepends the context prefix then delegates entirely to the
+        parent's log() implementation, handing it the context for
+        contextKey sampling. All level filtering, count constraints,
         backpressure, and I/O are handled by the parent unchanged.
 
         :Parameters:
@@ -683,20 +1922,19 @@ class _BoundLogger(object):
             #. data (None, object): Optional data payload.
             #. tback (None, str, list): Optional traceback string.
             #. countConstraint (None, number): Max times to log this message.
+            #. args (None, tuple, dict, object): %-style message arguments.
 
         :Returns:
-            #. result (string): The logged message returned by parent.log().
+            #. result (string): The logged message, as given.
         """
-        return self.__parent.log(
-            logType,
-            self.__prefixed(message),
-            data=data,
-            tback=tback,
-            countConstraint=countConstraint,
-        )
+        if self.__parent.recordFormat == 'json':
+            return self.__parent._log(logType, message, data, tback,
+                                      countConstraint, self.__context, args, self.__context)
+        return self.__parent._log(logType, self.__prefixed(message, args), data, tback,
+                                  countConstraint, None, args, self.__context)
 
     def force_log(self, logType, message, data=None, tback=None,
-                  stdout=True, file=True):
+                  stdout=True, file=True, args=None):
         """Force-log a prefixed message, bypassing level checks.
 
         Prepends the context prefix then delegates to parent.force_log().
@@ -708,17 +1946,22 @@ class _BoundLogger(object):
             #. tback (None, str, list): Optional traceback string.
             #. stdout (boolean): Whether to force stdout output.
             #. file (boolean): Whether to force file output.
+            #. args (None, tuple, dict, object): %-style message arguments.
 
         :Returns:
             #. result (string): The logged message returned by parent.force_log().
         """
+        if self.__parent.recordFormat == 'json':
+            return self.__parent._force_log(logType, message, data, tback,
+                                            stdout, file, self.__context, args)
         return self.__parent.force_log(
             logType,
-            self.__prefixed(message),
+            self.__prefixed(message, args),
             data=data,
             tback=tback,
             stdout=stdout,
             file=file,
+            args=args,
         )
 
     # ── shortcut methods (mirrors Logger shortcuts) ──────────────────
@@ -821,6 +2064,377 @@ class _BoundLogger(object):
         return dict(self.__context)
 
 
+class _AsyncBoundLogger(_BoundLogger):
+    """_BoundLogger returned by AsyncLogger.bind().
+
+    Adds the awaitable logging methods of AsyncLogger, so a request
+    handler can await its bound records exactly like unbound ones.
+
+    Do not instantiate directly -- use AsyncLogger.bind().
+    """
+
+    def __init__(self, parent, context):
+        """Initialise a bound logger wrapping a parent AsyncLogger.
+
+        :Parameters:
+            #. parent (AsyncLogger): The logger that performs all I/O.
+            #. context (dict): Key-value pairs to prepend to every message.
+        """
+        super(_AsyncBoundLogger, self).__init__(parent, context)
+        self.__logger = parent
+
+    async def alog(self, logType, message, *args, **kwargs):
+        """Awaitable log(), see AsyncLogger.alog()."""
+        return await self.__logger._acall(self.log, logType, message, *args, **kwargs)
+
+    async def aforce_log(self, logType, message, *args, **kwargs):
+        """Awaitable force_log(), see AsyncLogger.alog()."""
+        return await self.__logger._acall(self.force_log, logType, message, *args, **kwargs)
+
+    async def ainfo(self, message, *args, **kwargs):
+        """Awaitable info()."""
+        return await self.alog('info', message, *args, **kwargs)
+
+    async def ainformation(self, message, *args, **kwargs):
+        """Awaitable information() (alias for ainfo)."""
+        return await self.alog('info', message, *args, **kwargs)
+
+    async def awarn(self, message, *args, **kwargs):
+        """Awaitable warn()."""
+        return await self.alog('warn', message, *args, **kwargs)
+
+    async def awarning(self, message, *args, **kwargs):
+        """Awaitable warning() (alias for awarn)."""
+        return await self.alog('warn', message, *args, **kwargs)
+
+    async def aerror(self, message, *args, **kwargs):
+        """Awaitable error()."""
+        return await self.alog('error', message, *args, **kwargs)
+
+    async def acritical(self, message, *args, **kwargs):
+        """Awaitable critical()."""
+        return await self.alog('critical', message, *args, **kwargs)
+
+    async def adebug(self, message, *args, **kwargs):
+        """Awaitable debug()."""
+        return await self.alog('debug', message, *args, **kwargs)
+
+    async def aflush(self):
+        """Awaitable flush(), see AsyncLogger.aflush()."""
+        return await self.__logger.aflush()
+
+
+class RotationPolicy(object):
+    """Describes when the file sink of a Logger starts a new log file.
+
+    A policy combines an optional size trigger with an optional time
+    trigger; the file rotates as soon as either fires. Time boundaries
+    are aligned to the logger timezone: with ``when='hour'`` files rotate
+    at every full hour, with ``when='day'`` at midnight. The logger asks
+    the policy for the next rollover epoch whenever it opens a file and
+    then only compares that number with the clock on each record.
+
+    Subclasses may override next_rollover() to implement other schedules.
+
+    :Parameters:
+        #. maxSize (None, number, string): Size trigger, in megabytes or
+           as a string with a unit such as '512KB'. When given it is
+           applied as the logger logFileMaxSize. None keeps the logger
+           logFileMaxSize unchanged.
+        #. when (None, string): Time trigger unit, one of ``'second'``,
+           ``'minute'``, ``'hour'``, ``'day'`` or ``'midnight'`` (an alias
+           of ``'day'``). None disables time-based rotation.
+        #. interval (integer): Number of *when* units between rollovers.
+           The first boundary is the start of the current unit plus
+           *interval* units.
+        #. clock (None, callable): Function returning the current time as
+           epoch seconds. Default is time.time. Tests inject a fake clock.
+
+    :Raises:
+        #. TypeError: If *when* is not a string or None, if *interval* is
+           not an integer or if *clock* is not callable.
+        #. ValueError: If *when* is not an accepted unit or if *interval*
+           is not positive.
+    """
+    # unit name -> (datetime fields reset to the start of the unit, step)
+    _UNITS = {'second':   ((),                                         timedelta(seconds=1)),
+              'minute':   (('second',),                                timedelta(minutes=1)),
+              'hour':     (('minute', 'second'),                       timedelta(hours=1)),
+              'day':      (('hour', 'minute', 'second'),               timedelta(days=1)),
+              'midnight': (('hour', 'minute', 'second'),               timedelta(days=1))}
+
+    def __init__(self, maxSize=None, when=None, interval=1, clock=None):
+        if maxSize is not None and not isinstance(maxSize, basestring) and not _is_number(maxSize):
+            raise TypeError("maxSize must be None, a number or a size string")
+        if isinstance(maxSize, basestring) and not _is_number(maxSize):
+            _parse_size(maxSize)   # fail early on malformed sizes
+        if when is not None:
+            if not isinstance(when, basestring):
+                raise TypeError("when must be None or a string")
+            when = when.lower()
+            if when not in self._UNITS:
+                raise ValueError("when must be one of %s, got '%s'" % (str(sorted(self._UNITS)), when))
+        if not isinstance(interval, int) or isinstance(interval, bool):
+            raise TypeError("interval must be a positive integer")
+        if interval <= 0:
+            raise ValueError("interval must be a positive integer, got %d" % interval)
+        if clock is None:
+            clock = time.time
+        if not callable(clock):
+            raise TypeError("clock must be callable")
+        self.__maxSize  = maxSize
+        self.__when     = when
+        self.__interval = interval
+        self.__clock    = clock
+
+    def __repr__(self):
+        return ('RotationPolicy(maxSize=%r, when=%r, interval=%r)'
+                % (self.__maxSize, self.__when, self.__interval))
+
+    @property
+    def maxSize(self):
+        """Size trigger as given, or None."""
+        return self.__maxSize
+
+    @property
+    def when(self):
+        """Time trigger unit, or None."""
+        return self.__when
+
+    @property
+    def interval(self):
+        """Number of units between time rollovers."""
+        return self.__interval
+
+    @property
+    def clock(self):
+        """Callable returning the current epoch seconds."""
+        return self.__clock
+
+    def next_rollover(self, timestamp, timezone=None):
+        """Return the epoch of the first time rollover after a file was started.
+
+        :Parameters:
+            #. timestamp (number): Epoch seconds at which the current file
+               was started.
+            #. timezone (None, tzinfo): Timezone the boundaries are aligned
+               to. None is the machine local time.
+
+        :Returns:
+            #. result (None, float): Rollover epoch, or None when the
+               policy has no time trigger.
+        """
+        if self.__when is None:
+            return None
+        fields, step = self._UNITS[self.__when]
+        # boundaries are computed on naive wall-clock time and converted
+        # back, so a day is a calendar day across DST changes
+        local = datetime.fromtimestamp(timestamp, timezone).replace(microsecond=0, tzinfo=None)
+        local = local.replace(**dict((f, 0) for f in fields)) + step * self.__interval
+        if timezone is None:
+            return time.mktime(local.timetuple())
+        if hasattr(timezone, 'localize'):
+            return timezone.localize(local).timestamp()
+        return local.replace(tzinfo=timezone).timestamp()
+
+
+class RateLimit(object):
+    """Token-bucket limit on the number of records logged.
+
+    Tokens refill continuously at *rate* per second up to *burst* and
+    every record takes one; a record finding no token is dropped and
+    counted. The first record admitted after drops is preceded by a
+    summary record ``N similar messages suppressed by the rate limit``,
+    which is never sampled, counted or limited itself. Drops no record
+    announced yet are summarised by flush() and at exit, and after
+    *summaryInterval* seconds when one is given.
+    Attach limits with Logger.set_rate_limit(), per logType (checked in
+    log() before any formatting) or per sink (checked when the record
+    is written).
+
+    :Parameters:
+        #. rate (number): Records per second refilled into the bucket.
+        #. burst (None, number): Bucket size, the number of records that
+           may be logged at once after a quiet period. None is
+           ``max(1, rate)``, one second worth of records.
+        #. perCallSite (boolean): Give every call site, the file and line
+           that called log(), a bucket of its own so one noisy loop
+           cannot silence other messages of the same logType. Only
+           applies to logType limits.
+        #. clock (None, callable): Function returning seconds from any
+           fixed origin. Default is time.monotonic. Tests inject a fake
+           clock.
+        #. summaryInterval (None, number): Wall-clock seconds after the
+           first dropped record at which the summary is written even if
+           no record is admitted, so a burst that stops is still
+           announced. Only applies to logType limits.
+
+    :Raises:
+        #. TypeError: If *rate*, *burst* or *summaryInterval* is not a
+           number, if *perCallSite* is not a boolean or if *clock* is not
+           callable.
+        #. ValueError: If *rate* or *summaryInterval* is not positive or
+           *burst* is below 1.
+    """
+
+    def __init__(self, rate, burst=None, perCallSite=False, clock=None, summaryInterval=None):
+        if not _is_number(rate):
+            raise TypeError("rate must be a number")
+        if rate <= 0:
+            raise ValueError("rate must be positive, got %s" % (rate,))
+        if burst is None:
+            burst = max(1.0, rate)
+        if not _is_number(burst):
+            raise TypeError("burst must be None or a number")
+        if burst < 1:
+            raise ValueError("burst must be >= 1, got %s" % (burst,))
+        if not isinstance(perCallSite, bool):
+            raise TypeError("perCallSite must be a boolean")
+        if clock is None:
+            clock = time.monotonic
+        if not callable(clock):
+            raise TypeError("clock must be callable")
+        if summaryInterval is not None:
+            if not _is_number(summaryInterval):
+                raise TypeError("summaryInterval must be None or a number")
+            if summaryInterval <= 0:
+                raise ValueError("summaryInterval must be positive, got %s" % (summaryInterval,))
+            summaryInterval = float(summaryInterval)
+        self.__rate            = float(rate)
+        self.__burst           = float(burst)
+        self.__perCallSite     = perCallSite
+        self.__clock           = clock
+        self.__summaryInterval = summaryInterval
+
+    def __repr__(self):
+        return ('RateLimit(rate=%r, burst=%r, perCallSite=%r, summaryInterval=%r)'
+                % (self.__rate, self.__burst, self.__perCallSite, self.__summaryInterval))
+
+    @property
+    def rate(self):
+        """Records per second refilled into the bucket."""
+        return self.__rate
+
+    @property
+    def burst(self):
+        """Bucket size in records."""
+        return self.__burst
+
+    @property
+    def perCallSite(self):
+        """Whether every call site has a bucket of its own."""
+        return self.__perCallSite
+
+    @property
+    def clock(self):
+        """Callable returning the current time in seconds."""
+        return self.__clock
+
+    @property
+    def summaryInterval(self):
+        """Seconds after which pending drops are summarised, or None."""
+        return self.__summaryInterval
+
+
+class Sampling(object):
+    """Rule keeping a fraction of the records of a logType or sink.
+
+    Give either *ratio*, the fraction of records kept at random, or
+    *firstN*, the number of records kept at the start of every *window*
+    seconds. With *contextKey* the ratio is applied by a stable hash of
+    the value bound under that key with Logger.bind(), so every record of
+    a kept request is kept and every record of a dropped one is dropped,
+    in every process. Records without the key fall back to the random
+    ratio. Attach rules with Logger.set_sampling(), per logType (checked
+    in log() before any formatting) or per sink (checked when the record
+    is written).
+
+    :Parameters:
+        #. ratio (None, number): Fraction of records kept, above 0 and
+           at most 1.
+        #. firstN (None, integer): Records kept per window. Later records
+           of the window are dropped.
+        #. window (number): Length in seconds of a firstN window.
+           Default is 1.
+        #. contextKey (None, string): Bound context key, e.g.
+           ``'requestId'``, whose value decides which records a ratio
+           keeps. Only applies to logType sampling.
+        #. clock (None, callable): Function returning seconds from any
+           fixed origin, used by firstN. Default is time.monotonic.
+
+    :Raises:
+        #. TypeError: If *ratio* or *window* is not a number, if *firstN*
+           is not an integer, if *contextKey* is not a string or if
+           *clock* is not callable.
+        #. ValueError: If not exactly one of *ratio* and *firstN* is
+           given, if *ratio* is not in (0, 1], if *firstN* or *window* is
+           not positive or if *contextKey* is given with *firstN*.
+    """
+
+    def __init__(self, ratio=None, firstN=None, window=1, contextKey=None, clock=None):
+        if (ratio is None) == (firstN is None):
+            raise ValueError("give exactly one of ratio and firstN")
+        if ratio is not None:
+            if not _is_number(ratio):
+                raise TypeError("ratio must be a number")
+            if not 0 < ratio <= 1:
+                raise ValueError("ratio must be above 0 and at most 1, got %s" % (ratio,))
+            ratio = float(ratio)
+        if firstN is not None:
+            if not isinstance(firstN, int) or isinstance(firstN, bool):
+                raise TypeError("firstN must be an integer")
+            if firstN < 1:
+                raise ValueError("firstN must be positive, got %s" % (firstN,))
+        if not _is_number(window):
+            raise TypeError("window must be a number")
+        if window <= 0:
+            raise ValueError("window must be positive, got %s" % (window,))
+        if contextKey is not None:
+            if not isinstance(contextKey, basestring):
+                raise TypeError("contextKey must be None or a string")
+            if firstN is not None:
+                raise ValueError("contextKey only applies to ratio sampling")
+        if clock is None:
+            clock = time.monotonic
+        if not callable(clock):
+            raise TypeError("clock must be callable")
+        self.__ratio      = ratio
+        self.__firstN     = firstN
+        self.__window     = float(window)
+        self.__contextKey = contextKey
+        self.__clock      = clock
+
+    def __repr__(self):
+        if self.__firstN is not None:
+            return 'Sampling(firstN=%r, window=%r)' % (self.__firstN, self.__window)
+        return 'Sampling(ratio=%r, contextKey=%r)' % (self.__ratio, self.__contextKey)
+
+    @property
+    def ratio(self):
+        """Fraction of records kept, or None with firstN."""
+        return self.__ratio
+
+    @property
+    def firstN(self):
+        """Records kept per window, or None with ratio."""
+        return self.__firstN
+
+    @property
+    def window(self):
+        """Length of a firstN window in seconds."""
+        return self.__window
+
+    @property
+    def contextKey(self):
+        """Bound context key hashed to keep whole requests, or None."""
+        return self.__contextKey
+
+    @property
+    def clock(self):
+        """Callable returning the current time in seconds."""
+        return self.__clock
+
+
 class Logger(object):
     """
     This is simplelog main Logger class definition.\n
@@ -917,8 +2531,9 @@ class Logger(object):
           logFileBasename.logFileExtension
        #. logFileExtension (string): Logging file extension. A logging file
           full name is set as logFileBasename.logFileExtension
-       #. logFileMaxSize (None, number): The maximum size in Megabytes
-          of a logging file. Once exceeded, another logging file as
+       #. logFileMaxSize (None, number, string): The maximum size in Megabytes
+          of a logging file, or a string with a unit such as '512KB' or
+          '2GB'. Once exceeded, another logging file as
           logFileBasename_N.logFileExtension will be created.
           Where N is an automatically incremented number. If None or a
           negative number is given, the logging file will grow
@@ -996,11 +2611,140 @@ class Logger(object):
           with the file name, line number and function name of the call
           site that triggered the log call, e.g.:
           ``[routes.py:142 in handle_request]``.
-          Uses inspect.stack() with context=0 (no source lines read)
-          which adds roughly 10-30 us per call. Default is False so
-          existing callers pay zero overhead. Can be toggled at runtime
+          Frames are walked lazily and the tag of every call site is
+          memoised, so a warm call only adds a short frame walk and a
+          dict lookup. Default is False so existing callers pay zero
+          overhead. Can be toggled at runtime
           via set_caller_info(). Does not apply to bound loggers
           created with bind() — those inherit the parent setting.
+       #. lastLoggedFiltered (boolean): When False (default), log() returns
+          immediately for a log type that has no active sink -- nothing is
+          formatted, countConstraint is not consumed and lastLogged is not
+          updated. The cost of a filtered call is then one dict lookup.
+          When True, filtered records are still formatted and stored in
+          lastLogged, the previous behaviour. Can be toggled at runtime
+          via set_last_logged_filtered().
+       #. groupCommit (boolean): Only meaningful when enqueue=True. When
+          True the writer thread drains every record currently available
+          in the queue (bounded by batchMaxRecords, batchMaxBytes and
+          batchLatency), concatenates the payload of each sink and issues
+          one write and one flush per sink per batch instead of one per
+          record. Default is False. Can be updated at runtime via
+          set_group_commit().
+       #. batchMaxRecords (integer): Maximum number of records in one
+          group-commit batch. Default is 1024.
+       #. batchMaxBytes (integer): Maximum number of formatted characters
+          in one group-commit batch. The record that crosses the limit is
+          still included. Default is 1048576.
+       #. batchLatency (None, number): Seconds the writer thread may wait
+          for more records after the first one of a batch. None (default)
+          only drains records that are already queued and never waits.
+       #. sinkWorkers (boolean): Only meaningful when enqueue=True. When
+          True every sink gets its own bounded queue and writer thread
+          instead of sharing the single ``pysimplelog-writer`` thread, so
+          a slow sink only backs up its own queue. Sinks added with the
+          same workerGroup share one queue and thread. maxQueueSize,
+          queueFullPolicy and groupCommit apply to each queue separately;
+          per-sink depth and drop counts are reported by sinkQueues.
+          Default is False. Cannot be changed after construction.
+       #. queueBackend (string): Only meaningful when enqueue=True. Queue
+          implementation between callers and writer threads. ``'queue'``
+          (default) uses queue.Queue, which takes a mutex on every put and
+          get. ``'ring'`` uses a deque-based single-consumer ring whose
+          put takes no lock unless the queue is full and a caller must
+          block; the maxQueueSize bound may then be exceeded by at most
+          the number of producer threads racing for the last slot. All
+          queueFullPolicy values behave the same with both backends.
+          Cannot be changed after construction.
+       #. multiprocess (boolean): When True the log file may be shared by
+          several processes using the same logFileBasename, e.g. forked
+          gunicorn or multiprocessing workers. Every record is written
+          with a single unbuffered write to a file opened with O_APPEND,
+          the file size is read from the file itself rather than from
+          this process's write position, and choosing, rolling and
+          opening files happens under an fcntl lock on
+          ``<logFile>.lock``. Requires fcntl (POSIX only). Default is
+          False. Can be updated at runtime via set_multiprocess().
+       #. rotationPolicy (None, RotationPolicy): Time-based or hybrid
+          size-or-time rotation of the log file. Time boundaries follow
+          the logger timezone. None (default) rotates on logFileMaxSize
+          only. Can be updated at runtime via set_rotation_policy().
+       #. compression (None, string): Compress rotated log files with
+          ``'gzip'``, ``'bz2'`` or ``'lzma'`` on background threads, so
+          the logging path never pays for it. Compressed files get a
+          ``.gz``, ``.bz2`` or ``.xz`` suffix and count towards
+          logFileRoll. Cannot be combined with multiprocess. None
+          (default) keeps rotated files as they are. Can be updated at
+          runtime via set_compression().
+       #. compressionJobs (integer): Maximum number of files compressed
+          at once, one thread each. Default is 1.
+       #. fileMode (string): ``'text'`` (default) writes the log file
+          through a text stream in the locale encoding. ``'binary'``
+          encodes records to UTF-8 in chunks of up to 64 KB, without
+          newline translation, into a buffered O_APPEND file of
+          fileBufferSize bytes, which pays off with durability
+          ``'none'``. ``'mmap'`` preallocates every log file to
+          logFileMaxSize and copies records into a memory mapping of it,
+          so every record is in the page cache, safe from a crash of the
+          process, without a system call; it is meant to replace
+          durability ``'flush'``, not to outrun buffered writes. Can be
+          updated at runtime via set_file_mode().
+       #. fileBufferSize (integer, string): Write buffer of the binary
+          file mode in bytes, or a size string such as ``'1MB'``. The
+          mmap file mode grows files by this much when logFileMaxSize is
+          None or a record does not fit. Default is 262144 (256 KB).
+       #. durability (string): Logger-wide policy deciding what happens
+          after each write when flush is True. ``'none'`` leaves data in
+          the stream buffers, ``'flush'`` flushes the stream to the
+          operating system and ``'fsync'`` (default) also forces it to
+          disk with os.fsync() after every record. Individual sinks can
+          override it via add_sink() or set_durability().
+       #. fsyncEvery (None, integer): With durability ``'flush'``, fsync
+          once this many records were written since the last fsync.
+       #. fsyncInterval (None, number): With durability ``'flush'``, fsync
+          when at least this many seconds elapsed since the last fsync.
+       #. fsyncLevel (None, number, string): With durability ``'flush'``,
+          fsync right after any record whose level is greater or equal to
+          this value. A string must be a defined logType whose level is
+          used, e.g. ``'error'`` keeps errors crash-safe while lower
+          levels ride the page cache.
+       #. timestampPrecision (integer): Number of fractional-second digits
+          (0 to 6) appended to the header timestamp, e.g. 3 produces
+          ``2024-01-01 12:00:00.123``. Default is 0. Can be updated at
+          runtime via set_timestamp_precision().
+       #. callerOffset (integer): Number of extra frames outside
+          SimpleLog.py to skip when callerInfo is True. Use 1 when every
+          log call goes through one application helper function so the
+          tag names the helper's caller. Bound loggers need no offset.
+          Default is 0. Can be updated at runtime via set_caller_offset().
+       #. recordFormat (string): ``'text'`` (default) writes the usual
+          header and message line. ``'json'`` writes every record as one
+          JSON object line with timestamp, logger, logType, level,
+          message and, when present, caller, context, data and traceback
+          members. Can be updated at runtime via set_record_format().
+       #. deferFormatting (boolean): With enqueue, hand the raw message,
+          args, data and call time to the writer thread, which builds the
+          record, so the caller pays only for the queue put. Arguments
+          that could change after the call (a list, a custom object) are
+          still formatted at once. lastLogged then follows the writer
+          and is current after flush(). Default is False. Can be updated
+          at runtime via set_defer_formatting().
+       #. countConstraintCapacity (None, integer): Maximum number of
+          distinct messages whose countConstraint count is kept. The
+          least recently logged message is forgotten first and counts
+          from zero if it comes back. None keeps every message. Default
+          is 10000. Can be updated at runtime via set_count_constraint().
+       #. countConstraintKey (string): ``'message'`` (default) counts each
+          message as given. ``'template'`` masks digits, hex numbers and
+          UUIDs first so messages that differ only in ids share a count.
+          Messages logged with args are counted by their template either way.
+       #. duplicateWindow (None, number): Collapse consecutive records of
+          the same logType and message written to a sink within this many
+          seconds of the first one into a single ``last message repeated
+          N times`` record, written when a different record reaches the
+          sink, on flush() or at exit. Records with data or a traceback
+          are never collapsed. None (default) writes every record. Can be
+          updated at runtime, also per sink, via set_duplicate_window().
        #. \\*args: This is used to send non-keyworded variable length argument
            list to custom initialize. args will be parsed and used in
            custom_init method.
@@ -1011,7 +2755,8 @@ class Logger(object):
     :Raises:
         #. TypeError: If *logTypes* is not a dict or None, if its keys are not
            strings, if its values are not dicts or None, if *enqueue* is not a
-           boolean, or if *callerInfo* is not a boolean. Each setter called
+           boolean, or if *callerInfo* or *lastLoggedFiltered* is not a
+           boolean. Each setter called
            during construction may also raise ``TypeError`` or ``ValueError``
            for its own parameter — see the individual setter docstrings.
     """
@@ -1029,6 +2774,30 @@ class Logger(object):
                        queueFullPolicy='block',
                        queueBlockTimeout=None,
                        callerInfo=False,
+                       lastLoggedFiltered=False,
+                       groupCommit=False,
+                       batchMaxRecords=1024,
+                       batchMaxBytes=1048576,
+                       batchLatency=None,
+                       sinkWorkers=False,
+                       queueBackend='queue',
+                       multiprocess=False,
+                       rotationPolicy=None,
+                       compression=None,
+                       compressionJobs=1,
+                       fileMode='text',
+                       fileBufferSize=262144,
+                       durability='fsync',
+                       fsyncEvery=None,
+                       fsyncInterval=None,
+                       fsyncLevel=None,
+                       timestampPrecision=0,
+                       callerOffset=0,
+                       recordFormat='text',
+                       deferFormatting=False,
+                       countConstraintCapacity=10000,
+                       countConstraintKey='message',
+                       duplicateWindow=None,
                        *args, **kwargs):
         # set last logged message
         self.__lastLogged    = {}
@@ -1037,11 +2806,63 @@ class Logger(object):
         # "if _SINK_STDOUT in self.__sinks". The real _Sink objects are
         # inserted at the END of __init__ (Phase 3 block).
         self.__sinks       = {}
-        self.__activeSinks = {}
-        # instantiate file stream
+        # routing snapshot swapped whole on every rebuild; the lock only
+        # serialises rebuilds, log() reads the table without it
+        self.__sinkTable     = _SinkTable({}, {}, 0)
+        self.__sinkTableLock = threading.Lock()
+        # _FlightRecorder set by set_flight_recorder(), or None
+        self.__recorder      = None
+        # per-sink writer lanes — only populated when sinkWorkers is True.
+        # __lanes and lane.sinks change under __sinkTableLock with the table
+        self.__sinkWorkers = False
+        self.__lanes       = {}
+        # serialises the callers draining a retired lane, whose queue
+        # allows a single consumer
+        self.__retiredLock = threading.RLock()
+        # per-logType header templates — the static ' - name <TYPE> ' part
+        # of every header, rebuilt only when a name changes
+        self.__logTypeNames     = {}
+        self.__headerTemplates  = {}
+        self.__jsonTemplates    = {}
+        self.__recordFormat     = 'text'
+        self.__deferFormatting  = False
+        # instantiate file stream and the current log file name
         self.__logFileStream = None
+        self.__logFileName   = None
+        # in-memory index of this logger's log files, (number, path) oldest
+        # first, and the (basename, extension) it was built for
+        self.__logFileIndex    = None
+        self.__logFileIndexKey = None
+        # bytes in the current log file, seeded from its size on open, and
+        # the limit it is compared with (set by set_log_file_maximum_size)
+        self.__logFileBytes    = 0
+        self.__logFileMaxBytes = None
+        # time-based rotation — the next rollover epoch is computed when a
+        # file is opened, from the start time of that file
+        self.__rotationPolicy  = None
+        self.__rotationClock   = None
+        self.__nextRollover    = None
+        self.__rolloverBase    = None
+        # background compression of rotated files — a _Compressor or None
+        self.__compressor      = None
+        self.__compressionJobs = 1
+        # file sink mode — 'text' or 'binary', and the binary write buffer
+        self.__fileMode        = 'text'
+        self.__fileBufferSize  = 262144
         # rotation lock — guards the multi-step check/rotate/open sequence
         self.__rotationLock = threading.RLock()
+        # multiprocess file sharing — inter-process lock file descriptor and
+        # the pids that opened it and the file stream, to detect fork()
+        self.__multiprocess = False
+        self.__lockFd       = None
+        self.__lockPath     = None
+        self.__lockPid      = None
+        self.__logFilePid   = None
+        self.__forkHooked   = False
+        self.set_multiprocess(multiprocess)
+        self.set_file_mode(fileMode, fileBufferSize=fileBufferSize)
+        # set timestamp precision
+        self.set_timestamp_precision(timestampPrecision)
         # set timezone
         self.set_timezone(timezone)
         # set name
@@ -1069,10 +2890,13 @@ class Logger(object):
         else:
             self.__set_log_file_basename(logFileBasename)
             self.set_log_file_extension(logFileExtension)
+        # set rotation policy
+        self.set_rotation_policy(rotationPolicy)
+        # set rotated files compression
+        self.set_compression(compression, compressionJobs=compressionJobs)
         # initialize types parameters
         self.__logTypeFileFlags   = {}
         self.__logTypeStdoutFlags = {}
-        self.__logTypeNames       = {}
         self.__logTypeLevels      = {}
         self.__logTypeFormat      = {}
         self.__logTypeColor       = {}
@@ -1086,8 +2910,17 @@ class Logger(object):
         self.__stdoutMaxLevel = None
         self.__fileMinLevel   = None
         self.__fileMaxLevel   = None
+        # logType -> _RateLimiter, replaced whole by set_rate_limit()
+        self.__rateLimits = {}
+        # logType -> _Sampler, replaced whole by set_sampling()
+        self.__samplers   = {}
+        # duplicate collapsing — the window of sinks added later, and
+        # whether any sink collapses so log() computes record keys
+        self.__duplicateWindow = None
+        self.__collapsing      = False
         # create log messages counter
-        self.__logMessagesCounter = {}
+        self.__countTracker = _CountTracker(None, 'message')
+        self.set_count_constraint(countConstraintCapacity, countConstraintKey)
         self.set_minimum_level(stdoutMinLevel, stdoutFlag=True, fileFlag=False)
         self.set_maximum_level(stdoutMaxLevel, stdoutFlag=True, fileFlag=False)
         self.set_minimum_level(fileMinLevel, stdoutFlag=False, fileFlag=True)
@@ -1100,6 +2933,10 @@ class Logger(object):
         self.add_log_type("critical", name="CRITICAL", level=100, stdoutFlag=None, fileFlag=None, color=None, highlight=None, attributes=None)
         # custom initialize
         self.custom_init( *args, **kwargs )
+        # set durability — after log types so fsyncLevel may name one
+        self.__durability = None
+        self.set_durability(durability, fsyncEvery=fsyncEvery,
+                            fsyncInterval=fsyncInterval, fsyncLevel=fsyncLevel)
         # add logTypes
         if logTypes is not None:
             if not isinstance(logTypes, dict):
@@ -1119,11 +2956,34 @@ class Logger(object):
         # enqueue mode — validate policy params first so errors surface early
         if not isinstance(enqueue, bool):
             raise TypeError("enqueue must be a boolean")
+        if not isinstance(sinkWorkers, bool):
+            raise TypeError("sinkWorkers must be a boolean")
+        if not isinstance(queueBackend, basestring):
+            raise TypeError("queueBackend must be a string, one of ('queue', 'ring')")
+        if queueBackend not in ('queue', 'ring'):
+            raise ValueError("queueBackend must be one of ('queue', 'ring'), got '%s'" % queueBackend)
+        self.__queueBackend     = queueBackend
         self.__enqueue          = enqueue
+        self.__sinkWorkers      = enqueue and sinkWorkers
         self.__logQueue         = None
         self.__logWorker        = None
         self.__droppedMessages  = 0
         self.__droppedLock      = threading.Lock()
+        # timer writing pending rate limit summaries, see RateLimit.summaryInterval
+        self.__summaryTimer     = None
+        self.__summaryLock      = threading.Lock()
+        # callables the writer threads call, once, when they take a record
+        # off a queue -- how an AsyncLogger backlog learns there is room
+        self.__roomWaiters      = []
+        self.__roomLock         = threading.Lock()
+        # group commit settings and statistics (batches, records,
+        # largest batch, last batch) — the tuple is replaced as a whole
+        # by the worker so readers never see a half-updated snapshot
+        self.__batchStatistics  = (0, 0, 0, 0)
+        self.__batchMaxRecords  = None   # set by setter below
+        self.__batchMaxBytes    = None   # set by setter below
+        self.set_group_commit(groupCommit, batchMaxRecords=batchMaxRecords,
+                              batchMaxBytes=batchMaxBytes, batchLatency=batchLatency)
         # validate and store queue policy settings via setters so all
         # validation logic lives in one place
         self.__maxQueueSize      = None   # set by setter below
@@ -1132,12 +2992,11 @@ class Logger(object):
         self.set_queue_full_policy(queueFullPolicy)
         self.set_queue_block_timeout(queueBlockTimeout)
         self.set_max_queue_size(maxQueueSize)   # must come after policy set
-        if self.__enqueue:
-            self.__logQueue  = _queue_module.Queue(
-                maxsize=self.__maxQueueSize if self.__maxQueueSize is not None else 0
-            )
+        if self.__enqueue and not self.__sinkWorkers:
+            self.__logQueue  = self.__new_queue()
             self.__logWorker = threading.Thread(
                 target=self.__enqueue_worker,
+                args=(self.__logQueue,),
                 name="pysimplelog-writer",
             )
             self.__logWorker.daemon = True
@@ -1146,6 +3005,11 @@ class Logger(object):
         if not isinstance(callerInfo, bool):
             raise TypeError("callerInfo must be a boolean")
         self.__callerInfo = callerInfo
+        self.set_caller_offset(callerOffset)
+        self.set_record_format(recordFormat)
+        self.set_defer_formatting(deferFormatting)
+        # filtered-record bookkeeping — validate and store
+        self.set_last_logged_filtered(lastLoggedFiltered)
         # ── unified sink registry ─────────────────────────────────────────
         # Both built-in sinks are always created. The logTypeFlags dicts
         # are the SAME objects as __logTypeStdoutFlags/__logTypeFileFlags
@@ -1172,7 +3036,11 @@ class Logger(object):
                 sinkType     = 'file',
             ),
         }
-        self.__activeSinks = {}
+        if self.__sinkWorkers:
+            with self.__sinkTableLock:
+                for key, sink in self.__sinks.items():
+                    self.__attach_lane(key, sink)
+        self.set_duplicate_window(duplicateWindow)
         self.__rebuild_active_sinks()
         # flush at python exit
         atexit.register(self._flush_atexit_logfile)
@@ -1185,9 +3053,22 @@ class Logger(object):
         string += "\n - Log To File:   Flag (%s) - Min Level (%s) - Max Level (%s)"%(self.__logToFile,self.__fileMinLevel,self.__fileMaxLevel)
         string += "\n                  File Size (%s) - First Number (%s) - Roll (%s)"%(self.__logFileMaxSize,self.__logFileFirstNumber,self.__logFileRoll)
         string += "\n                  Message Max Size (%s) - Data Max Size (%s)"%(self.__maxMessageSize,self.__maxDataSize)
+        string += "\n                  Multiprocess (%s) - Rotation Policy (%s)"%(self.__multiprocess,self.__rotationPolicy)
+        string += "\n                  Compression (%s) - Compression Jobs (%s)"%(self.compression,self.compressionJobs)
+        string += "\n                  File Mode (%s) - File Buffer Size (%s)"%(self.__fileMode,self.__fileBufferSize)
         string += "\n - Enqueue mode: %s  Queue max size: %s  Policy: %s  Block timeout: %s  Dropped: %s"%(self.__enqueue, self.__maxQueueSize, self.__queueFullPolicy,
           self.__queueBlockTimeout, self.__droppedMessages)
-        string += "\n - Caller info: %s"%(self.__callerInfo,)
+        string += "\n - Sink workers: %s  Lanes: %s  Queue backend: %s"%(self.__sinkWorkers, len(self.__lanes), self.__queueBackend)
+        string += "\n - Group commit: %s  Batch max records: %s  Batch max bytes: %s  Batch latency: %s"%(self.__groupCommit,
+          self.__batchMaxRecords, self.__batchMaxBytes, self.__batchLatency)
+        string += "\n - Durability: %s  Fsync every: %s  Fsync interval: %s  Fsync level: %s"%(self.__durability.mode,
+          self.__durability.every, self.__durability.interval, self.__durability.level)
+        string += "\n - Timezone: %s  Timestamp precision: %s"%(self.timezone, self.__timestampPrecision)
+        string += "\n - Caller info: %s  Caller offset: %s"%(self.__callerInfo, self.__callerOffset)
+        string += "\n - Record format: %s  Defer formatting: %s"%(self.__recordFormat, self.__deferFormatting)
+        string += "\n - Count constraint capacity: %s  Key: %s"%(self.__countTracker.capacity, self.__countTracker.keyMode)
+        string += "\n - Duplicate window: %s  Collapsed: %s"%(self.__duplicateWindow, sum(self.collapsedRecords.values()))
+        string += "\n - Last logged filtered: %s"%(self.__lastLoggedFiltered,)
         string += "\n                  Current log file (%s)"%(self.__logFileName)
         # add log types table
         if not len(self.__logTypeNames):
@@ -1290,12 +3171,33 @@ class Logger(object):
         stream, and flushes any user-supplied sinks (their lifecycle is owned
         by the caller, so they are flushed but never closed here).
         """
+        with self.__summaryLock:
+            timer, self.__summaryTimer = self.__summaryTimer, None
+        if timer is not None:
+            timer.cancel()
+        self.__write_rate_summaries()
         if self.__enqueue and self.__logQueue is not None:
             self.__logQueue.put(_QUEUE_STOP)
             self.__logWorker.join(timeout=5)
-        if self.__logFileStream is not None:
-            self.__flush_stream(self.__logFileStream)
-            self.__logFileStream.close()
+        lanes = list(self.__lanes.values())
+        for lane in lanes:
+            lane.queue.put(_QUEUE_STOP)
+        for lane in lanes:
+            lane.worker.join(timeout=5)
+        self.__write_sink_summaries()
+        for sink in list(self.__sinks.values()):
+            self.__flush_collapser(sink)
+        with self.__rotationLock:
+            if self.__logFileStream is not None:
+                self.__flush_stream(self.__logFileStream)
+                self.__logFileStream.close()
+                # a later record reopens the file instead of writing to a
+                # closed stream, and a second call finds nothing to close
+                self.__logFileStream = None
+        # finish rotated files being compressed, or a half-written
+        # temporary file would be left behind
+        if self.__compressor is not None:
+            self.__compressor.join()
         # flush user sinks at exit — we never close them (caller owns lifecycle)
         for sink in self.__sinks.values():
             if sink.sinkType == 'user' and sink.handler is not None:
@@ -1303,7 +3205,12 @@ class Logger(object):
 
     @property
     def lastLogged(self):
-        """Return a dictionary of the last logged message for each log type."""
+        """Return a dictionary of the last logged message for each log type.
+
+        With deferFormatting, records are formatted by the writer thread
+        and reach lastLogged (and the lastLogged* properties) only once
+        written; call flush() first to see the most recent call.
+        """
         d = copy.deepcopy(self.__lastLogged)
         d.pop(-1, None)
         return d
@@ -1343,6 +3250,25 @@ class Logger(object):
         """Flush flag."""
         return self.__flush
 
+    @property
+    def durability(self):
+        """Logger-wide durability mode: ``'none'``, ``'flush'`` or ``'fsync'``."""
+        return self.__durability.mode
+
+    @property
+    def durabilityParameters(self):
+        """Dictionary of the logger-wide durability settings.
+
+        Keys are ``'durability'``, ``'fsyncEvery'``, ``'fsyncInterval'``
+        and ``'fsyncLevel'``. Sinks with their own durability are not
+        reflected here; see set_durability().
+        """
+        d = self.__durability
+        return {'durability':    d.mode,
+                'fsyncEvery':    d.every,
+                'fsyncInterval': d.interval,
+                'fsyncLevel':    d.level}
+
     @property
     def enqueue(self):
         """Whether non-blocking enqueue mode is active."""
@@ -1354,11 +3280,38 @@ class Logger(object):
 
         When True every log() and force_log() call walks the call stack
         to find the first frame outside SimpleLog.py and prepends a
-        ``[file:line in func]`` tag before the message. The overhead is
-        roughly 10-30 us per call. Default is False.
+        ``[file:line in func]`` tag before the message. Once the call site
+        is cached the overhead is a short frame walk and a dict lookup;
+        benchmarks/bench_caller_info.py measures it.
+        Default is False.
         """
         return self.__callerInfo
 
+    @property
+    def recordFormat(self):
+        """Layout of log records, 'text' or 'json'."""
+        return self.__recordFormat
+
+    @property
+    def deferFormatting(self):
+        """Whether enqueued records are formatted by the writer thread."""
+        return self.__deferFormatting
+
+    @property
+    def callerOffset(self):
+        """Number of extra non-SimpleLog frames skipped by callerInfo."""
+        return self.__callerOffset
+
+    @property
+    def lastLoggedFiltered(self):
+        """Whether records with no active sink still update lastLogged.
+
+        When False (default) log() short-circuits before any formatting
+        for a log type that no sink would receive. When True such records
+        are formatted and stored in lastLogged without being dispatched.
+        """
+        return self.__lastLoggedFiltered
+
     @property
     def maxQueueSize(self):
         """Maximum number of records the queue may hold, or None if unbounded.
@@ -1389,13 +3342,16 @@ class Logger(object):
     def queueSize(self):
         """Current number of log records waiting in the queue.
 
-        Returns 0 when enqueue mode is not active.
+        Returns 0 when enqueue mode is not active. When sinkWorkers is
+        True this is the sum over all sink queues, where a record routed
+        to several lanes counts once per lane.
         Note: qsize() is an approximation on some platforms -- use
         flush() to guarantee the queue is empty before reading results.
         """
-        if self.__logQueue is None:
-            return 0
-        return self.__logQueue.qsize()
+        size = 0 if self.__logQueue is None else self.__logQueue.qsize()
+        for lane in list(self.__lanes.values()):
+            size += lane.queue.qsize()
+        return size
 
     @property
     def droppedMessages(self):
@@ -1403,10 +3359,67 @@ class Logger(object):
 
         Accumulates for the lifetime of the logger and is never reset.
         Always 0 when enqueue mode is not active or maxQueueSize is None.
+        When sinkWorkers is True every drop from any sink queue counts,
+        see sinkQueues for the split per sink.
         """
         with self.__droppedLock:
             return self.__droppedMessages
 
+    @property
+    def queueBackend(self):
+        """Queue implementation used in enqueue mode, ``'queue'`` or ``'ring'``."""
+        return self.__queueBackend
+
+    @property
+    def sinkWorkers(self):
+        """Whether every sink (or worker group) has its own queue and writer thread."""
+        return self.__sinkWorkers
+
+    @property
+    def sinkQueues(self):
+        """Queue depth and drop counters of every sink when sinkWorkers is True.
+
+        :Returns:
+            #. result (dict): Maps every sink key (as in the sinks
+               property) to a dict with keys ``'worker'`` (lane name),
+               ``'queueSize'`` and ``'droppedMessages'``. Sinks sharing a
+               workerGroup report the same lane values. Empty when
+               sinkWorkers is False.
+        """
+        result = {}
+        with self.__droppedLock:
+            for key, sink in list(self.__sinks.items()):
+                lane = sink.lane
+                if lane is None:
+                    continue
+                result[key] = {'worker':          lane.name,
+                               'queueSize':       lane.queue.qsize(),
+                               'droppedMessages': lane.dropped}
+        return result
+
+    @property
+    def groupCommit(self):
+        """Whether the enqueue worker writes records in group-commit batches."""
+        return self.__groupCommit
+
+    @property
+    def batchStatistics(self):
+        """Group-commit batch statistics collected by the enqueue worker.
+
+        :Returns:
+            #. result (dict): Keys are ``'batches'`` (number of batches
+               dispatched), ``'records'`` (records dispatched in batches),
+               ``'maxBatchSize'`` (largest batch seen), ``'lastBatchSize'``
+               and ``'meanBatchSize'``. All values are 0 until the first
+               batch is written or when groupCommit is False.
+        """
+        batches, records, maxSize, lastSize = self.__batchStatistics
+        return {'batches':       batches,
+                'records':       records,
+                'maxBatchSize':  maxSize,
+                'lastBatchSize': lastSize,
+                'meanBatchSize': float(records)/batches if batches else 0.0}
+
     @property
     def logTypes(self):
         """List of all defined log types."""
@@ -1493,6 +3506,11 @@ class Logger(object):
         """Log file roll parameter."""
         return self.__logFileRoll
 
+    @property
+    def multiprocess(self):
+        """Whether the log file is safely shared with other processes."""
+        return self.__multiprocess
+
     @property
     def logToFile(self):
         """Whether logging to file is enabled.
@@ -1535,27 +3553,68 @@ class Logger(object):
         instances that will receive messages of that type. The cache is
         rebuilt automatically whenever routing configuration changes.
         """
-        return {lt: list(sinks) for lt, sinks in self.__activeSinks.items()}
+        return {lt: list(sinks) for lt, sinks in self.__sinkTable.active.items()}
+
+    @property
+    def logFileName(self):
+        """Currently used log file name."""
+        return self.__logFileName
+
+    @property
+    def logFileBasename(self):
+        """Log file basename."""
+        return self.__logFileBasename
+
+    @property
+    def logFileExtension(self):
+        """Log file extension."""
+        return self.__logFileExtension
+
+    @property
+    def logFileMaxSize(self):
+        """Maximum allowed logfile size in megabytes."""
+        return self.__logFileMaxSize
+
+    @property
+    def rotationPolicy(self):
+        """The RotationPolicy of the log file, or None."""
+        return self.__rotationPolicy
+
+    @property
+    def nextRollover(self):
+        """Epoch of the next time-based rollover, or None when none is scheduled."""
+        return self.__nextRollover
+
+    @property
+    def fileMode(self):
+        """Log file write mode, 'text' or 'binary'."""
+        return self.__fileMode
 
     @property
-    def logFileName(self):
-        """Currently used log file name."""
-        return self.__logFileName
+    def fileBufferSize(self):
+        """Write buffer size in bytes of the binary file mode."""
+        return self.__fileBufferSize
 
     @property
-    def logFileBasename(self):
-        """Log file basename."""
-        return self.__logFileBasename
+    def compression(self):
+        """Rotated log files compression method, None if disabled."""
+        return None if self.__compressor is None else self.__compressor.method
 
     @property
-    def logFileExtension(self):
-        """Log file extension."""
-        return self.__logFileExtension
+    def compressionJobs(self):
+        """Maximum number of rotated log files compressed at once."""
+        return self.__compressionJobs
 
     @property
-    def logFileMaxSize(self):
-        """Maximum allowed logfile size in megabytes."""
-        return self.__logFileMaxSize
+    def pendingCompressions(self):
+        """Number of rotated log files queued or being compressed."""
+        compressor = self.__compressor
+        return 0 if compressor is None else compressor.pending
+
+    @property
+    def logFileMaxBytes(self):
+        """Maximum allowed logfile size in bytes, or None for no limit."""
+        return self.__logFileMaxBytes
 
     @property
     def logMessageMaxSize(self):
@@ -1580,6 +3639,11 @@ class Logger(object):
             timezone = timezone.zone
         return timezone
 
+    @property
+    def timestampPrecision(self):
+        """Number of fractional-second digits appended to header timestamps."""
+        return self.__timestampPrecision
+
     @property
     def _timezone(self):
         """Internal pytz timezone object, or None if using the machine default."""
@@ -1587,8 +3651,119 @@ class Logger(object):
 
     @property
     def logMessagesCounter(self):
-        """Counter look-up table for logged messages that have a count constraint applied."""
-        return self.__logMessagesCounter
+        """Counter look-up table for logged messages that have a count constraint applied.
+
+        A copy mapping every tracked key to the number of times it was
+        seen minus one, the zero-based index of its last call. Keys are
+        templates when countConstraintKey is ``'template'``, and only the
+        countConstraintCapacity most recently logged keys are kept.
+        """
+        with self.__countTracker.lock:
+            return dict((k, n-1) for k, n in self.__countTracker.counts.items())
+
+    @property
+    def rateLimits(self):
+        """Rate limits set with set_rate_limit() and what they dropped.
+
+        :Returns:
+            #. result (dict): Keys ``'logTypes'`` and ``'sinks'`` map every
+               limited logType or sink key to a dict with keys
+               ``'rateLimit'``, the RateLimit, and ``'suppressed'``, the
+               number of records dropped so far.
+        """
+        logTypes = {}
+        for logType, limiter in self.__rateLimits.items():
+            logTypes[logType] = {'rateLimit': limiter.limit, 'suppressed': limiter.suppressed}
+        sinks = {}
+        for key, sink in list(self.__sinks.items()):
+            bucket = sink.bucket
+            if bucket is not None:
+                sinks[key] = {'rateLimit': bucket.limit, 'suppressed': bucket.total}
+        return {'logTypes': logTypes, 'sinks': sinks}
+
+    @property
+    def sampling(self):
+        """Sampling rules set with set_sampling() and what they dropped.
+
+        :Returns:
+            #. result (dict): Keys ``'logTypes'`` and ``'sinks'`` map every
+               sampled logType or sink key to a dict with keys
+               ``'sampling'``, the Sampling, and ``'sampledOut'``, the
+               number of records dropped so far.
+        """
+        logTypes = {}
+        for logType, sampler in self.__samplers.items():
+            logTypes[logType] = {'sampling': sampler.sampling, 'sampledOut': sampler.sampledOut}
+        sinks = {}
+        for key, sink in list(self.__sinks.items()):
+            sampler = sink.sampler
+            if sampler is not None:
+                sinks[key] = {'sampling': sampler.sampling, 'sampledOut': sampler.sampledOut}
+        return {'logTypes': logTypes, 'sinks': sinks}
+
+    @property
+    def flightRecorder(self):
+        """Flight recorder settings and counters, or None when it is not set.
+
+        :Returns:
+            #. result (None, dict): Keys ``'capacity'``, ``'triggerLevel'``,
+               ``'perThread'`` and ``'contextKey'`` as given to
+               set_flight_recorder(), ``'logTypes'``, the sorted logTypes
+               it keeps, ``'rings'`` and ``'buffered'``, the rings and
+               records held now, ``'recorded'`` and ``'overwritten'``, the
+               records kept and pushed out of a full ring so far, and
+               ``'dumps'``, the number of rings written out.
+        """
+        recorder = self.__recorder
+        if recorder is None:
+            return None
+        return {'capacity':     recorder.capacity,
+                'triggerLevel': recorder.triggerLevel,
+                'perThread':    recorder.perThread,
+                'contextKey':   recorder.contextKey,
+                'logTypes':     sorted(self.__sinkTable.recorded),
+                'rings':        len(recorder.rings),
+                'buffered':     recorder.buffered(),
+                'recorded':     recorder.recorded,
+                'overwritten':  recorder.overwritten,
+                'dumps':        recorder.dumps}
+
+    @property
+    def duplicateWindow(self):
+        """Duplicate collapsing window in seconds of sinks added later, or None."""
+        return self.__duplicateWindow
+
+    @property
+    def collapsedRecords(self):
+        """Dictionary of {sink key: records collapsed} for every collapsing sink.
+
+        The keys are those of the sinks property.
+        """
+        return dict((key, sink.collapser.collapsed) for key, sink in list(self.__sinks.items())
+                    if sink.collapser is not None)
+
+    @property
+    def countConstraintCapacity(self):
+        """Maximum number of countConstraint keys kept, or None for no limit."""
+        return self.__countTracker.capacity
+
+    @property
+    def countConstraintKey(self):
+        """How countConstraint counts messages, 'message' or 'template'."""
+        return self.__countTracker.keyMode
+
+    @property
+    def countConstraintStatistics(self):
+        """Statistics of the countConstraint tracker.
+
+        :Returns:
+            #. result (dict): Keys are ``'entries'`` (keys held),
+               ``'capacity'``, ``'evictions'`` (keys forgotten to respect
+               the capacity), ``'suppressed'`` (calls skipped by a count
+               constraint) and ``'memoryBytes'``, an estimate of the
+               memory held by the keys and counts.
+        """
+        return self.__countTracker.statistics()
 
     def set_caller_info(self, callerInfo):
         """Enable or disable automatic caller file/line/function tagging.
@@ -1608,6 +3783,93 @@ class Logger(object):
             raise TypeError("callerInfo must be a boolean")
         self.__callerInfo = callerInfo
 
+    def set_caller_offset(self, callerOffset):
+        """Set how many extra frames outside SimpleLog.py callerInfo skips.
+
+        :Parameters:
+            #. callerOffset (integer): 0 tags the frame that called the
+               logger. Each increment moves one frame further out, which
+               is useful when all logging goes through an application
+               wrapper function.
+
+        :Raises:
+            #. TypeError: If *callerOffset* is not an integer.
+            #. ValueError: If *callerOffset* is negative.
+        """
+        if not isinstance(callerOffset, int) or isinstance(callerOffset, bool):
+            raise TypeError("callerOffset must be an integer")
+        if callerOffset < 0:
+            raise ValueError("callerOffset must be >=0, got %d" % callerOffset)
+        self.__callerOffset = callerOffset
+
+    def set_last_logged_filtered(self, lastLoggedFiltered):
+        """Set whether records with no active sink still update lastLogged.
+
+        Safe to call at any time. Takes effect on the very next log() call.
+
+        :Parameters:
+            #. lastLoggedFiltered (boolean): False to return from log()
+               immediately when no sink is active for the log type (no
+               formatting, no countConstraint bookkeeping, no lastLogged
+               update). True to keep formatting filtered records so that
+               lastLogged always reflects the most recent call.
+
+        :Raises:
+            #. TypeError: If *lastLoggedFiltered* is not a boolean.
+        """
+        if not isinstance(lastLoggedFiltered, bool):
+            raise TypeError("lastLoggedFiltered must be a boolean")
+        self.__lastLoggedFiltered = lastLoggedFiltered
+
+    def set_group_commit(self, groupCommit, batchMaxRecords=None,
+                               batchMaxBytes=None, batchLatency=None):
+        """Configure group-commit batching of the enqueue worker.
+
+        Safe to call at any time. The worker reads the settings afresh
+        before collecting each batch.
+
+        :Parameters:
+            #. groupCommit (boolean): Whether to write records in batches.
+            #. batchMaxRecords (None, integer): Maximum records per batch.
+               None keeps the current value.
+            #. batchMaxBytes (None, integer): Maximum formatted characters
+               per batch. None keeps the current value.
+            #. batchLatency (None, number): Seconds to wait for more
+               records after the first one of a batch. None means never
+               wait -- only records already queued join the batch.
+
+        :Raises:
+            #. TypeError: If *groupCommit* is not a boolean, if
+               *batchMaxRecords* or *batchMaxBytes* is not an integer, or
+               if *batchLatency* is not a number or None.
+            #. ValueError: If *batchMaxRecords* or *batchMaxBytes* is not
+               positive or if *batchLatency* is negative.
+        """
+        if not isinstance(groupCommit, bool):
+            raise TypeError("groupCommit must be a boolean")
+        if batchMaxRecords is None:
+            batchMaxRecords = self.__batchMaxRecords
+        if not isinstance(batchMaxRecords, int) or isinstance(batchMaxRecords, bool):
+            raise TypeError("batchMaxRecords must be a positive integer")
+        if batchMaxRecords <= 0:
+            raise ValueError("batchMaxRecords must be a positive integer, got %d" % batchMaxRecords)
+        if batchMaxBytes is None:
+            batchMaxBytes = self.__batchMaxBytes
+        if not isinstance(batchMaxBytes, int) or isinstance(batchMaxBytes, bool):
+            raise TypeError("batchMaxBytes must be a positive integer")
+        if batchMaxBytes <= 0:
+            raise ValueError("batchMaxBytes must be a positive integer, got %d" % batchMaxBytes)
+        if batchLatency is not None:
+            if not _is_number(batchLatency):
+                raise TypeError("batchLatency must be a number or None")
+            batchLatency = float(batchLatency)
+            if batchLatency < 0:
+                raise ValueError("batchLatency must be >=0, got %s" % batchLatency)
+        self.__batchMaxRecords = batchMaxRecords
+        self.__batchMaxBytes   = batchMaxBytes
+        self.__batchLatency    = batchLatency
+        self.__groupCommit     = groupCommit
+
     def set_max_queue_size(self, maxQueueSize):
         """Set the maximum number of records the internal queue may hold.
 
@@ -1633,6 +3895,8 @@ class Logger(object):
         # sync the live queue object if one already exists
         if self.__logQueue is not None:
             self.__logQueue.maxsize = maxQueueSize if maxQueueSize is not None else 0
+        for lane in list(self.__lanes.values()):
+            lane.queue.maxsize = maxQueueSize if maxQueueSize is not None else 0
 
     def set_queue_full_policy(self, queueFullPolicy):
         """Set the backpressure policy applied when the queue is full.
@@ -1721,6 +3985,102 @@ class Logger(object):
             import pytz
             timezone = pytz.timezone(timezone)
         self.__timezone = timezone
+        # invalidate the per-second timestamp cache
+        self.__timestampCache = (None, None, None)
+        # realign the pending time rollover of the open log file
+        if self.__rotationPolicy is not None:
+            self.__schedule_rollover(self.__rolloverBase)
+
+    def set_timestamp_precision(self, timestampPrecision):
+        """
+        Set the number of fractional-second digits of header timestamps.
+
+        :Parameters:
+            #. timestampPrecision (integer): Digits between 0 and 6. 0 means
+               second resolution, 3 milliseconds and 6 microseconds.
+
+        :Raises:
+            #. TypeError: If *timestampPrecision* is not an integer.
+            #. ValueError: If *timestampPrecision* is not between 0 and 6.
+        """
+        if not isinstance(timestampPrecision, int) or isinstance(timestampPrecision, bool):
+            raise TypeError("timestampPrecision must be an integer")
+        if not 0 <= timestampPrecision <= 6:
+            raise ValueError("timestampPrecision must be between 0 and 6, got %d" % timestampPrecision)
+        self.__timestampPrecision = timestampPrecision
+        self.__timestampScale     = 10**timestampPrecision
+        self.__timestampFraction  = '.%%0%dd' % timestampPrecision
+
+    def set_record_format(self, recordFormat):
+        """
+        Set the layout of log records.
+
+        :Parameters:
+            #. recordFormat (string): ``'text'`` for header and message
+               lines, ``'json'`` for one JSON object per line.
+
+        :Raises:
+            #. TypeError: If *recordFormat* is not a string.
+            #. ValueError: If *recordFormat* is not ``'text'`` or ``'json'``.
+        """
+        if not isinstance(recordFormat, basestring):
+            raise TypeError("recordFormat must be a string, one of ('text', 'json')")
+        if recordFormat not in ('text', 'json'):
+            raise ValueError("recordFormat must be one of ('text', 'json'), got '%s'" % recordFormat)
+        self.__recordFormat = recordFormat
+
+    def set_count_constraint(self, countConstraintCapacity, countConstraintKey=None):
+        """
+        Set how countConstraint counts are stored.
+
+        :Parameters:
+            #. countConstraintCapacity (None, integer): Maximum number of
+               message keys kept; the least recently logged are evicted
+               first. None removes the limit.
+            #. countConstraintKey (None, string): ``'message'`` or
+               ``'template'``. None keeps the current value. Changing it
+               clears the counts since the keys are not comparable.
+
+        :Raises:
+            #. TypeError: If *countConstraintCapacity* is not None or an
+               integer, or *countConstraintKey* is not None or a string.
+            #. ValueError: If *countConstraintCapacity* is smaller than 1
+               or *countConstraintKey* is not a known key.
+        """
+        if countConstraintCapacity is not None:
+            if not isinstance(countConstraintCapacity, int) or isinstance(countConstraintCapacity, bool):
+                raise TypeError("countConstraintCapacity must be None or an integer")
+            if countConstraintCapacity < 1:
+                raise ValueError("countConstraintCapacity must be >= 1, got %d" % countConstraintCapacity)
+        if countConstraintKey is None:
+            countConstraintKey = self.__countTracker.keyMode
+        if not isinstance(countConstraintKey, basestring):
+            raise TypeError("countConstraintKey must be a string, one of ('message', 'template')")
+        if countConstraintKey not in ('message', 'template'):
+            raise ValueError("countConstraintKey must be one of ('message', 'template'), got '%s'" % countConstraintKey)
+        if countConstraintKey != self.__countTracker.keyMode:
+            self.__countTracker = _CountTracker(countConstraintCapacity, countConstraintKey)
+        else:
+            self.__countTracker.resize(countConstraintCapacity)
+
+    def set_defer_formatting(self, deferFormatting):
+        """
+        Set whether enqueued records are formatted by the writer thread.
+
+        Only records that go through the enqueue writer are deferred; with
+        enqueue off this setting has no effect. The record timestamp is
+        still taken at call time.
+
+        :Parameters:
+            #. deferFormatting (boolean): True to queue the raw message,
+               args and data and format them on the writer thread.
+
+        :Raises:
+            #. TypeError: If *deferFormatting* is not a boolean.
+        """
+        if not isinstance(deferFormatting, bool):
+            raise TypeError("deferFormatting must be a boolean")
+        self.__deferFormatting = deferFormatting
 
     def is_log_type(self, logType):
         """Return True if the given log type has been defined, False otherwise.
@@ -1812,6 +4172,42 @@ class Logger(object):
             self.set_queue_block_timeout(kwargs["queueBlockTimeout"])
         if "callerInfo" in kwargs:
             self.set_caller_info(kwargs["callerInfo"])
+        if "callerOffset" in kwargs:
+            self.set_caller_offset(kwargs["callerOffset"])
+        if "lastLoggedFiltered" in kwargs:
+            self.set_last_logged_filtered(kwargs["lastLoggedFiltered"])
+        if "timestampPrecision" in kwargs:
+            self.set_timestamp_precision(kwargs["timestampPrecision"])
+        if "recordFormat" in kwargs:
+            self.set_record_format(kwargs["recordFormat"])
+        if "deferFormatting" in kwargs:
+            self.set_defer_formatting(kwargs["deferFormatting"])
+        if "countConstraintCapacity" in kwargs or "countConstraintKey" in kwargs:
+            self.set_count_constraint(kwargs.get("countConstraintCapacity", self.__countTracker.capacity),
+                                      countConstraintKey = kwargs.get("countConstraintKey"))
+        if "duplicateWindow" in kwargs:
+            self.set_duplicate_window(kwargs["duplicateWindow"])
+        if "multiprocess" in kwargs:
+            self.set_multiprocess(kwargs["multiprocess"])
+        if "rotationPolicy" in kwargs:
+            self.set_rotation_policy(kwargs["rotationPolicy"])
+        if "fileMode" in kwargs or "fileBufferSize" in kwargs:
+            self.set_file_mode(kwargs.get("fileMode", self.__fileMode),
+                               fileBufferSize = kwargs.get("fileBufferSize"))
+        if "compression" in kwargs or "compressionJobs" in kwargs:
+            self.set_compression(kwargs.get("compression", self.compression),
+                                 compressionJobs = kwargs.get("compressionJobs"))
+        if any(k in kwargs for k in ("durability", "fsyncEvery", "fsyncInterval", "fsyncLevel")):
+            d = self.__durability
+            self.set_durability(kwargs.get("durability", d.mode),
+                                fsyncEvery    = kwargs.get("fsyncEvery", d.every),
+                                fsyncInterval = kwargs.get("fsyncInterval", d.interval),
+                                fsyncLevel    = kwargs.get("fsyncLevel", d.level))
+        if any(k in kwargs for k in ("groupCommit", "batchMaxRecords", "batchMaxBytes", "batchLatency")):
+            self.set_group_commit(kwargs.get("groupCommit", self.__groupCommit),
+                                  batchMaxRecords = kwargs.get("batchMaxRecords"),
+                                  batchMaxBytes   = kwargs.get("batchMaxBytes"),
+                                  batchLatency    = kwargs.get("batchLatency", self.__batchLatency))
 
 
     @property
@@ -1833,6 +4229,8 @@ class Logger(object):
                     'minLevel':     s.minLevel,
                     'maxLevel':     s.maxLevel,
                     'logTypeFlags': dict(s.logTypeFlags),
+                    'durability':   s.durability.mode if s.durability is not None else None,
+                    'workerGroup':  s.workerGroup,
                 }
         return {"name":self.__name,
                 "flush":self.__flush,
@@ -1854,6 +4252,30 @@ class Logger(object):
                 "queueFullPolicy":self.__queueFullPolicy,
                 "queueBlockTimeout":self.__queueBlockTimeout,
                 "callerInfo":self.__callerInfo,
+                "callerOffset":self.__callerOffset,
+                "lastLoggedFiltered":self.__lastLoggedFiltered,
+                "groupCommit":self.__groupCommit,
+                "batchMaxRecords":self.__batchMaxRecords,
+                "batchMaxBytes":self.__batchMaxBytes,
+                "batchLatency":self.__batchLatency,
+                "sinkWorkers":self.__sinkWorkers,
+                "queueBackend":self.__queueBackend,
+                "multiprocess":self.__multiprocess,
+                "rotationPolicy":self.__rotationPolicy,
+                "compression":self.compression,
+                "compressionJobs":self.__compressionJobs,
+                "fileMode":self.__fileMode,
+                "fileBufferSize":self.__fileBufferSize,
+                "durability":self.__durability.mode,
+                "fsyncEvery":self.__durability.every,
+                "fsyncInterval":self.__durability.interval,
+                "fsyncLevel":self.__durability.level,
+                "timestampPrecision":self.__timestampPrecision,
+                "recordFormat":self.__recordFormat,
+                "deferFormatting":self.__deferFormatting,
+                "countConstraintCapacity":self.__countTracker.capacity,
+                "countConstraintKey":self.__countTracker.keyMode,
+                "duplicateWindow":self.__duplicateWindow,
                 "userSinks":userSinks}
 
 
@@ -1885,6 +4307,28 @@ class Logger(object):
         if not isinstance(name, basestring):
             raise TypeError("name must be a string")
         self.__name = name
+        self.__rebuild_header_templates()
+
+    def __rebuild_header_templates(self):
+        """Precompute the static part of the header of every log type.
+
+        Called whenever the logger name or a log type name or level
+        changes so that _get_header() only has to prepend the timestamp to
+        a cached string instead of rebuilding it with two lookups and a
+        format per record. The json record templates are rebuilt too.
+        """
+        name = self.__name
+        self.__headerTemplates = dict(
+            (logType, " - %s <%s> " % (name, typeName))
+            for logType, typeName in self.__logTypeNames.items()
+        )
+        # the json record members between timestamp and message
+        jsonName = _json_string(name)
+        self.__jsonTemplates = dict(
+            (logType, ',"logger":%s,"logType":%s,"level":%s,"message":' % (
+                jsonName, _json_string(logType), _json_dumps(self.__logTypeLevels.get(logType))))
+            for logType in self.__logTypeNames
+        )
 
     def set_flush(self, flush):
         """
@@ -1900,6 +4344,316 @@ class Logger(object):
             raise TypeError("flush must be boolean")
         self.__flush = flush
 
+    def set_durability(self, durability, fsyncEvery=None, fsyncInterval=None,
+                             fsyncLevel=None, sinks=None):
+        """Set when sink streams are flushed and fsync'ed after a write.
+
+        Only applies while the flush flag is True; set_flush(False)
+        disables all per-record flushing regardless of durability.
+        Explicit calls to flush() always flush and fsync every stream.
+
+        :Parameters:
+            #. durability (string): ``'none'``, ``'flush'`` or ``'fsync'``.
+               ``'fsync'`` flushes and fsyncs after every record.
+            #. fsyncEvery (None, integer): With ``'flush'``, fsync once
+               this many records were written since the last fsync.
+            #. fsyncInterval (None, number): With ``'flush'``, fsync when
+               at least this many seconds elapsed since the last fsync.
+            #. fsyncLevel (None, number, string): With ``'flush'``, fsync
+               after any record whose level is greater or equal to this
+               value. A string must be a defined logType.
+            #. sinks (None, list): When None the setting becomes the
+               logger-wide default used by every sink without its own
+               durability. Otherwise a list of keys of the sinks property
+               -- user sink names or the built-in stdout and file keys --
+               that receive this setting as a per-sink override.
+
+        :Raises:
+            #. TypeError: If *durability* is not a string, if *fsyncEvery*
+               is not an integer, if *fsyncInterval* or *fsyncLevel* is not a
+               number, or if *sinks* is not a list.
+            #. ValueError: If *durability* is not one of the accepted values,
+               if a trigger is given with a mode other than ``'flush'``, if
+               *fsyncEvery* or *fsyncInterval* is not positive, if
+               *fsyncLevel* is an undefined logType, or if a sink key is not
+               registered.
+        """
+        d = self.__make_durability(durability, fsyncEvery, fsyncInterval, fsyncLevel)
+        if sinks is None:
+            self.__durability = d
+            return
+        if not hasattr(sinks, '__iter__') or isinstance(sinks, basestring):
+            raise TypeError("sinks must be None or a list of sink keys")
+        sinks = list(sinks)
+        for key in sinks:
+            if key not in self.__sinks:
+                raise ValueError("sink '%s' is not registered" % (key,))
+        for key in sinks:
+            self.__sinks[key].durability = d
+
+    def set_rate_limit(self, rateLimit, logTypes=None, sinks=None):
+        """Limit how many records are logged with a token bucket.
+
+        A logType limit is checked in log() after level routing and any
+        countConstraint, before the record is formatted or queued; every
+        listed logType gets a bucket of its own. A sink limit is checked
+        when a record is written to the sink, so it also caps force_log()
+        records, and the records it drops still reached the other sinks.
+        Dropped records are announced by a summary record once the limit
+        admits records again, by flush() and at exit.
+
+        :Parameters:
+            #. rateLimit (None, RateLimit): The limit to apply. None
+               removes the limits of the given targets.
+            #. logTypes (None, list): logTypes to limit. When both
+               *logTypes* and *sinks* are None every logType defined at
+               the time of the call is limited.
+            #. sinks (None, list): Keys of the sinks property -- user sink
+               names or the built-in stdout and file keys -- to limit
+               instead of logTypes.
+
+        :Raises:
+            #. TypeError: If *rateLimit* is not None or a RateLimit, or if
+               *logTypes* or *sinks* is not a list.
+            #. ValueError: If both *logTypes* and *sinks* are given, if a
+               logType or sink is not defined, or if a perCallSite limit
+               or one with a summaryInterval is given for sinks.
+        """
+        if rateLimit is not None and not isinstance(rateLimit, RateLimit):
+            raise TypeError("rateLimit must be None or a RateLimit instance")
+        if sinks is not None:
+            if logTypes is not None:
+                raise ValueError("rate limit either logTypes or sinks, not both")
+            if not hasattr(sinks, '__iter__') or isinstance(sinks, basestring):
+                raise TypeError("sinks must be None or a list of sink keys")
+            if rateLimit is not None and rateLimit.perCallSite:
+                raise ValueError("perCallSite rate limits only apply to logTypes")
+            if rateLimit is not None and rateLimit.summaryInterval is not None:
+                raise ValueError("summaryInterval only applies to logType rate limits")
+            sinks = list(sinks)
+            for key in sinks:
+                if key not in self.__sinks:
+                    raise ValueError("sink '%s' is not registered" % (key,))
+            for key in sinks:
+                self.__sinks[key].bucket = None if rateLimit is None else _TokenBucket(rateLimit)
+            return
+        if logTypes is None:
+            logTypes = list(self.__logTypeNames)
+        if not hasattr(logTypes, '__iter__') or isinstance(logTypes, basestring):
+            raise TypeError("logTypes must be None or a list of logTypes")
+        logTypes = list(logTypes)
+        for logType in logTypes:
+            if logType not in self.__logTypeNames:
+                raise ValueError("logType '%s' not defined" % (logType,))
+        # replaced whole so log() never sees a dict being changed
+        rateLimits = dict(self.__rateLimits)
+        for logType in logTypes:
+            if rateLimit is None:
+                rateLimits.pop(logType, None)
+            else:
+                rateLimits[logType] = _RateLimiter(rateLimit)
+        self.__rateLimits = rateLimits
+
+    def set_sampling(self, sampling, logTypes=None, sinks=None):
+        """Keep only a sample of the records of logTypes or sinks.
+
+        A logType rule is checked in log() before count constraints,
+        rate limits and formatting, so a record sampled out costs about
+        as much as a filtered one. A sink rule is checked when a record
+        is written to the sink, so it also samples force_log() records,
+        which were formatted for the other sinks already. Records
+        sampled out are counted, see the sampling property, but not
+        announced.
+
+        :Parameters:
+            #. sampling (None, Sampling): The rule to apply. None removes
+               the rules of the given targets.
+            #. logTypes (None, list): logTypes to sample. When both
+               *logTypes* and *sinks* are None every logType defined at
+               the time of the call is sampled.
+            #. sinks (None, list): Keys of the sinks property -- user sink
+               names or the built-in stdout and file keys -- to sample
+               instead of logTypes.
+
+        :Raises:
+            #. TypeError: If *sampling* is not None or a Sampling, or if
+               *logTypes* or *sinks* is not a list.
+            #. ValueError: If both *logTypes* and *sinks* are given, if a
+               logType or sink is not defined, or if a rule with a
+               contextKey is given for sinks.
+        """
+        if sampling is not None and not isinstance(sampling, Sampling):
+            raise TypeError("sampling must be None or a Sampling instance")
+        if sinks is not None:
+            if logTypes is not None:
+                raise ValueError("sample either logTypes or sinks, not both")
+            if not hasattr(sinks, '__iter__') or isinstance(sinks, basestring):
+                raise TypeError("sinks must be None or a list of sink keys")
+            if sampling is not None and sampling.contextKey is not None:
+                raise ValueError("contextKey sampling only applies to logTypes")
+            sinks = list(sinks)
+            for key in sinks:
+                if key not in self.__sinks:
+                    raise ValueError("sink '%s' is not registered" % (key,))
+            for key in sinks:
+                self.__sinks[key].sampler = None if sampling is None else _Sampler(sampling)
+            return
+        if logTypes is None:
+            logTypes = list(self.__logTypeNames)
+        if not hasattr(logTypes, '__iter__') or isinstance(logTypes, basestring):
+            raise TypeError("logTypes must be None or a list of logTypes")
+        logTypes = list(logTypes)
+        for logType in logTypes:
+            if logType not in self.__logTypeNames:
+                raise ValueError("logType '%s' not defined" % (logType,))
+        # replaced whole so log() never sees a dict being changed
+        samplers = dict(self.__samplers)
+        for logType in logTypes:
+            if sampling is None:
+                samplers.pop(logType, None)
+            else:
+                samplers[logType] = _Sampler(sampling)
+        self.__samplers = samplers
+
+    def set_flight_recorder(self, capacity, triggerLevel='error', perThread=False, contextKey=None):
+        """Keep recent records off disk and write them out when an error is logged.
+
+        The flight recorder keeps, in memory, the last *capacity* records
+        of every logType whose level is below *triggerLevel* and that the
+        file sink does not receive, e.g. debug records filtered out with
+        fileMinLevel. When log() is called with a logType at or above
+        *triggerLevel*, the kept records are written to the file sink
+        with their original timestamps, after a header record and before
+        the triggering record. Kept records are stored unformatted when
+        their message and arguments cannot change, see deferFormatting,
+        and are only formatted if they are dumped. Nothing is dumped
+        while the file sink is disabled.
+
+        :Parameters:
+            #. capacity (None, integer): Records kept per ring. None
+               removes the flight recorder and drops what it kept.
+            #. triggerLevel (number, string): Level of the records that
+               dump the recorder, or a logType whose level is used.
+               Default is 'error'.
+            #. perThread (boolean): Keep a ring per thread, so an error
+               dumps what its own thread logged.
+            #. contextKey (None, string): Keep a ring per value bound under
+               this key with bind(), e.g. ``'requestId'``, so an error
+               dumps the records of its request. Records without the key
+               share one ring.
+
+        :Raises:
+            #. TypeError: If *capacity* is not None or an integer, if
+               *triggerLevel* is not a number or string, if *perThread* is
+               not a boolean or if *contextKey* is not None or a string.
+            #. ValueError: If *capacity* is not positive, if *triggerLevel*
+               is an undefined logType, or if both *perThread* and
+               *contextKey* are given.
+        """
+        if capacity is None:
+            self.__recorder = None
+            self.__rebuild_active_sinks()
+            return
+        if not isinstance(capacity, int) or isinstance(capacity, bool):
+            raise TypeError("capacity must be None or a positive integer")
+        if capacity <= 0:
+            raise ValueError("capacity must be a positive integer, got %d" % capacity)
+        if isinstance(triggerLevel, basestring):
+            if triggerLevel not in self.__logTypeLevels:
+                raise ValueError("triggerLevel '%s' given as string, is not defined logType" % triggerLevel)
+            triggerLevel = self.__logTypeLevels[triggerLevel]
+        if not _is_number(triggerLevel):
+            raise TypeError("triggerLevel must be a number or a logType")
+        if not isinstance(perThread, bool):
+            raise TypeError("perThread must be a boolean")
+        if contextKey is not None:
+            if not isinstance(contextKey, basestring):
+                raise TypeError("contextKey must be None or a string")
+            if perThread:
+                raise ValueError("keep rings either perThread or per contextKey, not both")
+        self.__recorder = _FlightRecorder(capacity, float(triggerLevel), perThread, contextKey)
+        self.__rebuild_active_sinks()
+
+    def set_duplicate_window(self, duplicateWindow, sinks=None):
+        """Collapse bursts of identical records written to sinks.
+
+        A record of the same logType and message as the last record
+        written to a sink, logged less than *duplicateWindow* seconds
+        after the record that started the run, is counted instead of
+        written. The count is written as a ``last message repeated N
+        times`` record before the next different record, on flush() and
+        at exit, so nothing is lost when the burst ends. Once the window
+        is over the next repeat is written in full and starts a new run.
+        Each sink keeps only the key of its last record, so memory does
+        not grow with the number of distinct messages.
+
+        :Parameters:
+            #. duplicateWindow (None, number): The window in seconds. None
+               writes every record.
+            #. sinks (None, list): When None the window applies to every
+               registered sink and to sinks added later. Otherwise a list
+               of keys of the sinks property -- user sink names or the
+               built-in stdout and file keys -- that get this window.
+
+        :Raises:
+            #. TypeError: If *duplicateWindow* is not None or a number, or
+               if *sinks* is not a list.
+            #. ValueError: If *duplicateWindow* is not positive or if a
+               sink key is not registered.
+        """
+        if duplicateWindow is not None:
+            if not _is_number(duplicateWindow):
+                raise TypeError("duplicateWindow must be None or a number")
+            if duplicateWindow <= 0:
+                raise ValueError("duplicateWindow must be positive")
+            duplicateWindow = float(duplicateWindow)
+        if sinks is None:
+            self.__duplicateWindow = duplicateWindow
+            sinks = list(self.__sinks)
+        else:
+            if not hasattr(sinks, '__iter__') or isinstance(sinks, basestring):
+                raise TypeError("sinks must be None or a list of sink keys")
+            sinks = list(sinks)
+            for key in sinks:
+                if key not in self.__sinks:
+                    raise ValueError("sink '%s' is not registered" % (key,))
+        for key in sinks:
+            sink = self.__sinks[key]
+            # a replaced collapser first reports the run it was counting
+            self.__flush_collapser(sink)
+            sink.collapser = None if duplicateWindow is None else _Collapser(duplicateWindow)
+        self.__collapsing = any(sink.collapser is not None for sink in self.__sinks.values())
+
+    def __make_durability(self, durability, fsyncEvery, fsyncInterval, fsyncLevel):
+        """Validate durability settings and return a _Durability instance."""
+        validModes = ('none', 'flush', 'fsync')
+        if not isinstance(durability, basestring):
+            raise TypeError("durability must be a string, one of %s" % str(validModes))
+        if durability not in validModes:
+            raise ValueError("durability must be one of %s, got '%s'" % (str(validModes), durability))
+        if durability != 'flush' and not (fsyncEvery is None and fsyncInterval is None and fsyncLevel is None):
+            raise ValueError("fsyncEvery, fsyncInterval and fsyncLevel require durability 'flush'")
+        if fsyncEvery is not None:
+            if not isinstance(fsyncEvery, int) or isinstance(fsyncEvery, bool):
+                raise TypeError("fsyncEvery must be a positive integer or None")
+            if fsyncEvery <= 0:
+                raise ValueError("fsyncEvery must be a positive integer, got %d" % fsyncEvery)
+        if fsyncInterval is not None:
+            if not _is_number(fsyncInterval):
+                raise TypeError("fsyncInterval must be a positive number or None")
+            fsyncInterval = float(fsyncInterval)
+            if fsyncInterval <= 0:
+                raise ValueError("fsyncInterval must be positive, got %s" % fsyncInterval)
+        if fsyncLevel is not None:
+            if isinstance(fsyncLevel, basestring):
+                if fsyncLevel not in self.__logTypeLevels:
+                    raise ValueError("fsyncLevel '%s' given as string, is not defined logType" % fsyncLevel)
+                fsyncLevel = self.__logTypeLevels[fsyncLevel]
+            if not _is_number(fsyncLevel):
+                raise TypeError("fsyncLevel must be a number, a logType or None")
+            fsyncLevel = float(fsyncLevel)
+        return _Durability(durability, every=fsyncEvery, interval=fsyncInterval, level=fsyncLevel)
+
     def set_stdout(self, stream=None):
         """
         Set the logger standard output stream.
@@ -1965,6 +4719,210 @@ class Logger(object):
             self.__sinks[_SINK_FILE].enabled = logToFile
             self.__rebuild_active_sinks()
 
+    def set_multiprocess(self, multiprocess):
+        """
+        Set whether the log file is shared with other processes.
+
+        The current log file is closed and reopened in the matching mode
+        on the next write. A forked child process reopens the file and
+        the lock file on its first write instead of sharing the parent's
+        descriptors. Enqueue-mode writer threads do not survive fork(),
+        so loggers with enqueue=True must be created after forking.
+
+        :Parameters:
+           #. multiprocess (boolean): Whether to enable multiprocess mode.
+
+        :Raises:
+            #. TypeError: If *multiprocess* is not a boolean.
+            #. RuntimeError: If *multiprocess* is True and fcntl is not
+               available on this platform.
+            #. ValueError: If *multiprocess* is True and compression or
+               the 'mmap' file mode is set.
+        """
+        if not isinstance(multiprocess, bool):
+            raise TypeError("multiprocess must be boolean")
+        if multiprocess and fcntl is None:
+            raise RuntimeError("multiprocess mode requires fcntl, which is not available on this platform")
+        if multiprocess and self.__compressor is not None:
+            raise ValueError("multiprocess mode cannot be combined with compression")
+        if multiprocess and self.__fileMode == 'mmap':
+            raise ValueError("multiprocess mode cannot be combined with the 'mmap' file mode")
+        with self.__rotationLock:
+            if multiprocess == self.__multiprocess:
+                return
+            if self.__logFileStream is not None:
+                self.__flush_stream(self.__logFileStream)
+                try:
+                    self.__logFileStream.close()
+                except OSError:
+                    pass
+                self.__logFileStream = None
+            self.__multiprocess = multiprocess
+        if multiprocess and not self.__forkHooked and hasattr(os, 'register_at_fork'):
+            # a thread may hold the rotation lock at fork time; the child
+            # must not inherit it in the acquired state
+            os.register_at_fork(after_in_child=self.__reset_after_fork)
+            self.__forkHooked = True
+
+    def set_file_mode(self, fileMode, fileBufferSize=None):
+        """
+        Set how records are written to the log file.
+
+        In binary mode records are gathered as strings, encoded to UTF-8
+        in chunks of up to 64 KB without newline translation and appended
+        to a buffered writer over an O_APPEND file descriptor. The buffer
+        reaches the file in one os.write() when it fills up and whenever
+        the durability policy flushes the file, so with durability
+        ``'none'`` records are written in fileBufferSize chunks. Buffers
+        larger than the CPU caches, a few MB, are slower than the default
+        256 KB: the bytes fall out of cache before they are written. The
+        byte counter behind logFileMaxSize counts the encoded bytes
+        exactly, and a rotation flushes the buffer into the file being
+        left, so a record never straddles two files. Multiprocess mode
+        ignores the buffer and writes every record unbuffered.
+
+        In mmap mode every log file is preallocated to logFileMaxSize and
+        mapped into memory, and records are copied into the mapping with
+        no system call per record. A record is in the page cache as soon
+        as it is written, where readers see it and a crash of the process
+        cannot lose it, which text and binary files only offer with
+        durability ``'flush'`` at the cost of one write() per record. Use
+        mmap in that case: with durability ``'none'`` the buffered text
+        and binary modes are as fast or faster, since every new page of
+        the mapping costs a page fault. The file is truncated to its records
+        when the logger moves on to the next file, changes mode or exits.
+        Until then readers see the preallocated NUL tail. A file left
+        padded by a process that died is trimmed when the logger lists
+        the log directory, and appended to after its last record.
+
+        The current log file is closed and reopened in the new mode on
+        the next write.
+
+        :Parameters:
+           #. fileMode (string): ``'text'``, ``'binary'`` or ``'mmap'``.
+           #. fileBufferSize (None, integer, string): Binary write buffer
+              in bytes, or a size string such as ``'4MB'``. In mmap mode
+              the step by which a file grows when logFileMaxSize is None
+              or a record does not fit. None keeps the current value.
+
+        :Raises:
+            #. TypeError: If *fileMode* is not a string, or if
+               *fileBufferSize* is not None, an integer or a string.
+            #. ValueError: If *fileMode* is not one of the modes, if
+               *fileBufferSize* is not a positive size, or if the mmap
+               mode is requested in multiprocess mode.
+        """
+        if not isinstance(fileMode, basestring):
+            raise TypeError("fileMode must be a string, one of ('text', 'binary', 'mmap')")
+        if fileMode not in ('text', 'binary', 'mmap'):
+            raise ValueError("fileMode must be one of ('text', 'binary', 'mmap'), got '%s'" % fileMode)
+        if fileMode == 'mmap' and self.__multiprocess:
+            raise ValueError("the 'mmap' file mode cannot be combined with multiprocess mode")
+        if fileBufferSize is None:
+            fileBufferSize = self.__fileBufferSize
+        elif isinstance(fileBufferSize, basestring):
+            fileBufferSize = _parse_size(fileBufferSize)
+        elif not isinstance(fileBufferSize, int) or isinstance(fileBufferSize, bool):
+            raise TypeError("fileBufferSize must be None, an integer or a size string")
+        if fileBufferSize <= 0:
+            raise ValueError("fileBufferSize must be > 0")
+        with self.__rotationLock:
+            if (fileMode, fileBufferSize) == (self.__fileMode, self.__fileBufferSize):
+                return
+            if self.__logFileStream is not None:
+                self.__flush_stream(self.__logFileStream)
+                try:
+                    self.__logFileStream.close()
+                except OSError:
+                    pass
+                self.__logFileStream = None
+            self.__fileMode       = fileMode
+            self.__fileBufferSize = fileBufferSize
+
+    def __reset_after_fork(self):
+        """Give a forked child its own rotation lock (registered with os.register_at_fork)."""
+        self.__rotationLock = threading.RLock()
+
+    def __lock_log_files(self):
+        """Acquire the inter-process lock guarding the log file set.
+
+        flock() locks belong to an open file description, which a forked
+        child shares with its parent, so the lock file is reopened in
+        every process and whenever the log file basename changes.
+        """
+        path = "%s.%s.lock" % (self.__logFileBasename, self.__logFileExtension)
+        pid  = os.getpid()
+        if self.__lockFd is None or self.__lockPid != pid or self.__lockPath != path:
+            if self.__lockFd is not None:
+                try:
+                    os.close(self.__lockFd)
+                except OSError:
+                    pass
+            self.__lockFd   = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+            self.__lockPath = path
+            self.__lockPid  = pid
+        fcntl.flock(self.__lockFd, fcntl.LOCK_EX)
+
+    def __claim_rollover(self, rolloverAt):
+        """Return *rolloverAt* if this process is first to reach it, else None.
+
+        Must be called with the inter-process lock held. The lock file
+        holds the epoch of the latest time rollover any process performed.
+        """
+        try:
+            done = float(os.pread(self.__lockFd, 64, 0) or 0)
+        except ValueError:
+            done = 0.0
+        if done >= rolloverAt:
+            return None
+        stamp = repr(float(rolloverAt)).encode('ascii')
+        os.ftruncate(self.__lockFd, 0)
+        os.pwrite(self.__lockFd, stamp, 0)
+        return rolloverAt
+
+    def __open_log_file(self):
+        """Open the current log file for appending.
+
+        In multiprocess mode the file is opened unbuffered in binary mode
+        so every record reaches the O_APPEND descriptor in one write().
+        The binary file mode wraps a fileBufferSize binary buffer in a
+        UTF-8 text layer without newline translation, and the mmap file
+        mode maps a preallocated segment.
+        """
+        if self.__multiprocess:
+            self.__logFilePid = os.getpid()
+            stream = open(self.__logFileName, 'ab', buffering=0)
+            self.__start_rollover_period(stream)
+            return stream
+        if self.__fileMode == 'mmap':
+            stream = _MmapSegment(self.__logFileName, self.__logFileMaxBytes, self.__fileBufferSize)
+            self.__logFileBytes = stream.used
+            self.__start_rollover_period(stream)
+            return stream
+        if self.__fileMode == 'binary':
+            # the text layer gathers records as strings and encodes them in
+            # chunks, so a record costs one C call instead of an encode()
+            # and a buffered write(); chunks beyond 64 KB only spill the
+            # CPU caches
+            stream = io.TextIOWrapper(open(self.__logFileName, 'ab', buffering=self.__fileBufferSize),
+                                      encoding='utf-8', newline='')
+            # _CHUNK_SIZE is an undocumented CPython TextIOWrapper attribute;
+            # an implementation without it keeps its own chunk size, which
+            # changes the speed of this mode but not the bytes written
+            try:
+                stream._CHUNK_SIZE = min(self.__fileBufferSize, _BINARY_CHUNK_SIZE)
+            except (AttributeError, TypeError, ValueError):
+                pass
+        else:
+            stream = open(self.__logFileName, 'a')
+        # seed the byte counter used by the size check in __log_to_file.
+        # It counts UTF-8 bytes, so it is exact whenever the file encoding
+        # agrees on the record bytes -- always for ASCII records -- and
+        # ignores newline translation on Windows
+        self.__logFileBytes = os.fstat(stream.fileno()).st_size
+        self.__start_rollover_period(stream)
+        return stream
+
     def set_log_type_flags(self, logType, stdoutFlag, fileFlag):
         """
         Set a defined log type flags.
@@ -2081,103 +5039,358 @@ class Logger(object):
             raise TypeError("logFileBasename must be a basestring")
         self.__logFileBasename = _normalize_path(logFileBasename)#logFileBasename
 
-    def __set_log_file_name(self):
-        """Automatically set logFileName attribute."""
+    def __set_log_file_name(self, openStream=False, rolloverAt=None):
+        """Automatically set logFileName attribute.
+
+        In multiprocess mode the directory scan, the removal of rolled
+        files and, when *openStream* is True, the opening of the chosen
+        file all happen under an inter-process lock so concurrent
+        processes agree on the current file number.
+
+        :Parameters:
+            #. openStream (boolean): Whether to open the chosen file as the
+               new log file stream before returning.
+            #. rolloverAt (None, number): Epoch of a time rollover that is
+               due. The current file is then left even if it is not full.
+               In multiprocess mode the epoch is stamped into the lock
+               file so only the first process to reach it starts a file.
+        """
         with self.__rotationLock:
             # ensure directory exists
             logDir, _ = os.path.split(self.__logFileBasename)
             if len(logDir) and not os.path.exists(logDir):
                 os.makedirs(logDir)
-            # get existing logfiles
-            numsLUT  = {}
-            filesLUT = {}
-            ordered  = []
-            if not len(logDir) or os.path.isdir(logDir):
-                listDir = os.listdir(logDir) if len(logDir) else os.listdir('.')
-                for f in listDir:
-                    p = os.path.join(logDir,f)
-                    if not os.path.isfile(p):
-                        continue
-                    if re.match(r"^{bsn}(_\d+)?\.{ext}$".format(bsn=re.escape(self.__logFileBasename), ext=re.escape(self.__logFileExtension)), p) is None:
-                        continue
-                    n = p.split(self.__logFileBasename)[1].split('.%s'%self.__logFileExtension)[0]
-                    n = int(n[1:]) if len(n) else ''
-                    if n in numsLUT:
-                        raise RuntimeError("filelog number is found in LUT shouldn't have happened. PLEASE REPORT BUG")
-                    numsLUT[n]  = p
-                    filesLUT[p] = n
-                ordered = ([''] if '' in numsLUT else []) + sorted([n for n in numsLUT if isinstance(n, int)])
-                ordered = [numsLUT[n] for n in ordered]
-            # get last file number
-            if len(ordered):
-                number = filesLUT[ordered[-1]]
-            else:
-                number = self.__logFileFirstNumber
-            # limit number of log files to logFileRoll
-            if self.__logFileRoll is not None:
-                while len(ordered)>self.__logFileRoll:
-                    path = ordered.pop(0)
-                    try:
-                        os.remove(path)
-                    except (FileNotFoundError, OSError):
-                        pass
-                if len(ordered) == self.__logFileRoll and self.__logFileMaxSize is not None:
-                    try:
-                        fileSizeMB = os.stat(ordered[-1]).st_size / (1024.**2)
-                    except (FileNotFoundError, OSError):
-                        fileSizeMB = 0.0
-                    if fileSizeMB >= self.__logFileMaxSize:
-                        path = ordered.pop(0)
-                        try:
-                            os.remove(path)
-                        except (FileNotFoundError, OSError):
-                            pass
-                        if isinstance(number, int):
-                            number = number + 1
-            # temporarily set self.__logFileName
-            if not isinstance(number, int):
-                self.__logFileName = self.__logFileBasename+"."+self.__logFileExtension
-                number = -1
-            else:
-                self.__logFileName = self.__logFileBasename+"_"+str(number)+"."+self.__logFileExtension
-            # check temporarily set logFileName file size
-            if self.__logFileMaxSize is not None:
-                while os.path.isfile(self.__logFileName):
-                    if os.stat(self.__logFileName).st_size/(1024.**2) < self.__logFileMaxSize:
-                        break
-                    number += 1
-                    self.__logFileName = self.__logFileBasename+"_"+str(number)+"."+self.__logFileExtension
-            # create log file stream
-            if self.__logFileStream is not None:
+            if self.__multiprocess:
+                self.__lock_log_files()
+            try:
+                if self.__multiprocess and rolloverAt is not None:
+                    rolloverAt = self.__claim_rollover(rolloverAt)
+                self.__scan_log_files(logDir, rolloverAt is not None)
+                if openStream:
+                    self.__logFileStream = self.__open_log_file()
+            finally:
+                if self.__multiprocess:
+                    fcntl.flock(self.__lockFd, fcntl.LOCK_UN)
+
+    def __scan_log_files(self, logDir, rollover=False):
+        """Pick the current log file number, removing rolled files.
+
+        Must be called with __rotationLock held, and with the inter-process
+        lock held in multiprocess mode. Closes the current file stream.
+        With *rollover* True (a time rollover is due) the newest file is
+        treated as full unless it is empty.
+
+        The log directory is listed only when the in-memory index of this
+        logger's files is missing, belongs to another basename or
+        extension, or no longer matches the disk because its newest file
+        was removed behind the logger's back. Otherwise the index is
+        updated in place as files are rolled and created. In multiprocess
+        mode other processes create and roll files all the time, so the
+        directory is always listed there.
+
+        With compression set, the file that was current is queued for
+        compression once a different one is chosen -- or every rotated
+        file when the directory was listed. Compressed files are never
+        appended to; a compressed newest file counts as full.
+
+        In mmap mode the newest file is trimmed of the NUL padding an
+        interrupted run may have left whenever the directory is listed.
+        """
+        previous = self.__logFileName
+        # close the current stream first so buffered records count in the
+        # file sizes checked below
+        if self.__logFileStream is not None:
+            try:
+                self.__logFileStream.close()
+            except OSError:
+                pass
+        self.__logFileStream = None
+        index = self.__logFileIndex
+        key   = (self.__logFileBasename, self.__logFileExtension)
+        listed = (self.__multiprocess or index is None or self.__logFileIndexKey != key or
+                  (len(index) and not os.path.isfile(index[-1][1])))
+        if listed:
+            index = self.__list_log_files(logDir)
+            self.__logFileIndex    = index
+            self.__logFileIndexKey = key
+            # an mmap segment of a process that died is still padded to
+            # its preallocated size -- trim it before it is measured
+            if self.__fileMode == 'mmap' and len(index) and not index[-1][1].endswith(_COMPRESSED_SUFFIXES):
+                _trim_log_file(index[-1][1])
+        # get last file number
+        if len(index):
+            number = index[-1][0]
+            sealed = index[-1][1].endswith(_COMPRESSED_SUFFIXES)
+        else:
+            number = self.__logFileFirstNumber
+            sealed = False
+        # limit number of log files to logFileRoll
+        if self.__logFileRoll is not None:
+            while len(index)>self.__logFileRoll:
+                self.__remove_log_file(index.pop(0)[1])
+            if len(index) == self.__logFileRoll and (rollover or sealed or self.__logFileMaxBytes is not None):
                 try:
-                    self.__logFileStream.close()
-                except OSError:
+                    fileSize = os.stat(index[-1][1]).st_size
+                except (FileNotFoundError, OSError, IndexError):
+                    fileSize = 0
+                if sealed or (rollover and fileSize) or (self.__logFileMaxBytes is not None and fileSize >= self.__logFileMaxBytes):
+                    self.__remove_log_file(index.pop(0)[1])
+                    if isinstance(number, int):
+                        number   = number + 1
+                        rollover = False
+        # temporarily set self.__logFileName
+        if not isinstance(number, int):
+            self.__logFileName = self.__logFileBasename+"."+self.__logFileExtension
+            entry  = ''
+            number = -1
+        else:
+            self.__logFileName = self.__logFileBasename+"_"+str(number)+"."+self.__logFileExtension
+            entry  = number
+        # check temporarily set logFileName file size. A due time rollover
+        # skips the first, current file when it holds any record, and a
+        # compressed file is always skipped
+        if self.__logFileMaxBytes is not None or rollover or sealed:
+            while True:
+                fileSize = self.__log_file_size(self.__logFileName)
+                if fileSize is None:
+                    break
+                if fileSize < 0:
                     pass
-            self.__logFileStream = None
+                elif rollover and fileSize:
+                    rollover = False
+                elif self.__logFileMaxBytes is None or fileSize < self.__logFileMaxBytes:
+                    break
+                if not len(index) or index[-1][0] != entry:
+                    index.append((entry, self.__logFileName))
+                number += 1
+                entry   = number
+                self.__logFileName = self.__logFileBasename+"_"+str(number)+"."+self.__logFileExtension
+        # record the chosen file — it is created on the first write
+        if not len(index) or index[-1][0] != entry:
+            index.append((entry, self.__logFileName))
+        # compress what was rotated away
+        if self.__compressor is not None:
+            if listed:
+                self.__queue_compression([path for _, path in index[:-1]])
+            elif previous is not None and previous != self.__logFileName:
+                self.__queue_compression([previous])
+
+    @staticmethod
+    def __log_file_size(path):
+        """Return the size of the log file *path*, -1 if only a compressed
+        copy of it exists, or None if there is no such file."""
+        try:
+            return os.stat(path).st_size
+        except OSError:
+            pass
+        for suffix in _COMPRESSED_SUFFIXES:
+            if os.path.isfile(path + suffix):
+                return -1
+        return None
+
+    def __list_log_files(self, logDir):
+        """List logDir once and return this logger's files, oldest first.
+
+        :Returns:
+            #. index (list): (number, path) tuples sorted by number, the
+               unnumbered file first with number ''. Entries are matched
+               by name before anything is stat'ed, so unrelated files in
+               a shared directory cost one regex match each. Compressed
+               files are listed under their number too; while both the
+               original and its compressed copy exist the original wins.
+        """
+        if len(logDir) and not os.path.isdir(logDir):
+            return []
+        pattern = re.compile(r"^{bsn}(?:_(\d+))?\.{ext}({sfx})?$".format(
+            bsn=re.escape(os.path.basename(self.__logFileBasename)),
+            ext=re.escape(self.__logFileExtension),
+            sfx="|".join(re.escape(sfx) for sfx in _COMPRESSED_SUFFIXES)))
+        numbered   = {}
+        unnumbered = None
+        with os.scandir(logDir if len(logDir) else '.') as entries:
+            for f in entries:
+                match = pattern.match(f.name)
+                if match is None or not f.is_file():
+                    continue
+                p = os.path.join(logDir, f.name)
+                if match.group(1) is None:
+                    if unnumbered is None or match.group(2) is None:
+                        unnumbered = p
+                    continue
+                n = int(match.group(1))
+                if n in numbered:
+                    if match.group(2) is not None:
+                        continue
+                    if not numbered[n].endswith(_COMPRESSED_SUFFIXES):
+                        raise RuntimeError("filelog number is found in LUT shouldn't have happened. PLEASE REPORT BUG")
+                numbered[n] = p
+        index = [('', unnumbered)] if unnumbered is not None else []
+        return index + [(n, numbered[n]) for n in sorted(numbered)]
+
+    @staticmethod
+    def __remove_log_file(path):
+        """Delete a rolled log file, ignoring files that are already gone.
+
+        The compressed copies of an uncompressed file are deleted too, as
+        the file may have been compressed since it was indexed.
+        """
+        paths = [path]
+        if not path.endswith(_COMPRESSED_SUFFIXES):
+            paths.extend(path + sfx for sfx in _COMPRESSED_SUFFIXES)
+        for p in paths:
+            try:
+                os.remove(p)
+            except (FileNotFoundError, OSError):
+                pass
 
     def set_log_file_maximum_size(self, logFileMaxSize):
         """
         Set the log file maximum size in megabytes.
 
+        The limit is kept as an integer number of bytes and compared with
+        a running count of the bytes written to the current file, which
+        is seeded from the file size whenever a file is opened.
+
+        :Parameters:
+           #. logFileMaxSize (None, number, string): The maximum size in Megabytes
+              of a logging file, or a string made of a number and one of
+              the units B, KB, MB or GB, e.g. '512KB'. Once exceeded,
+              another logging file as logFileBasename_N.logFileExtension
+              will be created. Where N is an automatically incremented
+              number. If None or a negative number is given, the logging
+              file will grow indefinitely
+
+        :Raises:
+            #. TypeError: If *logFileMaxSize* is not a number, a string or None.
+            #. ValueError: If *logFileMaxSize* is a string that is neither
+               a number nor a size with a unit.
+        """
+        maxBytes = None
+        if logFileMaxSize is not None:
+            if isinstance(logFileMaxSize, basestring) and not _is_number(logFileMaxSize):
+                maxBytes       = _parse_size(logFileMaxSize)
+                logFileMaxSize = maxBytes / (1024.**2)
+            elif not _is_number(logFileMaxSize):
+                raise TypeError("logFileMaxSize must be a number")
+            else:
+                logFileMaxSize = float(logFileMaxSize)
+                maxBytes       = int(logFileMaxSize * 1024**2)
+            if maxBytes <= 0:
+                logFileMaxSize = maxBytes = None
+        #assert logFileMaxSize>=1, "logFileMaxSize minimum size is 1 megabytes"
+        self.__logFileMaxSize  = logFileMaxSize
+        self.__logFileMaxBytes = maxBytes
+
+    def set_rotation_policy(self, rotationPolicy):
+        """
+        Set the time-based or hybrid rotation policy of the log file.
+
+        :Parameters:
+           #. rotationPolicy (None, RotationPolicy): The policy. Its maxSize,
+              when given, is applied through set_log_file_maximum_size().
+              Its time trigger is scheduled from the start time of the
+              current log file, so a file left over from an earlier
+              period rotates on the next write. None removes the time
+              trigger and leaves logFileMaxSize as it is.
+
+        :Raises:
+            #. TypeError: If *rotationPolicy* is not a RotationPolicy or None.
+        """
+        if rotationPolicy is not None and not isinstance(rotationPolicy, RotationPolicy):
+            raise TypeError("rotationPolicy must be None or a RotationPolicy instance")
+        if rotationPolicy is not None and rotationPolicy.maxSize is not None:
+            self.set_log_file_maximum_size(rotationPolicy.maxSize)
+        with self.__rotationLock:
+            self.__rotationPolicy = rotationPolicy
+            self.__rotationClock  = None if rotationPolicy is None else rotationPolicy.clock
+            self.__nextRollover   = None
+            # an already open file is scheduled now, others when opened
+            if self.__logFileStream is not None:
+                self.__start_rollover_period(self.__logFileStream)
+
+    def set_compression(self, compression, compressionJobs=None):
+        """
+        Set the compression of rotated log files.
+
+        Files are compressed on background threads after the logger moved
+        on to the next file. Rotated files found uncompressed when
+        compression is enabled or the log directory is listed, e.g. left
+        by an earlier run, are queued too.
+        Switching methods lets the files already queued finish with the
+        previous one.
+
         :Parameters:
-           #. logFileMaxSize (None, number): The maximum size in Megabytes
-              of a logging file. Once exceeded, another logging file as
-              logFileBasename_N.logFileExtension will be created.
-              Where N is an automatically incremented number. If None or a
-              negative number is given, the logging file will grow
-              indefinitely
+           #. compression (None, string): One of ``'gzip'``, ``'bz2'`` or
+              ``'lzma'``. None disables compression.
+           #. compressionJobs (None, integer): Maximum number of files
+              compressed at once. None keeps the current value.
 
         :Raises:
-            #. TypeError: If *logFileMaxSize* is not a number or None.
+            #. TypeError: If *compression* is not None or a string, or if
+               *compressionJobs* is not None or an integer.
+            #. ValueError: If *compression* is not a known method, if
+               *compressionJobs* is smaller than 1, or if compression is
+               requested in multiprocess mode.
+            #. RuntimeError: If the module of the method is not available
+               in this Python build.
+        """
+        if compression is not None:
+            if not isinstance(compression, basestring):
+                raise TypeError("compression must be None or a string, one of %s" % (tuple(sorted(_COMPRESSION_METHODS)),))
+            if compression not in _COMPRESSION_METHODS:
+                raise ValueError("compression must be one of %s, got '%s'" % (tuple(sorted(_COMPRESSION_METHODS)), compression))
+            if _COMPRESSION_METHODS[compression][1] is None:
+                raise RuntimeError("'%s' compression is not available in this Python build" % compression)
+            if self.__multiprocess:
+                raise ValueError("compression cannot be combined with multiprocess mode")
+        if compressionJobs is None:
+            compressionJobs = self.__compressionJobs
+        if not isinstance(compressionJobs, int) or isinstance(compressionJobs, bool):
+            raise TypeError("compressionJobs must be None or an integer")
+        if compressionJobs < 1:
+            raise ValueError("compressionJobs must be >= 1")
+        with self.__rotationLock:
+            self.__compressionJobs = compressionJobs
+            old = self.__compressor
+            if old is not None and old.method == compression and old.maxJobs == compressionJobs:
+                return
+            self.__compressor = None if compression is None else _Compressor(compression, compressionJobs)
+            if old is not None:
+                old.close()
+            if self.__compressor is not None and self.__logFileIndex:
+                self.__queue_compression([path for _, path in self.__logFileIndex[:-1]])
+
+    def __queue_compression(self, paths):
+        """Hand rotated log files that exist and are not compressed to the compressor."""
+        compressor = self.__compressor
+        for path in paths:
+            if path != self.__logFileName and not path.endswith(_COMPRESSED_SUFFIXES) and os.path.isfile(path):
+                compressor.submit(path, self.__rotationLock)
+
+    def __schedule_rollover(self, base):
+        """Precompute the next time rollover epoch of the file started at *base*."""
+        policy = self.__rotationPolicy
+        if policy is None or base is None:
+            self.__nextRollover = None
+        else:
+            self.__nextRollover = policy.next_rollover(base, self.__timezone)
+
+    def __start_rollover_period(self, stream):
+        """Schedule the time rollover of a freshly opened log file.
+
+        A non-empty file was started at the latest when it was last
+        written, so its modification time bounds the period it belongs to.
+        The modification time is a file system time; its age is carried
+        over to the rotation clock so every rollover step reads one clock.
         """
-        if logFileMaxSize is not None:
-            if not _is_number(logFileMaxSize):
-                raise TypeError("logFileMaxSize must be a number")
-            logFileMaxSize = float(logFileMaxSize)
-            if logFileMaxSize <=0:
-                logFileMaxSize = None
-        #assert logFileMaxSize>=1, "logFileMaxSize minimum size is 1 megabytes"
-        self.__logFileMaxSize = logFileMaxSize
+        if self.__rotationPolicy is None:
+            return
+        base = self.__rotationClock()
+        stat = os.fstat(stream.fileno())
+        if stat.st_size:
+            base -= max(0.0, time.time() - stat.st_mtime)
+        self.__rolloverBase = base
+        self.__schedule_rollover(base)
 
     def set_maximum_message_size(self, maxMessageSize):
         """Set the maximum number of characters allowed in a single log message.
@@ -2430,10 +5643,13 @@ class Logger(object):
         add_sink(), remove_sink(), set_log_to_stdout_flag(),
         set_minimum_level(), set_log_type_stdout_flag(), and so on.
 
-        After this runs, ``__activeSinks[logType]`` holds exactly the
-        _Sink objects that will receive a message of that type. The
-        dispatch loop in log() and force_log() reads this list directly
-        -- no per-call filtering is needed.
+        After this runs, ``__sinkTable.active[logType]`` holds exactly
+        the _Sink objects that will receive a message of that type, as a
+        tuple. The dispatch loop in log() reads it directly -- no
+        per-call filtering is needed -- and queued records share it
+        without a copy since a rebuild replaces the whole _SinkTable
+        instead of mutating it. Rebuilds are serialised so the last one
+        always sees every registry change made before it started.
 
         Key invariant: for the built-in sinks (_SINK_STDOUT and
         _SINK_FILE) the sink.logTypeFlags dict is kept current by
@@ -2443,11 +5659,17 @@ class Logger(object):
         For user-added sinks the same invariant is maintained by
         add_sink() and set_log_type_sink_flag().
         """
+        with self.__sinkTableLock:
+            self.__sinkTable = self.__build_sink_table(self.__sinkTable.generation + 1)
+
+    def __build_sink_table(self, generation):
+        """Return a new _SinkTable for the current sink registry."""
+        sinks  = list(self.__sinks.values())
         result = {}
-        for logType in self.__logTypeNames:
+        for logType in list(self.__logTypeNames):
             activeSinks = []
             level = self.__logTypeLevels.get(logType)
-            for sink in self.__sinks.values():
+            for sink in sinks:
                 if not sink.enabled:
                     continue
                 if not sink.logTypeFlags.get(logType, True):
@@ -2460,10 +5682,132 @@ class Logger(object):
                     if sink.maxLevel is not None and level > sink.maxLevel:
                         continue
                 activeSinks.append(sink)
-            result[logType] = activeSinks
-        self.__activeSinks = result
+            result[logType] = tuple(activeSinks)
+        recorded = triggers = frozenset()
+        recorder = self.__recorder
+        fileSink = self.__sinks.get(_SINK_FILE)
+        if recorder is not None and fileSink is not None and fileSink.enabled:
+            # the recorder keeps what the file sink does not write already
+            triggers = frozenset(lt for lt, level in self.__logTypeLevels.items()
+                                 if level >= recorder.triggerLevel)
+            recorded = frozenset(lt for lt, level in self.__logTypeLevels.items()
+                                 if level < recorder.triggerLevel and fileSink not in result.get(lt, ()))
+        lanes = {}
+        if self.__sinkWorkers:
+            # group every active-sink tuple by lane, keeping sink order, so
+            # log() enqueues one record per lane instead of one per sink.
+            # A single lane reuses the active tuple so its record is not copied
+            for logType, activeSinks in result.items():
+                grouped = {}
+                for sink in activeSinks:
+                    grouped.setdefault(sink.lane, []).append(sink)
+                if len(grouped) == 1:
+                    lanes[logType] = [(activeSinks[0].lane, activeSinks)]
+                else:
+                    lanes[logType] = [(lane, tuple(sinks)) for lane, sinks in grouped.items()]
+        return _SinkTable(result, lanes, generation, recorded, triggers)
+
+    def __attach_lane(self, key, sink):
+        """Attach *sink* to its writer lane, starting the lane if needed.
+
+        Sinks with a workerGroup share the lane of that group; any other
+        sink gets a lane of its own named after its key. Must be called
+        with __sinkTableLock held.
+
+        :Parameters:
+            #. key (int, str): The sink key in the sink registry.
+            #. sink (_Sink): The sink to attach.
+        """
+        if sink.workerGroup is not None:
+            laneKey, name = ('group', sink.workerGroup), sink.workerGroup
+        else:
+            laneKey, name = ('sink', key), sink.sinkType if sink.sinkType != 'user' else key
+        lane = self.__lanes.get(laneKey)
+        if lane is None:
+            lane = _SinkLane(name, self.__new_queue())
+            lane.worker = threading.Thread(
+                target=self.__enqueue_worker,
+                args=(lane.queue,),
+                name="pysimplelog-writer-%s" % name,
+            )
+            lane.worker.daemon = True
+            lane.worker.start()
+            self.__lanes[laneKey] = lane
+        lane.sinks += 1
+        sink.lane = lane
+
+    def __new_queue(self):
+        """Create an empty record queue of the configured backend and size."""
+        maxsize = self.__maxQueueSize if self.__maxQueueSize is not None else 0
+        if self.__queueBackend == 'ring':
+            return _RingQueue(maxsize=maxsize)
+        return _queue_module.Queue(maxsize=maxsize)
+
+    def __detach_lane(self, sink):
+        """Detach a removed sink from its lane.
 
-    def __dispatch_sinks_sync(self, sinks, log, logType):
+        Must be called with __sinkTableLock held.
+
+        :Returns:
+            #. result (None, _SinkLane): The lane if *sink* was its last
+               sink. The caller retires it with __retire_lane() once the
+               table that no longer routes to it is published.
+        """
+        lane = sink.lane
+        if lane is None:
+            return None
+        sink.lane   = None
+        lane.sinks -= 1
+        if lane.sinks:
+            return None
+        for laneKey, other in list(self.__lanes.items()):
+            if other is lane:
+                del self.__lanes[laneKey]
+        return lane
+
+    def __retire_lane(self, lane):
+        """Stop the writer thread of a lane no sink uses any more.
+
+        Records already queued are still written: the stop sentinel is
+        queued behind them and the thread exits once it is reached. A
+        log() call that read the routing table before the lane was
+        detached may still queue a record behind the sentinel; it sees
+        the lane retired and writes the record itself.
+        """
+        # lift the bound so queuing the sentinel never blocks the caller
+        lane.queue.maxsize = 0
+        lane.retired       = True
+        lane.queue.put(_QUEUE_STOP)
+
+    def __drain_retired_lane(self, lane):
+        """Write the records left in the queue of a retired lane.
+
+        Called by the thread that queued a record on *lane* after it was
+        retired. Waits for the lane thread to exit, then dispatches what
+        it left behind on the calling thread. A sink of the lane logging
+        from its own write() returns at once, as the lane thread must
+        not consume its own stop sentinel.
+        """
+        if lane.worker is threading.current_thread():
+            return
+        lane.worker.join()
+        with self.__retiredLock:
+            while True:
+                try:
+                    item = lane.queue.get_nowait()
+                except _queue_module.Empty:
+                    return
+                try:
+                    if item is _QUEUE_STOP:
+                        continue
+                    if item.text is None:
+                        self.__format_deferred(item)
+                    self.__dispatch_sinks_sync(item.sinks, item.text, item.logType,
+                                               item.key, item.timestamp)
+                finally:
+                    lane.queue.task_done()
+
+    def __dispatch_sinks_sync(self, sinks, log, logType, key=None, timestamp=None):
         """Dispatch a formatted log record to a list of sinks synchronously.
 
         Called by both log() on the synchronous path and __enqueue_worker()
@@ -2476,33 +5820,172 @@ class Logger(object):
             #. sinks (list): List of _Sink objects to dispatch to.
             #. log (string): The fully formatted log record string.
             #. logType (string): The log type name, used for stdout colour formatting.
+            #. key (None, tuple): Duplicate-collapsing key of the record,
+               None for a record that is never collapsed.
+            #. timestamp (None, number): Epoch seconds the record was
+               logged at, None meaning now. Only read by collapsing sinks.
         """
+        level = self.__logTypeLevels.get(logType)
         for sink in sinks:
-            if sink.sinkType == 'file':
-                self.__log_to_file("%s\n" % log)
+            sampler = sink.sampler
+            if sampler is not None and not sampler.keep(None):
+                continue
+            bucket = sink.bucket
+            if bucket is not None:
+                if not bucket.take(logType):
+                    continue
+                if bucket.suppressed:
+                    self.__write_sink(sink, self.__sink_summary(sink, logType), level=level)
+            if sink.sinkType == 'stdout':
+                payload = self.__format_stdout_line(logType, log)
+            else:
+                payload = "%s\n" % log
+            collapser = sink.collapser
+            if collapser is None:
+                self.__write_sink(sink, payload, level=level)
+                continue
+            if timestamp is None:
+                timestamp = time.time()
+            with collapser.lock:
+                if collapser.repeats(key, timestamp):
+                    continue
+                ended = collapser.restart(key, timestamp)
+                if ended is not None:
+                    self.__write_sink(sink, self.__repeat_summary(sink, *ended), level=level)
+                self.__write_sink(sink, payload, level=level)
+
+    def __write_sink(self, sink, payload, records=1, level=None):
+        """Write a payload of one or more complete records to one sink.
+
+        :Parameters:
+            #. sink (_Sink): The destination sink.
+            #. payload (string): Newline-terminated record text. Stdout
+               payloads already carry their ANSI wrap codes.
+            #. records (integer): Number of records in the payload, used
+               by the durability triggers and in the warning emitted when
+               a user sink fails.
+            #. level (None, number): Highest level among the records in
+               the payload, used by the fsyncLevel durability trigger.
+        """
+        if sink.sinkType == 'file':
+            self.__log_to_file(payload)
+            if self.__flush:
+                self.__sync_sink(sink, self.__logFileStream, records, level)
+        elif sink.sinkType == 'user':
+            try:
+                sink.handler.write(payload)
                 if self.__flush:
-                    self.__flush_stream(self.__logFileStream)
-            elif sink.sinkType == 'user':
-                try:
-                    sink.handler.write("%s\n" % log)
-                    if self.__flush:
-                        self.__flush_stream(sink.handler)
-                except Exception as sinkError:
-                    # catch any error a user-supplied handler raises:
-                    # we must never let a custom sink crash the caller or
-                    # worker thread, but we do emit one warning line so the
-                    # caller knows their sink is broken (mirrors the queue-drop pattern)
+                    self.__sync_sink(sink, sink.handler, records, level)
+            except Exception as sinkError:
+                # catch any error a user-supplied handler raises:
+                # we must never let a custom sink crash the caller or
+                # worker thread, but we do emit one warning line so the
+                # caller knows their sink is broken (mirrors the queue-drop pattern)
+                if records == 1:
                     sys.stderr.write(
                         'pysimplelog WARNING: user sink write failed'
                         ', record dropped. Error: %s\n' % sinkError
                     )
-            else:  # stdout
-                self.__log_to_stdout(self.__format_stdout_line(logType, log))
-                if self.__flush:
-                    self.__flush_stream(sink.handler)
+                else:
+                    sys.stderr.write(
+                        'pysimplelog WARNING: user sink write failed'
+                        ', %d records dropped. Error: %s\n' % (records, sinkError)
+                    )
+        else:  # stdout
+            self.__log_to_stdout(payload)
+            if self.__flush:
+                self.__sync_sink(sink, sink.handler, records, level)
+
+    def __sync_sink(self, sink, stream, records, level):
+        """Apply the durability policy of a sink after a write.
+
+        :Parameters:
+            #. sink (_Sink): The sink that was just written.
+            #. stream (file-like): The stream backing the sink.
+            #. records (integer): Number of records in the write.
+            #. level (None, number): Highest record level in the write.
+        """
+        d = sink.durability or self.__durability
+        mode = d.mode
+        if mode == 'none':
+            return
+        if mode == 'fsync':
+            self.__flush_stream(stream)
+            return
+        try:
+            stream.flush()
+        except (OSError, AttributeError):
+            pass
+        sink.unsynced += records
+        if ((d.every is not None and sink.unsynced >= d.every) or
+            (d.level is not None and level is not None and level >= d.level) or
+            (d.interval is not None and time.time() - sink.lastSync >= d.interval)):
+            sink.unsynced = 0
+            sink.lastSync = time.time()
+            self.__fsync_stream(stream)
+
+    def __dispatch_batch(self, items):
+        """Group-commit dispatch of several queued records.
+
+        Payloads are concatenated per sink, preserving record order within
+        every sink, then each sink receives exactly one write and at most
+        one flush for the whole batch.
+
+        :Parameters:
+            #. items (list): Formatted _LogRecord objects as queued by
+               log() and force_log().
+        """
+        payloads   = {}
+        levels     = {}
+        order      = []
+        for record in items:
+            log, logType, level = record.text, record.logType, record.level
+            for sink in record.sinks:
+                sampler = sink.sampler
+                if sampler is not None and not sampler.keep(None):
+                    continue
+                bucket = sink.bucket
+                if bucket is not None and not bucket.take(logType):
+                    continue
+                ended     = None
+                collapser = sink.collapser
+                if collapser is not None:
+                    with collapser.lock:
+                        if collapser.repeats(record.key, record.timestamp):
+                            continue
+                        ended = collapser.restart(record.key, record.timestamp)
+                key = id(sink)
+                if key not in payloads:
+                    payloads[key] = (sink, [])
+                    levels[key]   = level
+                    order.append(key)
+                elif level is not None and (levels[key] is None or level > levels[key]):
+                    levels[key] = level
+                if bucket is not None and bucket.suppressed:
+                    payloads[key][1].append(self.__sink_summary(sink, logType))
+                if ended is not None:
+                    payloads[key][1].append(self.__repeat_summary(sink, *ended))
+                if sink.sinkType == 'stdout':
+                    payloads[key][1].append(self.__format_stdout_line(logType, log))
+                else:
+                    payloads[key][1].append("%s\n" % log)
+        for key in order:
+            sink, parts = payloads[key]
+            self.__write_sink(sink, ''.join(parts), records=len(parts), level=levels[key])
+
+    def __forced_sinks(self, toStdout, toFile):
+        """Return the tuple of built-in sinks targeted by a force_log() record."""
+        if toStdout:
+            if toFile:
+                return (self.__sinks[_SINK_STDOUT], self.__sinks[_SINK_FILE])
+            return (self.__sinks[_SINK_STDOUT],)
+        if toFile:
+            return (self.__sinks[_SINK_FILE],)
+        return ()
 
     def add_sink(self, name, handler, enabled=True,
-                 minLevel=None, maxLevel=None, logTypeFlags=None):
+                 minLevel=None, maxLevel=None, logTypeFlags=None,
+                 durability=None, workerGroup=None):
         """Add a user-supplied output sink to the logger.
 
         The sink receives every log record whose type passes the routing
@@ -2526,13 +6009,22 @@ class Logger(object):
             #. logTypeFlags (dict, None): Per-type override map
                {logType (str): bool}. Missing keys default to True.
                None means all types enabled.
+            #. durability (None, string): Per-sink durability mode, one of
+               ``'none'``, ``'flush'`` or ``'fsync'``. None (default) uses
+               the logger-wide durability. Use set_durability() with
+               ``sinks=[name]`` to add fsync triggers.
+            #. workerGroup (None, str): Only used when sinkWorkers is
+               True. Sinks given the same group name share one queue and
+               writer thread. None (default) gives the sink its own.
 
         :Raises:
             #. TypeError: If *name* is not a string, if *handler* has no ``write()``
                method, if *enabled* is not a boolean, if *minLevel* or *maxLevel* is
                not a number, or if *logTypeFlags* is not a dict with string keys and
-               boolean values.
-            #. ValueError: If *name* is empty or already registered as a sink.
+               boolean values, if *durability* is not a string or None, or if
+               *workerGroup* is not a string or None.
+            #. ValueError: If *name* is empty or already registered as a sink,
+               or if *durability* is not an accepted mode.
         """
         if not isinstance(name, basestring):
             raise TypeError("sink name must be a non-empty string")
@@ -2557,15 +6049,30 @@ class Logger(object):
                     raise TypeError("logTypeFlags keys must be strings")
                 if not isinstance(v, bool):
                     raise TypeError("logTypeFlags values must be booleans")
-        self.__sinks[name] = _Sink(
+        if durability is not None:
+            durability = self.__make_durability(durability, None, None, None)
+        if workerGroup is not None:
+            if not isinstance(workerGroup, basestring):
+                raise TypeError("workerGroup must be a string or None")
+            if not len(workerGroup):
+                raise ValueError("workerGroup must be non-empty")
+        sink = _Sink(
             handler      = handler,
             enabled      = enabled,
             logTypeFlags = dict(logTypeFlags) if logTypeFlags is not None else {},
             minLevel     = float(minLevel) if minLevel is not None else None,
             maxLevel     = float(maxLevel) if maxLevel is not None else None,
             sinkType     = 'user',
+            durability   = durability,
+            workerGroup  = workerGroup,
         )
-        self.__rebuild_active_sinks()
+        if self.__duplicateWindow is not None:
+            sink.collapser = _Collapser(self.__duplicateWindow)
+        with self.__sinkTableLock:
+            if self.__sinkWorkers:
+                self.__attach_lane(name, sink)
+            self.__sinks[name] = sink
+            self.__sinkTable = self.__build_sink_table(self.__sinkTable.generation + 1)
 
     def remove_sink(self, name):
         """Remove a user-added sink by its registered name.
@@ -2580,10 +6087,16 @@ class Logger(object):
         """
         if not isinstance(name, basestring):
             raise TypeError("sink name must be a string")
-        if name not in self.__sinks:
-            raise ValueError("sink '%s' is not registered" % name)
-        del self.__sinks[name]
-        self.__rebuild_active_sinks()
+        with self.__sinkTableLock:
+            if name not in self.__sinks:
+                raise ValueError("sink '%s' is not registered" % name)
+            sink = self.__sinks.pop(name)
+            self.__sinkTable = self.__build_sink_table(self.__sinkTable.generation + 1)
+            lane = self.__detach_lane(sink)
+        # retired only once the published table no longer routes to it
+        if lane is not None:
+            self.__retire_lane(lane)
+        self.__flush_collapser(sink)
 
     def clear_sinks(self):
         """Remove all user-added sinks.
@@ -2592,11 +6105,16 @@ class Logger(object):
         always preserved. This is a no-op if no user sinks are
         registered.
         """
-        userKeys = [k for k in self.__sinks if isinstance(k, basestring)]
-        for k in userKeys:
-            del self.__sinks[k]
-        if userKeys:
-            self.__rebuild_active_sinks()
+        with self.__sinkTableLock:
+            userKeys = [k for k in self.__sinks if isinstance(k, basestring)]
+            removed  = [self.__sinks.pop(k) for k in userKeys]
+            if userKeys:
+                self.__sinkTable = self.__build_sink_table(self.__sinkTable.generation + 1)
+            lanes = [lane for lane in map(self.__detach_lane, removed) if lane is not None]
+        for lane in lanes:
+            self.__retire_lane(lane)
+        for sink in removed:
+            self.__flush_collapser(sink)
 
     def force_log_type_stdout_flag(self, logType, flag):
         """
@@ -2686,6 +6204,7 @@ class Logger(object):
             raise TypeError("name must be a string")
         name = str(name)
         self.__logTypeNames[logType] = name
+        self.__rebuild_header_templates()
 
     def set_log_type_level(self, logType, level):
         """
@@ -2704,6 +6223,9 @@ class Logger(object):
         if not _is_number(level):
             raise TypeError("level must be a number")
         self.__logTypeLevels[logType] = float(level)
+        self.__rebuild_header_templates()
+        if self.__recorder is not None:
+            self.__rebuild_active_sinks()
 
     def remove_log_type(self, logType, _assert=False):
         """
@@ -2731,6 +6253,7 @@ class Logger(object):
         self.__logTypeFileFlags.pop(logType, None)
         self.__forcedStdoutLevels.pop(logType, None)
         self.__forcedFileLevels.pop(logType, None)
+        self.__rebuild_header_templates()
         if _SINK_STDOUT in self.__sinks:
             self.__rebuild_active_sinks()
 
@@ -2834,6 +6357,7 @@ class Logger(object):
         self.__logTypeAttributes[logType]  = attributes
         self.__logTypeNames[logType]       = name
         self.__logTypeLevels[logType]      = level
+        self.__rebuild_header_templates()
         self.__logTypeFormat[logType]      = wrapFancy
         self.__logTypeStdoutFlags[logType] = stdoutFlag
         if stdoutFlag is not None:
@@ -2895,13 +6419,15 @@ class Logger(object):
                             stdoutFlag=stdoutFlag, fileFlag=fileFlag,
                             color=color, highlight=highlight, attributes=attributes)
 
-    def _format_message(self, logType, message, data, tback, callerStr=''):
+    def _format_message(self, logType, message, data, tback, callerStr='', context=None):
         """Build the complete formatted log record string.
 
         Called by both log() and force_log() immediately before dispatch.
         Subclasses may override this method to change the overall record
         layout while keeping the built-in routing, level filtering, and
-        sink dispatch unchanged.
+        sink dispatch unchanged. With recordFormat ``'json'`` the record
+        is a single JSON object line and _get_header() and _get_footer()
+        are not used.
 
         :Parameters:
             #. logType (string): A registered log type name.
@@ -2913,6 +6439,8 @@ class Logger(object):
                tuples is formatted like a standard Python traceback.
             #. callerStr (string): Pre-formatted caller tag produced by
                _get_caller_str(), or an empty string when callerInfo is False.
+            #. context (None, dict): Context bound with bind(). Only passed
+               in json mode; text records carry it in the message prefix.
 
         :Returns:
             #. result (string): The fully formatted log record ready for
@@ -2921,8 +6449,14 @@ class Logger(object):
         message  = _sanitize_message(message)
         if self.__maxMessageSize is not None and len(message) > self.__maxMessageSize:
             message = message[:self.__maxMessageSize] + '[truncated]'
+        if self.__recordFormat == 'json':
+            return self.__format_json(logType, message, data, tback, callerStr, context)
         header   = self._get_header(logType, message)
-        footer = self._get_footer(logType, message)
+        footer   = self._get_footer(logType, message)
+        # common record: no caller tag, footer, data or traceback — a single
+        # concatenation instead of a six-slot format
+        if not callerStr and not footer and data is None and tback is None:
+            return header + message
         dataStr  = ''
         tbackStr = ''
         if data is not None:
@@ -2930,34 +6464,101 @@ class Logger(object):
             if self.__maxDataSize is not None and len(dataStr) > self.__maxDataSize:
                 dataStr = dataStr[:self.__maxDataSize] + '[truncated]'
         if tback is not None:
-            if isinstance(tback, str):
-                tbackStr = '\n%s'%(tback,)
-            else:
-                try:
-                    tbackStr = []
-                    for filename, lineno, name, line in tback:
-                        tbackStr.append( '\n  File "%s", line %d, in %s'%(filename,lineno,name) )
-                        if line:
-                            tbackStr.append( '\n    %s'%(line.strip(),) )
-                    tbackStr = ''.join(tbackStr)
-                except Exception:
-                    tbackStr = '\n%s'%(str(tback),)
-        return "%s%s%s%s%s%s" %(header, callerStr, message, footer, dataStr, tbackStr)
-
-    def _get_datetimestamp(self, format='%Y-%m-%d %H:%M:%S'):
+            tbackStr = self.__format_traceback(tback)
+        return ''.join((header, callerStr, message, footer, dataStr, tbackStr))
+
+    @staticmethod
+    def __format_traceback(tback):
+        """Return *tback* as text, each line preceded by a newline."""
+        if isinstance(tback, str):
+            return '\n%s'%(tback,)
+        try:
+            tbackStr = []
+            for filename, lineno, name, line in tback:
+                tbackStr.append( '\n  File "%s", line %d, in %s'%(filename,lineno,name) )
+                if line:
+                    tbackStr.append( '\n    %s'%(line.strip(),) )
+            return ''.join(tbackStr)
+        except Exception:
+            return '\n%s'%(str(tback),)
+
+    def __format_json(self, logType, message, data, tback, callerStr, context):
+        """Build a json record: one JSON object on a single line.
+
+        The members are timestamp, logger, logType, level and message,
+        followed by caller, context, data and traceback when present.
+        The static logger/logType/level members come from a per-logType
+        template, so a plain string record costs two string escapes and
+        one concatenation instead of a dict and a json.dumps() call.
+        Data that JSON cannot encode is written as its str().
+        """
+        record = ('{"timestamp":' + _json_string(self._get_datetimestamp()) +
+                  self.__jsonTemplates[logType] + _json_string(message))
+        if not callerStr and not context and data is None and tback is None:
+            return record + '}'
+        parts = [record]
+        if callerStr:
+            # '[file.py:12 in func] ' -> 'file.py:12 in func'
+            parts.append(',"caller":' + _json_string(callerStr[1:-2]))
+        if context:
+            parts.append(',"context":' + self.__json_value(context))
+        if data is not None:
+            dataStr = self.__json_value(data)
+            if self.__maxDataSize is not None and len(dataStr) > self.__maxDataSize:
+                dataStr = _json_string(dataStr[:self.__maxDataSize] + '[truncated]')
+            parts.append(',"data":' + dataStr)
+        if tback is not None:
+            parts.append(',"traceback":' + _json_string(self.__format_traceback(tback)[1:]))
+        parts.append('}')
+        return ''.join(parts)
+
+    @staticmethod
+    def __json_value(value):
+        """Encode *value* as JSON, falling back to a string of str(value)."""
+        if isinstance(value, basestring):
+            return _json_string(value)
+        try:
+            return _json_encode(value)
+        except (TypeError, ValueError):
+            return _json_string('%s' % (value,))
+
+    def _get_datetimestamp(self, format='%Y-%m-%d %H:%M:%S', timestamp=None):
         """Return the current date-time as a formatted string.
 
         Override this method in a subclass to change the timestamp format
         or source (e.g. to use UTC regardless of the instance timezone).
 
+        The second-resolution text is memoised: strftime runs only when
+        the integer second or the format changes, which at high record
+        rates means once per second rather than once per record. The
+        cache is a single tuple replaced as a whole, so the enqueue worker
+        and any number of caller threads can share it without a lock.
+        Fractional seconds requested with set_timestamp_precision() are
+        appended arithmetically. Formats containing ``%f`` bypass the cache.
+
         :Parameters:
             #. format (string): A strftime-compatible format string.
                Default is '%Y-%m-%d %H:%M:%S'.
+            #. timestamp (None, number): Epoch seconds to format. None
+               means now.
 
         :Returns:
             #. result (string): The formatted datetime stamp.
         """
-        return datetime.strftime(datetime.now(self.__timezone), format)
+        if timestamp is None:
+            # a writer thread formatting a deferred record sets its time
+            timestamp = _RECORD_TIME.value or time.time()
+        if '%f' in format:
+            return datetime.strftime(datetime.fromtimestamp(timestamp, self.__timezone), format)
+        second = int(timestamp)
+        cachedSecond, cachedFormat, text = self.__timestampCache
+        if second != cachedSecond or format != cachedFormat:
+            text = datetime.strftime(datetime.fromtimestamp(second, self.__timezone), format)
+            self.__timestampCache = (second, format, text)
+        if self.__timestampPrecision:
+            scale = self.__timestampScale
+            text += self.__timestampFraction % min(int((timestamp - second) * scale), scale - 1)
+        return text
 
     def _get_header(self, logType, message):
         """Return the header string prepended to each log record.
@@ -2973,8 +6574,7 @@ class Logger(object):
         :Returns:
             #. result (string): The header string including a trailing space.
         """
-        dateTime = self._get_datetimestamp()
-        return "%s - %s <%s> "%(dateTime, self.__name, self.__logTypeNames[logType])
+        return self._get_datetimestamp() + self.__headerTemplates[logType]
 
     def _get_footer(self, logType, message):
         """Return the footer string appended to each log record.
@@ -2991,42 +6591,96 @@ class Logger(object):
         """
         return ""
 
-    def __enqueue_worker(self):
+    def __enqueue_worker(self, logQueue):
         """Background thread: drain the log queue and perform all I/O.
 
-        Items are one of two formats:
-          - 3-tuple (log, logType, sinks) from normal log() calls;
-            sinks is a snapshot list of _Sink objects from __activeSinks.
-          - 4-tuple (log, logType, toStdout, toFile) from force_log();
-            toStdout/toFile are caller-supplied booleans that bypass routing.
+        Runs once on the shared queue, or once per sink lane when
+        sinkWorkers is True; *logQueue* is the queue this thread drains.
+
+        Items are _LogRecord objects carrying their routed sinks: the
+        cached active-sink tuple from log(), or the built-in sinks named
+        by force_log(). A record with no text yet was deferred and is
+        formatted here first, see __new_record().
         The sentinel _QUEUE_STOP signals clean shutdown.
         task_done() is called after every item so flush() can join().
+        When groupCommit is True items are collected into batches and
+        handed to __dispatch_batch() instead.
         """
         while True:
-            item = self.__logQueue.get()
+            item = logQueue.get()
+            if self.__roomWaiters:
+                self.__wake_room_waiters()
+            if self.__groupCommit and item is not _QUEUE_STOP:
+                if not self.__enqueue_batch(item, logQueue):
+                    return
+                continue
             try:
                 if item is _QUEUE_STOP:
                     return
-                if len(item) == 3:
-                    # normal log() path — 3-tuple (log, logType, sinks)
-                    log, logType, sinks = item
-                    self.__dispatch_sinks_sync(sinks, log, logType)
-                else:
-                    # force_log() path — 4-tuple (log, logType, toStdout, toFile)
-                    # bypasses routing; toStdout/toFile are caller-supplied booleans
-                    log, logType, toStdout, toFile = item
-                    if toStdout:
-                        self.__log_to_stdout(self.__format_stdout_line(logType, log))
-                        if self.__flush:
-                            self.__flush_stream(self.__stdout)
-                    if toFile:
-                        self.__log_to_file("%s\n" % log)
-                        if self.__flush:
-                            self.__flush_stream(self.__logFileStream)
+                if item.text is None:
+                    self.__format_deferred(item)
+                self.__dispatch_sinks_sync(item.sinks, item.text, item.logType,
+                                           item.key, item.timestamp)
             finally:
-                self.__logQueue.task_done()
+                logQueue.task_done()
+
+    def __enqueue_batch(self, item, logQueue):
+        """Collect a group-commit batch starting with *item* and dispatch it.
+
+        Keeps pulling records until the queue is empty (or batchLatency
+        expires), batchMaxRecords records were collected, or
+        batchMaxBytes characters were reached.
+
+        :Parameters:
+            #. item (_LogRecord): The first queue item of the batch.
+            #. logQueue (queue.Queue): The queue the batch is drained from.
 
-    def __put_to_queue(self, item):
+        :Returns:
+            #. result (boolean): False if the stop sentinel was met while
+               collecting, meaning the worker must exit after this batch.
+        """
+        maxRecords = self.__batchMaxRecords
+        maxBytes   = self.__batchMaxBytes
+        latency    = self.__batchLatency
+        deadline   = None if latency is None else time.time() + latency
+        if item.text is None:
+            self.__format_deferred(item)
+        batch      = [item]
+        nbytes     = len(item.text)
+        running    = True
+        while len(batch) < maxRecords and nbytes < maxBytes:
+            try:
+                if deadline is None:
+                    item = logQueue.get_nowait()
+                else:
+                    item = logQueue.get(timeout=max(0, deadline - time.time()))
+            except _queue_module.Empty:
+                break
+            if item is _QUEUE_STOP:
+                running = False
+                break
+            if item.text is None:
+                self.__format_deferred(item)
+            batch.append(item)
+            nbytes += len(item.text)
+        if self.__roomWaiters:
+            self.__wake_room_waiters()
+        try:
+            self.__dispatch_batch(batch)
+            # several lane workers may finish a batch at the same time
+            with self.__droppedLock:
+                batches, records, maxSize, _ = self.__batchStatistics
+                self.__batchStatistics = (batches+1, records+len(batch),
+                                          max(maxSize, len(batch)), len(batch))
+        finally:
+            for _ in batch:
+                logQueue.task_done()
+            if not running:
+                # account for the stop sentinel itself
+                logQueue.task_done()
+        return running
+
+    def __put_to_queue(self, item, lane=None):
         """Put one log record onto the queue, honouring the backpressure policy.
 
         Called by log() and force_log() whenever enqueue mode is active.
@@ -3043,7 +6697,9 @@ class Logger(object):
         is None the park has no deadline -- the thread waits until the
         worker drains a slot, however long that takes. If queueBlockTimeout
         is set and expires, the record is dropped, droppedMessages is
-        incremented, and one warning is emitted to stderr.
+        incremented, and one warning is emitted to stderr. Within an
+        awaitable AsyncLogger call the record is left in the call's
+        backlog instead, see _drain_backlog().
 
         ``drop``   -- discard the record silently and increment
         droppedMessages. Zero latency impact on the caller.
@@ -3055,54 +6711,144 @@ class Logger(object):
         the caller. The caller is responsible for handling it.
 
         :Parameters:
-            #. item (tuple): The log record tuple — either a 3-tuple
-               (log, logType, sinks) from log() or a 4-tuple
-               (log, logType, toStdout, toFile) from force_log().
+            #. item (_LogRecord): The record built by log() or force_log().
+            #. lane (None, _SinkLane): The sink lane to queue the record
+               on when sinkWorkers is True. None uses the shared queue.
         """
-        # unbounded queue — fast path, no policy needed
-        if self.__maxQueueSize is None:
-            self.__logQueue.put(item)
-            return
-        policy = self.__queueFullPolicy
-        if policy == 'block':
-            timeout = self.__queueBlockTimeout
-            if timeout is None:
-                # park indefinitely — true backpressure, never drops
-                self.__logQueue.put(item)
-            else:
-                # bounded park — drop + warn if deadline expires
+        logQueue = self.__logQueue if lane is None else lane.queue
+        try:
+            # unbounded queue — fast path, no policy needed
+            if self.__maxQueueSize is None:
+                logQueue.put(item)
+                return
+            policy = self.__queueFullPolicy
+            if policy == 'block':
+                timeout = self.__queueBlockTimeout
+                backlog = _ASYNC_BACKLOG.records
+                if backlog is not None:
+                    # an awaitable call must not park the event loop: the
+                    # record waits in the backlog, behind any already there
+                    if not backlog:
+                        try:
+                            logQueue.put_nowait(item)
+                            return
+                        except _queue_module.Full:
+                            pass
+                    deadline = None if timeout is None else time.time() + timeout
+                    backlog.append((logQueue, item, lane, deadline))
+                elif timeout is None:
+                    # park indefinitely — true backpressure, never drops
+                    logQueue.put(item)
+                else:
+                    # bounded park — drop + warn if deadline expires
+                    try:
+                        logQueue.put(item, timeout=timeout)
+                    except _queue_module.Full:
+                        dropped = self.__count_dropped(lane)
+                        sys.stderr.write(
+                            'pysimplelog WARNING: %s still full after %.1fs, '
+                            'record dropped (%d total dropped)\n'
+                            % (self.__queue_label(lane), timeout, dropped)
+                        )
+            elif policy == 'drop':
+                try:
+                    logQueue.put_nowait(item)
+                except _queue_module.Full:
+                    self.__count_dropped(lane)
+            elif policy == 'warn':
                 try:
-                    self.__logQueue.put(item, timeout=timeout)
+                    logQueue.put_nowait(item)
                 except _queue_module.Full:
-                    with self.__droppedLock:
-                        self.__droppedMessages += 1
-                        dropped = self.__droppedMessages
+                    dropped = self.__count_dropped(lane)
                     sys.stderr.write(
-                        'pysimplelog WARNING: queue still full after %.1fs, '
-                        'record dropped (%d total dropped)\n'
-                        % (timeout, dropped)
+                        'pysimplelog WARNING: %s full, record dropped '
+                        '(%d total dropped)\n' % (self.__queue_label(lane), dropped)
                     )
-        elif policy == 'drop':
-            try:
-                self.__logQueue.put_nowait(item)
-            except _queue_module.Full:
-                with self.__droppedLock:
-                    self.__droppedMessages += 1
-        elif policy == 'warn':
+            elif policy == 'raise':
+                # put_nowait raises queue.Full immediately if full —
+                # caller is responsible for catching it
+                logQueue.put_nowait(item)
+        finally:
+            # a log() call that read the table before remove_sink() may
+            # have queued behind the stop sentinel of a retired lane
+            if lane is not None and lane.retired:
+                self.__drain_retired_lane(lane)
+
+    def __count_dropped(self, lane):
+        """Count one dropped record, globally and on *lane*, and return the total."""
+        with self.__droppedLock:
+            self.__droppedMessages += 1
+            if lane is not None:
+                lane.dropped += 1
+            return self.__droppedMessages
+
+    @staticmethod
+    def __queue_label(lane):
+        """Return the queue name used in queue-full warnings."""
+        return 'queue' if lane is None else "queue of worker '%s'" % lane.name
+
+    def _add_room_waiter(self, wake):
+        """Have a writer thread call *wake* once it takes a record off a queue.
+
+        *wake* is called at most once, on the writer thread, and must not
+        block or raise. Used by AsyncLogger to await room for its backlog.
+        """
+        with self.__roomLock:
+            self.__roomWaiters.append(wake)
+
+    def _remove_room_waiter(self, wake):
+        """Forget *wake* if no writer thread has called it yet."""
+        with self.__roomLock:
+            if wake in self.__roomWaiters:
+                self.__roomWaiters.remove(wake)
+
+    def __wake_room_waiters(self):
+        """Call and forget every room waiter, see _add_room_waiter()."""
+        with self.__roomLock:
+            waiters, self.__roomWaiters = self.__roomWaiters, []
+        for wake in waiters:
+            wake()
+
+    def _drain_backlog(self, backlog, block=False):
+        """Move the records of an AsyncLogger backlog into their queues.
+
+        Records keep their order; one whose queueBlockTimeout expired is
+        dropped and counted like a blocking put() that timed out.
+
+        :Parameters:
+            #. backlog (collections.deque): (queue, record, lane, deadline)
+               entries left by __put_to_queue().
+            #. block (boolean): Wait for room in the queues, up to the
+               deadline of every record, instead of returning.
+
+        :Returns:
+            #. result (boolean): True if records are still waiting because
+               a queue is full.
+        """
+        while backlog:
+            logQueue, item, lane, deadline = backlog[0]
             try:
-                self.__logQueue.put_nowait(item)
+                if not block:
+                    logQueue.put_nowait(item)
+                elif deadline is None:
+                    logQueue.put(item)
+                else:
+                    logQueue.put(item, timeout=max(0, deadline - time.time()))
             except _queue_module.Full:
-                with self.__droppedLock:
-                    self.__droppedMessages += 1
-                    dropped = self.__droppedMessages
+                if deadline is None or time.time() < deadline:
+                    return True
+                backlog.popleft()
+                dropped = self.__count_dropped(lane)
                 sys.stderr.write(
-                    'pysimplelog WARNING: queue full, record dropped '
-                    '(%d total dropped)\n' % dropped
+                    'pysimplelog WARNING: %s still full after %.1fs, '
+                    'record dropped (%d total dropped)\n'
+                    % (self.__queue_label(lane), self.__queueBlockTimeout or 0, dropped)
                 )
-        elif policy == 'raise':
-            # put_nowait raises queue.Full immediately if full —
-            # caller is responsible for catching it
-            self.__logQueue.put_nowait(item)
+                continue
+            backlog.popleft()
+            if lane is not None and lane.retired:
+                self.__drain_retired_lane(lane)
+        return False
 
     def __log_to_file(self, message):
         # __rotationLock is always acquired on every call to this method, so
@@ -3110,13 +6856,60 @@ class Logger(object):
         # It eliminates the race where another thread could close the stream
         # between the stream-capture and the write on a shared Logger instance.
         with self.__rotationLock:
+            if self.__multiprocess:
+                self.__log_to_shared_file(message)
+                return
             if self.__logFileStream is None:
-                self.__logFileStream = open(self.__logFileName, 'a')
-            elif self.__logFileMaxSize is not None:
-                if self.__logFileStream.tell()/(1024.**2) >= self.__logFileMaxSize:
-                    self.__set_log_file_name()   # re-entrant: RLock allows this
-                    self.__logFileStream = open(self.__logFileName, 'a')
+                self.__logFileStream = self.__open_log_file()
+            # checked right after opening too: a file left over from an
+            # earlier rollover period must not receive the record
+            if self.__logFileMaxBytes is not None and self.__logFileBytes >= self.__logFileMaxBytes:
+                self.__set_log_file_name()   # re-entrant: RLock allows this
+                self.__logFileStream = self.__open_log_file()
+            elif self.__nextRollover is not None and self.__rotationClock() >= self.__nextRollover:
+                self.__set_log_file_name(rolloverAt=self.__nextRollover)
+                self.__logFileStream = self.__open_log_file()
+            if self.__fileMode == 'mmap':
+                data = message.encode('utf-8')
+                # the map's own write() in C; the segment's Python write()
+                # is only needed when the record does not fit and the
+                # segment must grow
+                try:
+                    self.__logFileStream.map.write(data)
+                except ValueError:
+                    self.__logFileStream.write(data)
+                self.__logFileBytes += len(data)
+                return
             self.__logFileStream.write(message)
+            # count bytes rather than calling tell(), which rebuilds the
+            # text decoder state on every call
+            if _HAS_ISASCII and message.isascii():
+                self.__logFileBytes += len(message)
+            else:
+                self.__logFileBytes += len(message.encode('utf-8'))
+
+    def __log_to_shared_file(self, message):
+        """Multiprocess variant of __log_to_file, called with __rotationLock held.
+
+        Other processes append to the same file, so the size comes from
+        fstat() rather than tell(), and a file another process has already
+        rolled away (st_nlink == 0) or filled up triggers a rescan under
+        the inter-process lock. The first write of every process, forked
+        children included, rescans too since the file may have rotated
+        since this process last looked.
+        """
+        stream = self.__logFileStream
+        if stream is None or self.__logFilePid != os.getpid():
+            self.__set_log_file_name(openStream=True)
+            stream = self.__logFileStream
+        if self.__nextRollover is not None and self.__rotationClock() >= self.__nextRollover:
+            self.__set_log_file_name(openStream=True, rolloverAt=self.__nextRollover)
+        elif self.__logFileMaxBytes is not None or self.__logFileRoll is not None:
+            stat = os.fstat(stream.fileno())
+            if stat.st_nlink == 0 or (self.__logFileMaxBytes is not None and
+                                      stat.st_size >= self.__logFileMaxBytes):
+                self.__set_log_file_name(openStream=True)
+        self.__logFileStream.write(message.encode('utf-8'))
 
     def __log_to_stdout(self, message):
         """Write a pre-formatted message to the current stdout stream."""
@@ -3146,6 +6939,14 @@ class Logger(object):
             stream.flush()
         except (OSError, AttributeError):
             pass
+        self.__fsync_stream(stream)
+
+    def __fsync_stream(self, stream):
+        """Fsync a stream's file descriptor, silently ignoring errors.
+
+        :Parameters:
+            #. stream (file-like): The stream to fsync.
+        """
         try:
             # fileno() may raise AttributeError (missing method) or
             # io.UnsupportedOperation (in-memory streams) — both are benign
@@ -3217,10 +7018,10 @@ class Logger(object):
         """
         # use the pre-computed active-sink cache: covers stdout, file,
         # AND any user-added sinks — a non-empty list means dispatch happens
-        return bool(self.__activeSinks.get(logType))
+        return bool(self.__sinkTable.active.get(logType))
 
 
-    def log(self, logType, message, data=None, tback=None, countConstraint=None):
+    def log(self, logType, message, data=None, tback=None, countConstraint=None, args=None):
         """
         Log a message of the specified log type.
 
@@ -3233,50 +7034,351 @@ class Logger(object):
               after log message
            #. tback (None, str, list): Stack traceback to print and/or write to
               log file. In general, this should be traceback.extract_stack
+           #. args (None, tuple, dict, object): %-style arguments merged into
+              *message* only when the record is written, like the standard
+              logging module. With deferFormatting the merge happens on the
+              enqueue writer thread.
 
         :Returns:
-            #. message (string): the logged message
+            #. message (string): the logged message, as given
 
         :Raises:
+            #. ValueError: If *logType* is not a defined log type.
             #. TypeError: If *message* is callable. Use ``is_enabled(logType)`` to
                guard expensive message construction instead of passing a callable.
         """
+        # fast path: read the pre-computed active-sink cache before doing
+        # any work. A log type that no sink receives costs one dict lookup
+        # unless filtered records must still be recorded in lastLogged.
+        # A callable falls through so _log() raises for it like when enabled
+        table       = self.__sinkTable
+        activeSinks = table.active.get(logType)
+        if (not activeSinks and activeSinks is not None and not self.__lastLoggedFiltered
+                and logType not in table.recorded and not callable(message)):
+            return message
+        return self._log(logType, message, data, tback, countConstraint, None, args)
+
+    def _log(self, logType, message, data=None, tback=None, countConstraint=None, context=None, args=None,
+             bound=None):
+        """Implementation of log(), also used by bound loggers.
+
+        :Parameters:
+            #. context (None, dict): Bound context, written as the
+               ``context`` member of json records.
+            #. bound (None, dict): Context of the calling bound logger in
+               either record format, read by contextKey sampling.
+        """
+        # one read of the routing snapshot serves the whole call
+        table       = self.__sinkTable
+        activeSinks = table.active.get(logType)
+        if activeSinks is None:
+            raise ValueError("logType '%s' not defined" % logType)
         # reject callables -- the logger is a passive recorder, not an executor.
         # to defer expensive message construction use is_enabled(logType) instead:
         #   if logger.is_enabled('debug'): logger.debug(expensive_fn())
+        # Checked before filtering so it raises whether logType is enabled or not
         if callable(message):
             raise TypeError(
                 "log() message must be a string or string-coercible value, "
                 "not a callable. To defer expensive message construction "
                 "guard the call with is_enabled('%s') instead." % logType
             )
-        if countConstraint is not None:
-            self.__logMessagesCounter.setdefault(message, -1)
-            self.__logMessagesCounter[message] += 1
-            if countConstraint<=self.__logMessagesCounter[message]:
+        if (not activeSinks and not self.__lastLoggedFiltered
+                and logType not in table.recorded):
+            return message
+        if self.__samplers:
+            sampler = self.__samplers.get(logType)
+            if sampler is not None and not sampler.keep(bound):
                 return message
-        # format on caller thread so timestamp is captured at call time
-        # capture caller frame BEFORE any internal calls so the stack depth
-        # is minimal and the user frame is as close to the top as possible
-        callerStr = _get_caller_str() if self.__callerInfo else ''
-        log = self._format_message(logType=logType, message=message, data=data, tback=tback, callerStr=callerStr)
-        # routing: read from the pre-computed active-sink cache (O(1) lookup)
-        # the list contains only sinks whose enabled flag and logTypeFlags
-        # both pass for this logType — no per-call boolean arithmetic needed
-        activeSinks = self.__activeSinks.get(logType, [])
-        if self.__enqueue:
-            # snapshot so the worker sees a stable list even if config
-            # changes between put() and the item being processed
-            self.__put_to_queue((log, logType, list(activeSinks)))
+        if countConstraint is not None and not self.__countTracker.allow(message, countConstraint):
+            return message
+        if self.__rateLimits:
+            limiter = self.__rateLimits.get(logType)
+            if limiter is not None and not self.__admit(limiter, logType, table):
+                return message
+        recorder = self.__recorder
+        if recorder is not None:
+            if logType in table.recorded:
+                recorder.append(self.__recorded_record(logType, message, data, tback, args, context),
+                                bound)
+                if not activeSinks and not self.__lastLoggedFiltered:
+                    return message
+            elif logType in table.triggers:
+                self.__dump_recorder(recorder, logType, bound, table)
+        if activeSinks and self.__enqueue:
+            # a record stamped now, formatted now or by the writer thread
+            record = self.__new_record(logType, message, data, tback, args, context,
+                                       activeSinks, table.generation)
+            if self.__sinkWorkers:
+                # one record per lane; the table is replaced, never mutated,
+                # by __rebuild_active_sinks so its tuples are shared as is
+                for lane, sinks in table.lanes[logType]:
+                    self.__put_to_queue(record.routed(sinks), lane)
+            else:
+                self.__put_to_queue(record)
+            log = record.text
         else:
-            self.__dispatch_sinks_sync(activeSinks, log, logType)
-        # set last logged message (on caller thread for immediate visibility)
-        self.__lastLogged[logType] = log
-        self.__lastLogged[-1]      = log
+            # format on caller thread so timestamp is captured at call time
+            log = self.__format_now(logType, message, data, tback, args, context)
+            # routing: the cached tuple contains only sinks whose enabled flag
+            # and logTypeFlags both pass for this logType — no per-call boolean
+            # arithmetic needed. It is empty only when lastLoggedFiltered is True
+            if activeSinks:
+                if self.__collapsing:
+                    key = _duplicate_key(logType, message, data, tback, args, context)
+                    self.__dispatch_sinks_sync(activeSinks, log, logType, key)
+                else:
+                    self.__dispatch_sinks_sync(activeSinks, log, logType)
+        # set last logged message (on caller thread for immediate visibility).
+        # A deferred record reaches lastLogged once the writer formatted it
+        if log is not None:
+            self.__lastLogged[logType] = log
+            self.__lastLogged[-1]      = log
         # always return logged message
         return message
 
-    def force_log(self, logType, message, data=None, tback=None, stdout=True, file=True):
+    def __admit(self, limiter, logType, table):
+        """Take a token of a logType rate limit, writing any pending summary.
+
+        Call-site buckets are keyed by the _get_caller_site() tuple, so a
+        dropped record costs one frame walk and no string formatting; the
+        caller tag is only built for the summary.
+
+        :Returns:
+            #. result (boolean): False if the record must be dropped.
+        """
+        if limiter.bucket is None:
+            site   = _get_caller_site(self.__callerOffset)
+            bucket = limiter.site_bucket(site)
+        else:
+            site, bucket = None, limiter.bucket
+        if not bucket.take():
+            # the first drop since the last summary arms the summary timer
+            if bucket.suppressed == 1 and limiter.limit.summaryInterval is not None:
+                self.__arm_summary_timer(limiter.limit.summaryInterval)
+            return False
+        if bucket.suppressed:
+            self.__write_summary(table, logType, self.__rate_summary(site, bucket))
+        return True
+
+    @staticmethod
+    def __rate_summary(site, bucket):
+        """Return the summary of the drops of a logType bucket and reset its count."""
+        suppressed, bucket.suppressed = bucket.suppressed, 0
+        if site is not None:
+            return ('%d similar messages from %s suppressed by the rate limit'
+                    % (suppressed, _caller_tag(site).strip()[1:-1]))
+        return '%d similar messages suppressed by the rate limit' % suppressed
+
+    def __arm_summary_timer(self, interval):
+        """Start the timer writing pending rate limit summaries unless one is running."""
+        with self.__summaryLock:
+            if self.__summaryTimer is not None:
+                return
+            timer = self.__summaryTimer = threading.Timer(interval, self.__summary_due)
+            timer.daemon = True
+        timer.start()
+
+    def __summary_due(self):
+        """Timer callback: write the pending logType rate limit summaries."""
+        with self.__summaryLock:
+            self.__summaryTimer = None
+        self.__write_rate_summaries()
+
+    def __write_rate_summaries(self):
+        """Write the summary of every logType bucket with unannounced drops.
+
+        Called by the summary timer, flush() and at exit, so a burst that
+        stops is announced without waiting for the next admitted record.
+        """
+        table = self.__sinkTable
+        for logType, limiter in list(self.__rateLimits.items()):
+            for site, bucket in limiter.pending():
+                self.__write_summary(table, logType, self.__rate_summary(site, bucket))
+
+    def __write_sink_summaries(self):
+        """Write the summary of every sink bucket with unannounced drops.
+
+        Called by flush() and at exit once the writer threads are idle,
+        like __flush_collapser().
+        """
+        for sink in list(self.__sinks.values()):
+            bucket = sink.bucket
+            # a disabled sink must not be written to, see __flush_collapser()
+            if bucket is None or not bucket.suppressed or not sink.enabled:
+                continue
+            logType = bucket.logType
+            self.__write_sink(sink, self.__sink_summary(sink, logType),
+                              level=self.__logTypeLevels.get(logType))
+
+    def __write_summary(self, table, logType, message):
+        """Write a logType rate limit summary straight to the active sinks.
+
+        The summary bypasses sampling, countConstraint and the rate limit
+        itself so that it cannot be dropped like the records it counts.
+        """
+        activeSinks = table.active.get(logType)
+        if not activeSinks:
+            return
+        log = self._format_message(logType, message, None, None)
+        if self.__enqueue:
+            record = _LogRecord(time.time(), self.__logTypeLevels.get(logType), logType,
+                                None, None, None, None, '', None, activeSinks, table.generation)
+            record.text = log
+            if self.__sinkWorkers:
+                for lane, sinks in table.lanes[logType]:
+                    self.__put_to_queue(record.routed(sinks), lane)
+            else:
+                self.__put_to_queue(record)
+        else:
+            self.__dispatch_sinks_sync(activeSinks, log, logType)
+
+    def __sink_summary(self, sink, logType):
+        """Return the payload announcing records a sink rate limit dropped."""
+        suppressed, sink.bucket.suppressed = sink.bucket.suppressed, 0
+        return self.__summary_payload(sink, logType, '%d similar messages suppressed by '
+                                                     'the sink rate limit' % suppressed)
+
+    def __repeat_summary(self, sink, logType, repeated):
+        """Return the payload announcing records a sink collapsed."""
+        if repeated == 1:
+            return self.__summary_payload(sink, logType, 'last message repeated 1 time')
+        return self.__summary_payload(sink, logType, 'last message repeated %d times' % repeated)
+
+    def __summary_payload(self, sink, logType, message):
+        """Return *message* formatted as a *logType* record for *sink*."""
+        log = self._format_message(logType, message, None, None)
+        if sink.sinkType == 'stdout':
+            return self.__format_stdout_line(logType, log)
+        return "%s\n" % log
+
+    def __flush_collapser(self, sink):
+        """Write the pending repeat count of *sink* and end its run."""
+        collapser = sink.collapser
+        if collapser is None:
+            return
+        with collapser.lock:
+            ended = collapser.restart(None, 0.0)
+            # a disabled sink, e.g. the file sink after
+            # set_log_to_file_flag(False), must not be written to
+            if ended is not None and sink.enabled:
+                self.__write_sink(sink, self.__repeat_summary(sink, *ended),
+                                  level=self.__logTypeLevels.get(ended[0]))
+
+    def __format_now(self, logType, message, data, tback, args, context):
+        """Format a record that is dispatched on the caller thread."""
+        # capture caller frame BEFORE any internal calls so the stack depth
+        # is minimal and the user frame is as close to the top as possible
+        callerStr = _get_caller_str(self.__callerOffset) if self.__callerInfo else ''
+        return self.__format_text(logType, message, data, tback, args, callerStr, context)
+
+    def __format_text(self, logType, message, data, tback, args, callerStr, context):
+        """Merge *args* into *message* and return the formatted record text."""
+        if args is not None:
+            message = _format_args(message, args)
+        if context:
+            return self._format_message(logType, message, data, tback, callerStr, context=context)
+        return self._format_message(logType=logType, message=message, data=data, tback=tback, callerStr=callerStr)
+
+    def __new_record(self, logType, message, data, tback, args, context, sinks, generation):
+        """Build the _LogRecord queued for the enqueue writer.
+
+        The record is formatted at once unless deferFormatting is on and
+        its args and data can be kept by reference or copied cheaply, see
+        _snapshot(); any other record is formatted here so a later
+        mutation of its arguments cannot change what is logged.
+
+        :Parameters:
+            #. sinks (tuple): The sinks the record is routed to.
+            #. generation (integer): The _SinkTable generation *sinks*
+               were read from.
+        """
+        callerStr = _get_caller_str(self.__callerOffset) if self.__callerInfo else ''
+        record = _LogRecord(time.time(), self.__logTypeLevels.get(logType), logType,
+                            message, args, data, tback, callerStr, context,
+                            sinks, generation)
+        if self.__deferFormatting:
+            # the usual deferred call -- a str message without payload whose
+            # arguments, if any, are a flat tuple of immutable values -- is
+            # settled by one type-set test; __snapshot_record() takes the rest
+            if message.__class__ is str and data is None and tback is None and (
+                    args is None or (args.__class__ is tuple and
+                                     _IMMUTABLE_TYPES.issuperset(map(type, args)))):
+                return record
+            if self.__snapshot_record(record):
+                return record
+        record.text = self.__format_text(logType, message, data, tback, args, callerStr, context)
+        if self.__collapsing:
+            record.key = _duplicate_key(logType, message, data, tback, args, context)
+        return record
+
+    @staticmethod
+    def __snapshot_record(record):
+        """Snapshot the args and data of *record*, returning False if it must be formatted now."""
+        message, tback = record.message, record.tback
+        if message.__class__ is not str or not (tback is None or tback.__class__ is str):
+            return False
+        args, data  = record.args, record.data
+        record.args = args if args is None else _snapshot(args)
+        record.data = data if data is None else _snapshot(data)
+        if record.args is not _UNSAFE and record.data is not _UNSAFE:
+            return True
+        record.args, record.data = args, data
+        return False
+
+    def __recorded_record(self, logType, message, data, tback, args, context):
+        """Build the _LogRecord kept by the flight recorder, unformatted when safe."""
+        callerStr = _get_caller_str(self.__callerOffset) if self.__callerInfo else ''
+        record = _LogRecord(time.time(), self.__logTypeLevels.get(logType), logType,
+                            message, args, data, tback, callerStr, context, (), 0)
+        if not self.__snapshot_record(record):
+            record.text = self.__format_text(logType, message, data, tback, args, callerStr, context)
+        return record
+
+    def __dump_recorder(self, recorder, logType, context, table):
+        """Write the ring of *context* to the file sink ahead of a *logType* record."""
+        fileSink = self.__sinks[_SINK_FILE]
+        if not fileSink.enabled:
+            return
+        records = recorder.drain(context)
+        if not records:
+            return
+        texts = [self._format_message(logType, 'flight recorder: %d earlier records follow'
+                                               % len(records), None, None)]
+        for record in records:
+            texts.append(record.text if record.text is not None else self.__format_record(record))
+        log = '\n'.join(texts)
+        if self.__enqueue:
+            # queued ahead of the trigger record so the file keeps the order
+            record = _LogRecord(time.time(), self.__logTypeLevels.get(logType), logType,
+                                None, None, None, None, '', None, (fileSink,), table.generation)
+            record.text = log
+            self.__put_to_queue(record, fileSink.lane)
+        else:
+            self.__dispatch_sinks_sync((fileSink,), log, logType)
+
+    def __format_deferred(self, record):
+        """Format a deferred record on the writer thread and record it in lastLogged."""
+        record.text = self.__format_record(record)
+        if self.__collapsing:
+            record.key = _duplicate_key(record.logType, record.message, record.data,
+                                        record.tback, record.args, record.context)
+        self.__lastLogged[record.logType] = record.text
+        self.__lastLogged[-1]             = record.text
+
+    def __format_record(self, record):
+        """Return the text of an unformatted record, stamped with its call time."""
+        _RECORD_TIME.value = record.timestamp
+        try:
+            return self.__format_text(record.logType, record.message, record.data,
+                                      record.tback, record.args, record.caller, record.context)
+        except Exception as error:
+            # the caller is gone -- an error here must not stop the writer
+            return 'pysimplelog: %s record could not be formatted: %r' % (record.logType, error)
+        finally:
+            _RECORD_TIME.value = None
+
+    def force_log(self, logType, message, data=None, tback=None, stdout=True, file=True, args=None):
         """
         Force logging a message of a certain logtype whether logtype level is allowed or not.
 
@@ -3289,14 +7391,25 @@ class Logger(object):
               log file. In general, this should be traceback.extract_stack.
            #. stdout (boolean): Whether to force logging to standard output.
            #. file (boolean): Whether to force logging to file.
+           #. args (None, tuple, dict, object): %-style arguments merged into
+              *message*, see log().
 
         :Returns:
-            #. message (string): the logged message
+            #. message (string): the logged message, as given
 
         :Raises:
             #. TypeError: If *message* is callable. Use ``is_enabled(logType)`` to
                guard expensive message construction instead of passing a callable.
         """
+        return self._force_log(logType, message, data, tback, stdout, file, None, args)
+
+    def _force_log(self, logType, message, data=None, tback=None, stdout=True, file=True, context=None, args=None):
+        """Implementation of force_log(), also used by bound loggers in json mode.
+
+        :Parameters:
+            #. context (None, dict): Bound context, written as the
+               ``context`` member of json records.
+        """
         # reject callables — same policy as log()
         if callable(message):
             raise TypeError(
@@ -3304,23 +7417,27 @@ class Logger(object):
                 "not a callable. To defer expensive message construction "
                 "guard the call with is_enabled('%s') instead." % logType
             )
-        # format on caller thread so timestamp is captured at call time
-        callerStr = _get_caller_str() if self.__callerInfo else ''
-        log = self._format_message(logType=logType, message=message, data=data, tback=tback, callerStr=callerStr)
         if self.__enqueue:
-            self.__put_to_queue((log, logType, stdout, file))
+            # an explicit sink tuple bypasses routing
+            record = self.__new_record(logType, message, data, tback, args, context,
+                                       self.__forced_sinks(stdout, file),
+                                       self.__sinkTable.generation)
+            if self.__sinkWorkers:
+                for sink in record.sinks:
+                    self.__put_to_queue(record.routed((sink,)), sink.lane)
+            else:
+                self.__put_to_queue(record)
+            log = record.text
         else:
-            if stdout:
-                self.__log_to_stdout(self.__format_stdout_line(logType, log))
-                if self.__flush:
-                    self.__flush_stream(self.__stdout)
-            if file:
-                self.__log_to_file("%s\n" % log)
-                if self.__flush:
-                    self.__flush_stream(self.__logFileStream)
+            log = self.__format_now(logType, message, data, tback, args, context)
+            key = None
+            if self.__collapsing:
+                key = _duplicate_key(logType, message, data, tback, args, context)
+            self.__dispatch_sinks_sync(self.__forced_sinks(stdout, file), log, logType, key)
         # set last logged message (on caller thread for immediate visibility)
-        self.__lastLogged[logType] = log
-        self.__lastLogged[-1]      = log
+        if log is not None:
+            self.__lastLogged[logType] = log
+            self.__lastLogged[-1]      = log
         # always return logged message
         return message
 
@@ -3402,8 +7519,19 @@ class Logger(object):
         When enqueue mode is active, blocks until all queued log
         records have been written before flushing the streams.
         """
+        # announce rate limit drops ahead of joining, as the summaries of
+        # logType limits are queued like records
+        if self.__rateLimits:
+            self.__write_rate_summaries()
         if self.__enqueue and self.__logQueue is not None:
             self.__logQueue.join()
+        for lane in list(self.__lanes.values()):
+            lane.queue.join()
+        self.__write_sink_summaries()
+        # report the runs collapsing sinks are still counting
+        if self.__collapsing:
+            for sink in list(self.__sinks.values()):
+                self.__flush_collapser(sink)
         # flush every registered sink — track ids to avoid double-flush
         # when two sinks share the same handler object
         seen = set()
@@ -3417,33 +7545,33 @@ class Logger(object):
                     seen.add(sid)
                     self.__flush_stream(sink.handler)
 
-    def info(self, message, *args, **kwargs):
+    def info(self, message, data=None, tback=None, countConstraint=None, args=None):
         """Log at information level (alias for log('info', ...))."""
-        return self.log("info", message, *args, **kwargs)
+        return self.log("info", message, data, tback, countConstraint, args)
 
-    def information(self, message, *args, **kwargs):
+    def information(self, message, data=None, tback=None, countConstraint=None, args=None):
         """Log at information level (alias for log('info', ...))."""
-        return self.log("info", message, *args, **kwargs)
+        return self.log("info", message, data, tback, countConstraint, args)
 
-    def warn(self, message, *args, **kwargs):
+    def warn(self, message, data=None, tback=None, countConstraint=None, args=None):
         """Log at warning level (alias for log('warn', ...))."""
-        return self.log("warn", message, *args, **kwargs)
+        return self.log("warn", message, data, tback, countConstraint, args)
 
-    def warning(self, message, *args, **kwargs):
+    def warning(self, message, data=None, tback=None, countConstraint=None, args=None):
         """Log at warning level (alias for log('warn', ...))."""
-        return self.log("warn", message, *args, **kwargs)
+        return self.log("warn", message, data, tback, countConstraint, args)
 
-    def error(self, message, *args, **kwargs):
+    def error(self, message, data=None, tback=None, countConstraint=None, args=None):
         """Log at error level (alias for log('error', ...))."""
-        return self.log("error", message, *args, **kwargs)
+        return self.log("error", message, data, tback, countConstraint, args)
 
-    def critical(self, message, *args, **kwargs):
+    def critical(self, message, data=None, tback=None, countConstraint=None, args=None):
         """Log at critical level (alias for log('critical', ...))."""
-        return self.log("critical", message, *args, **kwargs)
+        return self.log("critical", message, data, tback, countConstraint, args)
 
-    def debug(self, message, *args, **kwargs):
+    def debug(self, message, data=None, tback=None, countConstraint=None, args=None):
         """Log at debug level (alias for log('debug', ...))."""
-        return self.log("debug", message, *args, **kwargs)
+        return self.log("debug", message, data, tback, countConstraint, args)
 
 
 
@@ -3495,6 +7623,220 @@ class SingleLogger(Logger):
         self._isInitialized = True
 
 
+class AsyncLogger(Logger):
+    """Logger for asyncio applications whose log calls never block the loop.
+
+    An AsyncLogger always runs in enqueue mode: formatting may happen on
+    the calling thread but every write, flush and fsync is done by the
+    writer threads. On top of the Logger methods it offers coroutine
+    counterparts -- alog(), aforce_log(), ainfo(), awarn(), aerror(),
+    acritical(), adebug() and aflush() -- meant to be awaited from the
+    event loop.
+
+    When the queue is full under the 'block' policy an awaited call does
+    not park the loop thread in queue.put(). The record goes to a backlog
+    kept per thread, so per event loop, and the call then awaits until
+    the backlog has moved into the queue. A writer thread wakes the loop
+    through call_soon_threadsafe() as soon as it takes a record off a
+    queue, so nothing polls. Other tasks keep running meanwhile and
+    records keep their order. queueBlockTimeout still bounds the wait of every
+    record: past it the record is dropped and counted in
+    droppedMessages. The 'drop', 'warn' and 'raise' policies never wait
+    and behave as with Logger.
+
+    The plain log(), info() ... methods keep the Logger behaviour and may
+    block the calling thread under the 'block' policy; use them from
+    threads other than the loop's.
+
+    .. code-block:: python
+
+        from pysimplelog import AsyncLogger
+
+        logger = AsyncLogger("service", maxQueueSize=10000, queueFullPolicy="block")
+
+        async def handle(request):
+            log = logger.bind(requestId=request.id)
+            await log.ainfo("started")
+            ...
+            await log.ainfo("done")
+
+        async def shutdown():
+            await logger.aflush()
+
+    :Parameters:
+        Same as Logger. *enqueue* defaults to True and may not be False.
+
+    :Raises:
+        #. ValueError: If *enqueue* is False.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """Initialise the logger in enqueue mode. See Logger."""
+        if kwargs.setdefault('enqueue', True) is False:
+            raise ValueError("AsyncLogger requires enqueue=True")
+        self.__local    = threading.local()
+        self.__backlogs = []
+        self.__lock     = threading.Lock()
+        super(AsyncLogger, self).__init__(*args, **kwargs)
+
+    def __thread_backlog(self):
+        """Return the backlog of the calling thread, creating it if needed."""
+        backlog = getattr(self.__local, 'records', None)
+        if backlog is None:
+            backlog = self.__local.records = deque()
+            with self.__lock:
+                self.__backlogs.append(backlog)
+        return backlog
+
+    async def __drain(self, backlog):
+        """Await until *backlog* has moved into the queues.
+
+        The waiter is registered before every attempt, so room a writer
+        thread makes right after a failed attempt still wakes the task.
+        Only the queueBlockTimeout deadline of the first waiting record
+        arms a timer.
+        """
+        # imported here so loggers that are never awaited do not pay for it
+        import asyncio
+        loop = asyncio.get_event_loop()
+        while True:
+            waiter = loop.create_future()
+            wake   = functools.partial(self.__wake, loop, waiter)
+            self._add_room_waiter(wake)
+            timer  = None
+            try:
+                if not self._drain_backlog(backlog):
+                    return
+                deadline = backlog[0][3]
+                if deadline is not None:
+                    timer = loop.call_later(max(0, deadline - time.time()),
+                                            self.__set_waiter, waiter)
+                await waiter
+            finally:
+                self._remove_room_waiter(wake)
+                if timer is not None:
+                    timer.cancel()
+
+    @classmethod
+    def __wake(cls, loop, waiter):
+        """Resolve *waiter* from a writer thread."""
+        try:
+            loop.call_soon_threadsafe(cls.__set_waiter, waiter)
+        except RuntimeError:
+            # the loop was closed while the task waited
+            pass
+
+    @staticmethod
+    def __set_waiter(waiter):
+        """Resolve *waiter* on the loop thread unless it is already done."""
+        if not waiter.done():
+            waiter.set_result(None)
+
+    async def _acall(self, method, *args, **kwargs):
+        """Call a logging method without letting it block the loop thread.
+
+        Records that find the queue full under the 'block' policy are
+        left in the calling thread's backlog, which is then awaited.
+
+        :Parameters:
+            #. method (callable): A log() or force_log() method of this
+               logger or of one of its bound loggers.
+            #. args, kwargs: The arguments of *method*.
+
+        :Returns:
+            #. result (object): What *method* returned.
+        """
+        backlog  = self.__thread_backlog()
+        previous = _ASYNC_BACKLOG.records
+        _ASYNC_BACKLOG.records = backlog
+        try:
+            result = method(*args, **kwargs)
+        finally:
+            _ASYNC_BACKLOG.records = previous
+        if backlog:
+            await self.__drain(backlog)
+        return result
+
+    @property
+    def backlog(self):
+        """Number of records waiting for room in a full queue."""
+        with self.__lock:
+            return sum(len(backlog) for backlog in self.__backlogs)
+
+    def _flush_atexit_logfile(self):
+        """Queue the backlogs left by unfinished awaits, then shut down as Logger."""
+        with self.__lock:
+            backlogs = list(self.__backlogs)
+        for backlog in backlogs:
+            self._drain_backlog(backlog, block=True)
+        super(AsyncLogger, self)._flush_atexit_logfile()
+
+    def bind(self, **context):
+        """Return a bound logger that also has the awaitable methods.
+
+        See Logger.bind().
+
+        :Returns:
+            #. result (_AsyncBoundLogger): A context-aware wrapper around
+               this AsyncLogger.
+        """
+        return _AsyncBoundLogger(self, context)
+
+    async def alog(self, logType, message, data=None, tback=None, countConstraint=None, args=None):
+        """Awaitable log().
+
+        Returns once the record is queued for the writer threads, without
+        waiting for it to be written. See log() for the parameters.
+
+        :Returns:
+            #. message (string): the logged message, as given
+        """
+        return await self._acall(self.log, logType, message, data, tback, countConstraint, args)
+
+    async def aforce_log(self, logType, message, data=None, tback=None, stdout=True, file=True, args=None):
+        """Awaitable force_log(). See alog() and force_log()."""
+        return await self._acall(self.force_log, logType, message, data, tback, stdout, file, args)
+
+    async def ainfo(self, message, data=None, tback=None, countConstraint=None, args=None):
+        """Awaitable info() (alias for alog('info', ...))."""
+        return await self.alog("info", message, data, tback, countConstraint, args)
+
+    async def ainformation(self, message, data=None, tback=None, countConstraint=None, args=None):
+        """Awaitable information() (alias for alog('info', ...))."""
+        return await self.alog("info", message, data, tback, countConstraint, args)
+
+    async def awarn(self, message, data=None, tback=None, countConstraint=None, args=None):
+        """Awaitable warn() (alias for alog('warn', ...))."""
+        return await self.alog("warn", message, data, tback, countConstraint, args)
+
+    async def awarning(self, message, data=None, tback=None, countConstraint=None, args=None):
+        """Awaitable warning() (alias for alog('warn', ...))."""
+        return await self.alog("warn", message, data, tback, countConstraint, args)
+
+    async def aerror(self, message, data=None, tback=None, countConstraint=None, args=None):
+        """Awaitable error() (alias for alog('error', ...))."""
+        return await self.alog("error", message, data, tback, countConstraint, args)
+
+    async def acritical(self, message, data=None, tback=None, countConstraint=None, args=None):
+        """Awaitable critical() (alias for alog('critical', ...))."""
+        return await self.alog("critical", message, data, tback, countConstraint, args)
+
+    async def adebug(self, message, data=None, tback=None, countConstraint=None, args=None):
+        """Awaitable debug() (alias for alog('debug', ...))."""
+        return await self.alog("debug", message, data, tback, countConstraint, args)
+
+    async def aflush(self):
+        """Awaitable flush().
+
+        Awaits the calling thread's backlog, then runs flush() in the
+        loop's default executor so the loop keeps running while the
+        writer threads drain the queues and the streams are flushed.
+        """
+        import asyncio
+        await self.__drain(self.__thread_backlog())
+        await asyncio.get_event_loop().run_in_executor(None, self.flush)
+
+
 
 if __name__ == "__main__":
     import time
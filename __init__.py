@@ -22,10 +22,10 @@ Python's site-packages directory.
 
 try:
     from .__pkginfo__ import __version__, __author__, __email__, __onlinedoc__, __repository__, __pypi__
-    from .SimpleLog import Logger, SingleLogger
+    from .SimpleLog import Logger, SingleLogger, AsyncLogger, RotationPolicy, RateLimit, Sampling
 except ImportError:
     from __pkginfo__ import __version__, __author__, __email__, __onlinedoc__, __repository__, __pypi__
-    from SimpleLog import Logger, SingleLogger
+    from SimpleLog import Logger, SingleLogger, AsyncLogger, RotationPolicy, RateLimit, Sampling
 
 
 def get_version():
@@ -0,0 +1,81 @@
+"""Event loop stalls caused by logging into a full queue.
+
+Run from the repo root:
+    python3 benchmarks/bench_async_logger.py
+
+A task logs bursts of 200 records to a sink that takes 1 ms per write,
+through a queue of 100 records under the 'block' policy, while a second
+task ticks every millisecond. With Logger.info() the loop thread parks in
+queue.put() whenever the queue is full; with AsyncLogger.ainfo() only the
+logging task waits, woken by the writer thread as soon as it makes room.
+The columns are the logging time per record and the longest gap between
+two ticks, i.e. the worst stall seen by the rest of the loop.
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from SimpleLog import Logger, AsyncLogger  # noqa: E402
+
+N     = 2000
+BURST = 200
+
+
+class SlowSink(object):
+
+    def write(self, text):
+        time.sleep(0.001)
+
+    def flush(self):
+        pass
+
+
+async def ticker(stop, gaps):
+    last = time.perf_counter()
+    while not stop.is_set():
+        await asyncio.sleep(0.001)
+        now = time.perf_counter()
+        gaps.append(now - last)
+        last = now
+
+
+async def run(cls, awaited):
+    L = cls('bench', logToFile=False, logToStdout=False, enqueue=True,
+            maxQueueSize=100, queueFullPolicy='block')
+    L.add_sink('slow', SlowSink())
+    stop, gaps = asyncio.Event(), []
+    tick  = asyncio.ensure_future(ticker(stop, gaps))
+    start = time.perf_counter()
+    for i in range(N):
+        if awaited:
+            await L.ainfo('record %d' % i)
+        else:
+            L.info('record %d' % i)
+        if i % BURST == BURST - 1:
+            await asyncio.sleep(0)
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await tick
+    L.flush()
+    return elapsed / N * 1e6, max(gaps) * 1e3
+
+
+def main():
+    rows = [('Logger.info()',       Logger,      False),
+            ('AsyncLogger.ainfo()', AsyncLogger, True)]
+    print('%-22s %14s %14s' % ('case', 'us/record', 'worst gap ms'))
+    print('-' * 52)
+    for label, cls, awaited in rows:
+        loop = asyncio.new_event_loop()
+        try:
+            perRecord, gap = loop.run_until_complete(run(cls, awaited))
+        finally:
+            loop.close()
+        print('%-22s %14.1f %14.1f' % (label, perRecord, gap))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+"""Per-call cost of callerInfo tagging.
+
+Run from the repo root:
+    python3 benchmarks/bench_caller_info.py
+
+Compares ``info()`` without caller tags, with the frame-walking tags, and
+the previous ``inspect.stack(context=0)`` lookup on its own for reference.
+"""
+
+import inspect
+import io
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from SimpleLog import Logger  # noqa: E402
+
+N = 200000
+
+
+def per_call_ns(stmt, namespace, number=N):
+    best = min(timeit.repeat(stmt, globals=namespace, number=number, repeat=5))
+    return best / number * 1e9
+
+
+def main():
+    plain  = Logger('bench', logToFile=False, stdout=io.StringIO())
+    tagged = Logger('bench', logToFile=False, stdout=io.StringIO(), callerInfo=True)
+    rows = [
+        ('info(), callerInfo=False',       "L.info('message')",        {'L': plain},   N),
+        ('info(), callerInfo=True',        "L.info('message')",        {'L': tagged},  N),
+        ('inspect.stack(context=0) alone', "inspect.stack(context=0)", {'inspect': inspect}, N // 20),
+    ]
+    print('%-45s %12s' % ('case', 'ns/call'))
+    print('-' * 58)
+    for label, stmt, namespace, number in rows:
+        print('%-45s %12.1f' % (label, per_call_ns(stmt, namespace, number)))
+
+
+if __name__ == '__main__':
+    main()
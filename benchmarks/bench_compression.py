@@ -0,0 +1,59 @@
+"""Logging latency while rotated files are compressed.
+
+Run from the repo root:
+    python3 benchmarks/bench_compression.py
+
+Writes records to 1 MB rotating files with compression off and with each
+background method, and reports the mean and worst info() latency. The
+worst call is the one that rotates; with compression it must not include
+the time spent compressing the previous file. The final column is the
+time left waiting for the compressor once logging is done.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from SimpleLog import Logger  # noqa: E402
+
+N       = 200000
+PADDING = 'x' * 80
+
+
+def run(compression):
+    tmp = tempfile.mkdtemp()
+    try:
+        L = Logger('bench', logToStdout=False, durability='none',
+                   logFileBasename=os.path.join(tmp, 'bench'),
+                   logFileMaxSize='1MB', compression=compression)
+        clock = time.perf_counter
+        worst = 0.0
+        start = clock()
+        for i in range(N):
+            t = clock()
+            L.info('record %d %s' % (i, PADDING))
+            worst = max(worst, clock() - t)
+        total = clock() - start
+        L.flush()
+        t = clock()
+        while L.pendingCompressions:
+            time.sleep(0.001)
+        drain = clock() - t
+        return total / N * 1e9, worst * 1e6, drain * 1e3
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def main():
+    print('%-12s %12s %12s %12s' % ('compression', 'mean ns', 'worst us', 'drain ms'))
+    print('-' * 51)
+    for compression in (None, 'gzip', 'bz2', 'lzma'):
+        mean, worst, drain = run(compression)
+        print('%-12s %12.1f %12.1f %12.1f' % (compression, mean, worst, drain))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""Caller cost of enqueued log() calls with and without deferFormatting.
+
+Run from the repo root:
+    python3 benchmarks/bench_deferred_formatting.py
+
+Times info() calls on an enqueue logger writing to an in-memory stream,
+formatting the record on the calling thread and deferring it to the
+writer thread, for a plain message, %-style args, a data payload and
+json records, with the default queue and with queueBackend='ring'.
+While the calls are timed the writer is parked on its first record, so
+it cannot take the GIL to format and write and the column is the cost
+left on the calling thread. The last column is the time for the writer
+to drain what the calls queued.
+"""
+
+import io
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from SimpleLog import Logger  # noqa: E402
+
+N      = 50000
+REPEAT = 5
+
+
+class GatedStream(io.StringIO):
+    """In-memory stream whose writes wait until the gate is opened."""
+
+    def __init__(self):
+        super().__init__()
+        self.gate = threading.Event()
+
+    def write(self, text):
+        self.gate.wait()
+        return super().write(text)
+
+
+def run(defer, call, **kwargs):
+    clock = time.perf_counter
+    best  = float('inf')
+    drain = 0.0
+    for _ in range(REPEAT):
+        stream = GatedStream()
+        L = Logger('bench', logToFile=False, stdout=stream, enqueue=True,
+                   deferFormatting=defer, **kwargs)
+        L.info('parks the writer')
+        time.sleep(0.01)
+        start = clock()
+        for i in range(N):
+            call(L, i)
+        elapsed = clock() - start
+        t = clock()
+        stream.gate.set()
+        L.flush()
+        if elapsed < best:
+            best, drain = elapsed, clock() - t
+    return best / N * 1e9, drain * 1e3
+
+
+def main():
+    cases = [
+        ('plain message', lambda L, i: L.info('request handled'), {}),
+        ('args',          lambda L, i: L.info('request %d handled in %s ms', args=(i, 12.5)), {}),
+        ('data payload',  lambda L, i: L.info('request', data={'id': i, 'user': 'ann'}), {}),
+        ('args, json',    lambda L, i: L.info('request %d handled', args=(i,)), {'recordFormat': 'json'}),
+        ('args, ring',    lambda L, i: L.info('request %d handled in %s ms', args=(i, 12.5)),
+                          {'queueBackend': 'ring'}),
+    ]
+    print('%-16s %8s %12s %12s' % ('case', 'defer', 'ns/call', 'drain ms'))
+    print('-' * 51)
+    for label, call, kwargs in cases:
+        for defer in (False, True):
+            ns, drain = run(defer, call, **kwargs)
+            print('%-16s %8s %12.1f %12.1f' % (label, defer, ns, drain))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""Per-call cost of a log type that no sink receives.
+
+Run from the repo root:
+    python3 benchmarks/bench_disabled_level.py
+
+Compares a filtered ``debug()`` call against a plain dict lookup (the
+theoretical floor of the active-sink fast path), the same call with
+``lastLoggedFiltered=True`` (records are still formatted for lastLogged),
+and an enabled ``info()`` call writing to an in-memory stream.
+"""
+
+import io
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from SimpleLog import Logger  # noqa: E402
+
+N = 200000
+
+
+def make_logger(**kwargs):
+    L = Logger('bench', logToFile=False, stdout=io.StringIO(), **kwargs)
+    L.set_log_type_flags('debug', stdoutFlag=False, fileFlag=False)
+    return L
+
+
+def per_call_ns(stmt, namespace):
+    best = min(timeit.repeat(stmt, globals=namespace, number=N, repeat=5))
+    return best / N * 1e9
+
+
+def main():
+    fast = make_logger()
+    slow = make_logger(lastLoggedFiltered=True)
+    lookup = {'debug': []}
+    rows = [
+        ('dict lookup (floor)',              "lookup.get('debug')",         {'lookup': lookup}),
+        ('debug() filtered, fast path',      "L.debug('filtered message')", {'L': fast}),
+        ('debug() filtered, lastLoggedFiltered=True',
+                                             "L.debug('filtered message')", {'L': slow}),
+        ('info() written to StringIO',       "L.info('written message')",   {'L': fast}),
+    ]
+    print('%-45s %12s' % ('case', 'ns/call'))
+    print('-' * 58)
+    for label, stmt, namespace in rows:
+        print('%-45s %12.1f' % (label, per_call_ns(stmt, namespace)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""Write throughput of the file sink alone, per file mode.
+
+Run from the repo root:
+    python3 benchmarks/bench_file_sink.py
+
+bench_file_throughput.py times whole info() calls, where formatting the
+record costs more than writing it. Here the same preformatted record is
+handed straight to the file sink, the step every file mode replaces,
+with durability 'none' and no rotation. Each row is the best of five
+runs, in records per second and in ns per record.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from SimpleLog import Logger  # noqa: E402
+
+N      = 300000
+REPEAT = 5
+
+
+def run(message, **kwargs):
+    kwargs.setdefault('logFileMaxSize', None)
+    tmp = tempfile.mkdtemp()
+    try:
+        L = Logger('bench', logToStdout=False, durability='none',
+                   logFileBasename=os.path.join(tmp, 'bench'), **kwargs)
+        # the file sink itself, past routing and formatting
+        write = L._Logger__log_to_file
+        write(message)
+        start = time.perf_counter()
+        for _ in range(N):
+            write(message)
+        L.flush()
+        elapsed = time.perf_counter() - start
+        L._flush_atexit_logfile()
+        return elapsed
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def main():
+    ascii_ = '2024-01-01 12:00:00 - bench <INFO> request handled in 12 ms ' + 'x' * 60 + '\n'
+    utf8   = '2024-01-01 12:00:00 - bench <INFO> requête traitée en 12 ms ' + 'é' * 60 + '\n'
+    rows = [
+        ('text',                     ascii_, {}),
+        ('binary 16 KB',             ascii_, {'fileMode': 'binary', 'fileBufferSize': '16KB'}),
+        ('binary 64 KB',             ascii_, {'fileMode': 'binary', 'fileBufferSize': '64KB'}),
+        ('binary 256 KB',            ascii_, {'fileMode': 'binary', 'fileBufferSize': '256KB'}),
+        ('binary 4 MB',              ascii_, {'fileMode': 'binary', 'fileBufferSize': '4MB'}),
+        ('mmap 64 MB segment',       ascii_, {'fileMode': 'mmap', 'logFileMaxSize': '64MB'}),
+        ('text, non-ASCII',          utf8,   {}),
+        ('binary 64 KB, non-ASCII',  utf8,   {'fileMode': 'binary', 'fileBufferSize': '64KB'}),
+        ('mmap 64 MB, non-ASCII',    utf8,   {'fileMode': 'mmap', 'logFileMaxSize': '64MB'}),
+    ]
+    print('%-26s %14s %10s' % ('case', 'records/s', 'ns/record'))
+    print('-' * 52)
+    for label, message, kwargs in rows:
+        elapsed = min(run(message, **kwargs) for _ in range(REPEAT))
+        print('%-26s %14.0f %10.1f' % (label, N / elapsed, elapsed / N * 1e9))
+
+
+if __name__ == '__main__':
+    main()
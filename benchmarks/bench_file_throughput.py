@@ -0,0 +1,73 @@
+"""File sink throughput of the text, binary and mmap file modes.
+
+Run from the repo root:
+    python3 benchmarks/bench_file_throughput.py
+
+Logs the same records to a file with durability 'none' through the text
+stream, through the binary mode at several buffer sizes and into mmap
+segments preallocated to 64 MB, and reports records per second and MB/s
+of log file written, including the final flush, best of three runs. The
+last rows add non-ASCII records, which the text and binary modes count
+by encoding them a second time, and compare mmap with text writes made
+with durability 'flush', the other way to get every record into the
+page cache at once. These are whole info() calls, where
+formatting outweighs the write; bench_file_sink.py times the sink alone.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from SimpleLog import Logger  # noqa: E402
+
+N      = 200000
+REPEAT = 3
+
+
+def run(message, **kwargs):
+    kwargs.setdefault('logFileMaxSize', None)
+    kwargs.setdefault('durability', 'none')
+    tmp = tempfile.mkdtemp()
+    try:
+        L = Logger('bench', logToStdout=False,
+                   logFileBasename=os.path.join(tmp, 'bench'), **kwargs)
+        info  = L.info
+        start = time.perf_counter()
+        for _ in range(N):
+            info(message)
+        L.flush()
+        elapsed = time.perf_counter() - start
+        L._flush_atexit_logfile()   # truncates an mmap segment
+        size = os.path.getsize(L.logFileName)
+        return N / elapsed, size / elapsed / 1024**2
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def main():
+    ascii_ = 'request handled in 12 ms ' + 'x' * 60
+    utf8   = 'requête traitée en 12 ms ' + 'é' * 60
+    rows = [
+        ('text',                 ascii_, {}),
+        ('binary 64 KB',         ascii_, {'fileMode': 'binary', 'fileBufferSize': '64KB'}),
+        ('binary 256 KB',        ascii_, {'fileMode': 'binary'}),
+        ('binary 4 MB',          ascii_, {'fileMode': 'binary', 'fileBufferSize': '4MB'}),
+        ('mmap 64 MB segment',   ascii_, {'fileMode': 'mmap', 'logFileMaxSize': '64MB'}),
+        ('text, non-ASCII',      utf8,   {}),
+        ('binary 256 KB, non-ASCII', utf8, {'fileMode': 'binary'}),
+        ('text, flush',          ascii_, {'durability': 'flush'}),
+        ('mmap 64 MB, flush',    ascii_, {'fileMode': 'mmap', 'logFileMaxSize': '64MB',
+                                          'durability': 'flush'}),
+    ]
+    print('%-28s %14s %10s' % ('case', 'records/s', 'MB/s'))
+    print('-' * 54)
+    for label, message, kwargs in rows:
+        rate, mbps = max(run(message, **kwargs) for _ in range(REPEAT))
+        print('%-28s %14.0f %10.1f' % (label, rate, mbps))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+"""Cost of keeping debug records in the flight recorder.
+
+Run from the repo root:
+    python3 benchmarks/bench_flight_recorder.py
+
+Times debug() calls on a logger whose file sink starts at info level:
+filtered with no recorder, kept in the recorder ring unformatted, kept
+formatted because an argument is a list, and, for comparison, written
+to the file with durability 'none'.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from SimpleLog import Logger  # noqa: E402
+
+N = 200000
+
+
+def per_call_ns(stmt, namespace):
+    best = min(timeit.repeat(stmt, globals=namespace, number=N, repeat=5))
+    return best / N * 1e9
+
+
+def main():
+    tmp = tempfile.mkdtemp()
+    try:
+        def logger(name, capacity=None, **kwargs):
+            kwargs.setdefault('fileMinLevel', 10)
+            L = Logger(name, logToStdout=False, durability='none', logFileMaxSize=None,
+                       logFileBasename=os.path.join(tmp, name), **kwargs)
+            if capacity is not None:
+                L.set_flight_recorder(capacity)
+            return L
+        rows = [
+            ('filtered, no recorder',      'L.debug("step %d", args=(7,))',   logger('filtered')),
+            ('kept unformatted',           'L.debug("step %d", args=(7,))',   logger('ring', 1000)),
+            ('kept formatted (list arg)',  'L.debug("step %s", args=([7],))', logger('list', 1000)),
+            ('written to file',            'L.debug("step %d", args=(7,))',   logger('file', fileMinLevel=None)),
+        ]
+        print('%-30s %12s' % ('case', 'ns/call'))
+        print('-' * 43)
+        for label, stmt, L in rows:
+            print('%-30s %12.1f' % (label, per_call_ns(stmt, {'L': L})))
+            L._flush_atexit_logfile()
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
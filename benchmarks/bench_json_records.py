@@ -0,0 +1,61 @@
+"""Cost of building json records against json.dumps().
+
+Run from the repo root:
+    python3 benchmarks/bench_json_records.py
+
+The first rows time the record encoding alone: the template path used
+by recordFormat='json' (per-logType template plus the C string escaper)
+against building the same dict and passing it to json.dumps(). The last
+rows time whole info() calls writing to an in-memory stream in the text
+and json record formats, with and without bound context.
+"""
+
+import io
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from json.encoder import encode_basestring  # noqa: E402
+from SimpleLog import Logger  # noqa: E402
+
+N = 200000
+
+
+def per_call_ns(stmt, namespace):
+    best = min(timeit.repeat(stmt, globals=namespace, number=N, repeat=5))
+    return best / N * 1e9
+
+
+def main():
+    message   = 'processing order 42 for customer abc took 12 ms'
+    escaped   = 'path "C:\\temp" not found\tretrying'
+    timestamp = '2024-01-01 12:00:00'
+    template  = ',"logger":"bench","logType":"info","level":10.0,"message":'
+    dumps     = json.dumps
+    record    = ("'{\"timestamp\":' + enc(ts) + template + enc(m) + '}'")
+    viaDumps  = ("dumps({'timestamp': ts, 'logger': 'bench', 'logType': 'info',"
+                 " 'level': 10.0, 'message': m})")
+    encoding  = {'enc': encode_basestring, 'dumps': dumps, 'ts': timestamp,
+                 'template': template}
+    text = Logger('bench', logToFile=False, stdout=io.StringIO())
+    js   = Logger('bench', logToFile=False, stdout=io.StringIO(), recordFormat='json')
+    rows = [
+        ('template + C escaper',            record,   dict(encoding, m=message)),
+        ('dict + json.dumps()',             viaDumps, dict(encoding, m=message)),
+        ('template, escaped message',       record,   dict(encoding, m=escaped)),
+        ('dict + json.dumps(), escaped',    viaDumps, dict(encoding, m=escaped)),
+        ('info(), text record',             'L.info(m)', {'L': text, 'm': message}),
+        ('info(), json record',             'L.info(m)', {'L': js, 'm': message}),
+        ('bound info(), text record',       'B.info(m)', {'B': text.bind(requestId='abc'), 'm': message}),
+        ('bound info(), json record',       'B.info(m)', {'B': js.bind(requestId='abc'), 'm': message}),
+    ]
+    print('%-36s %12s' % ('case', 'ns/call'))
+    print('-' * 49)
+    for label, stmt, namespace in rows:
+        print('%-36s %12.1f' % (label, per_call_ns(stmt, namespace)))
+
+
+if __name__ == '__main__':
+    main()
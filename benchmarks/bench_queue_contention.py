@@ -0,0 +1,72 @@
+"""Producer throughput of the enqueue queue backends under contention.
+
+Run from the repo root:
+    python3 benchmarks/bench_queue_contention.py
+
+For 1 to 64 producer threads, every backend (``queueBackend='queue'`` and
+``'ring'``) receives the same total number of ``info()`` calls split
+evenly between the producers. The writer thread feeds a sink that
+discards everything, so the figures measure the hand-off from callers to
+the writer rather than I/O. Reported are the producer wall time per
+record and the time until flush() returned.
+"""
+
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from SimpleLog import Logger  # noqa: E402
+
+TOTAL   = 200000
+THREADS = (1, 2, 4, 8, 16, 32, 64)
+
+
+class NullSink(object):
+    def write(self, text):
+        pass
+
+    def flush(self):
+        pass
+
+
+def run(backend, nthreads):
+    L = Logger('bench', logToFile=False, logToStdout=False, enqueue=True,
+               queueBackend=backend, maxQueueSize=65536, queueFullPolicy='block',
+               durability='none')
+    L.add_sink('null', NullSink())
+    perThread = TOTAL // nthreads
+    start     = threading.Event()
+
+    def produce():
+        start.wait()
+        info = L.info
+        for _ in range(perThread):
+            info('contended message')
+
+    threads = [threading.Thread(target=produce) for _ in range(nthreads)]
+    for t in threads:
+        t.start()
+    t0 = time.perf_counter()
+    start.set()
+    for t in threads:
+        t.join()
+    t1 = time.perf_counter()
+    L.flush()
+    t2 = time.perf_counter()
+    records = perThread * nthreads
+    return (t1 - t0) / records * 1e9, (t2 - t0) / records * 1e9
+
+
+def main():
+    print('%-8s %8s %18s %18s' % ('backend', 'threads', 'put ns/record', 'drained ns/record'))
+    print('-' * 56)
+    for nthreads in THREADS:
+        for backend in ('queue', 'ring'):
+            put, drained = run(backend, nthreads)
+            print('%-8s %8d %18.1f %18.1f' % (backend, nthreads, put, drained))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+"""Cost of the token-bucket rate limit check in log().
+
+Run from the repo root:
+    python3 benchmarks/bench_rate_limit.py
+
+Times info() calls writing to an in-memory stream with no limit and
+with a limit high enough to admit every record, then calls dropped by
+an exhausted bucket -- the cost an error loop pays once it is limited
+-- for a single logType bucket and for per-call-site buckets.
+"""
+
+import io
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from SimpleLog import Logger, RateLimit  # noqa: E402
+
+N = 200000
+
+
+def per_call_ns(L):
+    best = min(timeit.repeat("L.info('request handled')", globals={'L': L},
+                             number=N, repeat=5))
+    return best / N * 1e9
+
+
+def logger(rateLimit=None):
+    L = Logger('bench', logToFile=False, stdout=io.StringIO())
+    if rateLimit is not None:
+        L.set_rate_limit(rateLimit, logTypes=['info'])
+    return L
+
+
+def main():
+    rows = [
+        ('no limit',                   logger()),
+        ('limit, admitted',            logger(RateLimit(1e9))),
+        ('limit, dropped',             logger(RateLimit(1e-9))),
+        ('per call site, dropped',     logger(RateLimit(1e-9, perCallSite=True))),
+    ]
+    print('%-28s %12s' % ('case', 'ns/call'))
+    print('-' * 41)
+    for label, L in rows:
+        print('%-28s %12.1f' % (label, per_call_ns(L)))
+
+
+if __name__ == '__main__':
+    main()
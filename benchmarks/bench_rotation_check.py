@@ -0,0 +1,62 @@
+"""Per-write cost of the log file size check.
+
+Run from the repo root:
+    python3 benchmarks/bench_rotation_check.py
+
+The first two rows time a bare text-mode write followed by the size check
+used before (``tell()`` and a float division) and the one used now (an
+integer byte counter). The last two rows time ``info()`` to a file with
+and without ``logFileMaxSize``, so the check's share of a whole log call
+is visible.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from SimpleLog import Logger  # noqa: E402
+
+N = 200000
+MESSAGE = 'a typical log record of roughly eighty characters, written to a file\n'
+
+
+def per_call_ns(stmt, namespace, setup='pass'):
+    best = min(timeit.repeat(stmt, setup=setup, globals=namespace, number=N, repeat=5))
+    return best / N * 1e9
+
+
+def main():
+    tmp = tempfile.mkdtemp()
+    try:
+        stream = open(os.path.join(tmp, 'raw.log'), 'a')
+        state  = {'bytes': 0}
+        ns     = {'f': stream, 'msg': MESSAGE, 'state': state}
+        limited   = Logger('bench', logToStdout=False, durability='none',
+                           logFileBasename=os.path.join(tmp, 'limited'),
+                           logFileMaxSize='10GB')
+        unlimited = Logger('bench', logToStdout=False, durability='none',
+                           logFileBasename=os.path.join(tmp, 'unlimited'),
+                           logFileMaxSize=None)
+        rows = [
+            ('write + tell()/(1024.**2) check',
+             "f.write(msg); f.tell()/(1024.**2) >= 10240.0", ns),
+            ('write + byte counter check',
+             "f.write(msg); state['bytes'] += len(msg) if msg.isascii() else len(msg.encode()); "
+             "state['bytes'] >= 10737418240", ns),
+            ('info() to file, logFileMaxSize=10GB', "L.info('message')", {'L': limited}),
+            ('info() to file, no size limit',       "L.info('message')", {'L': unlimited}),
+        ]
+        print('%-40s %12s' % ('case', 'ns/call'))
+        print('-' * 53)
+        for label, stmt, namespace in rows:
+            print('%-40s %12.1f' % (label, per_call_ns(stmt, namespace)))
+        stream.close()
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""Cost of one log file rotation in a crowded log directory.
+
+Run from the repo root:
+    python3 benchmarks/bench_rotation_index.py
+
+Creates a temporary directory holding 100k unrelated files, then times
+rotations of a logger whose every record fills its file. The incremental
+rotation index is compared against a forced full directory rescan on
+every rotation (the behaviour before the index existed), and against the
+same logger in an empty directory.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from SimpleLog import Logger  # noqa: E402
+
+N_FILES     = 100000
+N_ROTATIONS = 200
+
+
+def make_logger(directory):
+    # every record is larger than logFileMaxSize, so every write rotates
+    return Logger('bench', logToStdout=False, logFileRoll=5,
+                  logFileBasename=os.path.join(directory, 'app'),
+                  logFileMaxSize=1e-6, durability='none')
+
+
+def per_rotation_us(L, rescan):
+    t0 = time.perf_counter()
+    for _ in range(N_ROTATIONS):
+        if rescan:
+            # drop the index so the next rotation lists the directory
+            L._Logger__logFileIndex = None
+        L.info('rotate')
+    return (time.perf_counter() - t0) / N_ROTATIONS * 1e6
+
+
+def main():
+    crowded = tempfile.mkdtemp()
+    empty   = tempfile.mkdtemp()
+    try:
+        for i in range(N_FILES):
+            open(os.path.join(crowded, 'neighbour_%06d.dat' % i), 'w').close()
+        rows = [
+            ('empty dir, index',                 make_logger(empty),   False),
+            ('%dk files, index' % (N_FILES // 1000),       make_logger(crowded), False),
+            ('%dk files, full rescan' % (N_FILES // 1000), make_logger(crowded), True),
+        ]
+        print('%-30s %16s' % ('case', 'us/rotation'))
+        print('-' * 47)
+        for label, L, rescan in rows:
+            print('%-30s %16.1f' % (label, per_rotation_us(L, rescan)))
+    finally:
+        shutil.rmtree(crowded, ignore_errors=True)
+        shutil.rmtree(empty, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+"""Cost of producing the header timestamp of one record.
+
+Run from the repo root:
+    python3 benchmarks/bench_timestamp.py
+
+Compares the uncached ``datetime.strftime(datetime.now(tz), fmt)`` call
+that used to run for every record with ``Logger._get_datetimestamp()``,
+which memoises the formatted second and only appends fractional digits.
+"""
+
+import io
+import os
+import sys
+import timeit
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from SimpleLog import Logger  # noqa: E402
+
+N   = 200000
+FMT = '%Y-%m-%d %H:%M:%S'
+
+
+def per_call_ns(stmt, namespace):
+    best = min(timeit.repeat(stmt, globals=namespace, number=N, repeat=5))
+    return best / N * 1e9
+
+
+def main():
+    plain = Logger('bench', logToFile=False, stdout=io.StringIO())
+    milli = Logger('bench', logToFile=False, stdout=io.StringIO(), timestampPrecision=3)
+    rows = [
+        ('strftime(datetime.now()) per record', "datetime.strftime(datetime.now(None), FMT)",
+         {'datetime': datetime, 'FMT': FMT}),
+        ('_get_datetimestamp() cached',         "L._get_datetimestamp()", {'L': plain}),
+        ('_get_datetimestamp() cached + ms',    "L._get_datetimestamp()", {'L': milli}),
+    ]
+    print('%-40s %12s' % ('case', 'ns/call'))
+    print('-' * 53)
+    for label, stmt, namespace in rows:
+        print('%-40s %12.1f' % (label, per_call_ns(stmt, namespace)))
+
+
+if __name__ == '__main__':
+    main()
@@ -13,15 +13,16 @@ Coverage map
 ------------
 TestLoggerInit          -- constructor parameters and initial property values
 TestBuiltinLogTypes     -- info / warn / warning / error / critical / debug
-TestCountConstraint     -- countConstraint parameter on log()
+TestCountConstraint     -- countConstraint on log(), bounded LRU tracker, template keys
 TestLastLogged          -- lastLogged / lastLoggedMessage / lastLogged* properties
+TestFilteredFastPath    -- log() short-circuit for log types with no active sink
 TestStdoutSink          -- enable/disable, per-type flags, level window
 TestFileSink            -- file creation, enable/disable, rotation
 TestUserSinkBasic       -- add_sink / remove_sink / clear_sinks, routing, ANSI-free
 TestUserSinkEnabled     -- enabled flag at add time and via set_log_to_stdout_flag
 TestUserSinkLogTypeFlags -- per-type flags on a user sink
 TestUserSinkLevelFilter -- minLevel / maxLevel via add_sink and set_minimum/maximum_level
-TestRebuildActiveSinks  -- white-box: __activeSinks cache structure after every change
+TestRebuildActiveSinks  -- white-box: __sinkTable cache structure after every change
 TestUserSinkIndependence -- user sink receives a type suppressed globally for stdout
 TestSinkApiValidation   -- bad inputs to add/remove/clear sinks
 TestLevelMethods        -- set_minimum/maximum_level for built-ins and sinks=
@@ -33,18 +34,44 @@ TestForceLog            -- force_log bypasses user sinks
 TestSanitize            -- ANSI stripping, maxMessageSize, maxDataSize
 TestParametersStr       -- parameters property, userSinks snapshot, __str__
 TestFlushAtexit         -- _flush_atexit_logfile lifecycle contract
+TestDurability          -- none / flush / fsync modes and fsync triggers per sink
+TestTimestampCache      -- per-second timestamp memoisation and fractional digits
+TestHeaderTemplates     -- precompiled per-logType headers follow name changes
+TestCallerFrameWalk     -- frame-walking caller tags, callerOffset, memoisation
+TestRotationIndex       -- in-memory rotated-file index, rescans on interference
+TestByteRotation        -- byte-counter rotation and size strings with units
+TestRotationPolicy      -- time and size-or-time rotation with an injected clock
+TestCompression         -- background compression of rotated files, roll counting
+TestBinaryFileMode      -- buffered UTF-8 file sink, exact byte rotation
+TestMmapFileMode        -- preallocated mapped segments, truncation, crash recovery
+TestJsonRecords         -- recordFormat='json' lines, bound context, escaping
+TestDeferredFormatting  -- args merging, writer-thread formatting, snapshots
+TestLogRecord           -- slotted queue records, versioned _SinkTable snapshots
+TestRateLimit           -- token buckets per logType, call site and sink, summaries
+TestDuplicateCollapsing -- "last message repeated N times" per sink, window, flush
+TestSampling            -- ratio, first-N and context-hash sampling, sampledOut counts
+TestFlightRecorder      -- in-memory rings of filtered records dumped on errors
+TestAsyncLogger         -- awaitable methods, per-loop backlog of a full queue, aflush
 """
 
+import asyncio
 import glob
+import gzip
 import io
+import json
 import os
+import queue
 import sys
 import tempfile
 import threading
+import time
 import unittest
+from datetime import datetime, timedelta, timezone
+from unittest import mock
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
-from SimpleLog import Logger, _SINK_STDOUT, _SINK_FILE  # noqa: E402
+import SimpleLog  # noqa: E402
+from SimpleLog import Logger, AsyncLogger, RotationPolicy, RateLimit, Sampling, _SINK_STDOUT, _SINK_FILE, _LogRecord, _get_caller_str  # noqa: E402
 
 
 # ─────────────────────────── helpers ────────────────────────────────────────
@@ -218,6 +245,81 @@ class TestCountConstraint(unittest.TestCase):
         self.assertEqual(self.buf.getvalue().count('msgA'), 1)
         self.assertEqual(self.buf.getvalue().count('msgB'), 1)
 
+    def test_logMessagesCounter_keeps_legacy_values(self):
+        for _ in range(3):
+            self.L.info('seen', countConstraint=1)
+        self.assertEqual(self.L.logMessagesCounter, {'seen': 2})
+        self.L.logMessagesCounter.clear()           # a copy
+        self.assertEqual(self.L.logMessagesCounter, {'seen': 2})
+
+    def test_capacity_evicts_least_recently_logged(self):
+        L, buf = make_logger(countConstraintCapacity=2)
+        L.info('a', countConstraint=1)
+        L.info('b', countConstraint=1)
+        L.info('a', countConstraint=1)              # refreshes 'a'
+        L.info('c', countConstraint=1)              # evicts 'b'
+        self.assertEqual(sorted(L.logMessagesCounter), ['a', 'c'])
+        L.info('b', countConstraint=1)              # forgotten, logs again
+        self.assertEqual(buf.getvalue().count(' b\n'), 2)
+        stats = L.countConstraintStatistics
+        self.assertEqual((stats['entries'], stats['capacity'], stats['evictions'], stats['suppressed']),
+                         (2, 2, 2, 1))
+        self.assertGreater(stats['memoryBytes'], 0)
+
+    def test_ids_bounded_by_default_capacity(self):
+        L, _ = make_logger(logToStdout=False, lastLoggedFiltered=True)
+        for i in range(12000):
+            L.info('order %d' % i, countConstraint=1)
+        self.assertEqual(L.countConstraintStatistics['entries'], 10000)
+
+    def test_template_key_groups_ids(self):
+        L, buf = make_logger(countConstraintKey='template')
+        L.info('user 42 request 7f3a9c2e-1b4d-4c8e-9a6f-0123456789ab failed', countConstraint=2)
+        L.info('user 43 request 0x1f failed', countConstraint=2)
+        L.info('user 44 request 12 failed', countConstraint=2)
+        self.assertEqual(buf.getvalue().count('failed'), 2)
+        self.assertEqual(list(L.logMessagesCounter), ['user # request # failed'])
+
+    def test_args_count_by_template(self):
+        for i in range(5):
+            self.L.info('job %d done', args=(i,), countConstraint=3)
+        self.assertEqual(self.buf.getvalue().count('done'), 3)
+
+    def test_threads_never_exceed_constraint(self):
+        L, buf = make_logger(enqueue=True)
+        barrier = threading.Barrier(8)
+
+        def worker():
+            barrier.wait()
+            for _ in range(200):
+                L.info('shared', countConstraint=100)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        L.flush()
+        self.assertEqual(buf.getvalue().count('shared'), 100)
+        self.assertEqual(L.countConstraintStatistics['suppressed'], 1500)
+
+    def test_set_count_constraint(self):
+        self.L.info('a', countConstraint=1)
+        self.L.info('b', countConstraint=1)
+        self.L.update(countConstraintCapacity=1)
+        self.assertEqual(list(self.L.logMessagesCounter), ['b'])
+        self.L.set_count_constraint(None, 'template')
+        self.assertEqual(self.L.logMessagesCounter, {})
+        self.assertEqual((self.L.parameters['countConstraintCapacity'],
+                          self.L.parameters['countConstraintKey']), (None, 'template'))
+        self.assertIn('Count constraint capacity: None  Key: template', str(self.L))
+        with self.assertRaises(ValueError):
+            self.L.set_count_constraint(0)
+        with self.assertRaises(TypeError):
+            self.L.set_count_constraint('10')
+        with self.assertRaises(ValueError):
+            self.L.set_count_constraint(10, 'hash')
+
 
 # ═══════════════════════════════════════════════════════════════════════════
 # 4 — lastLogged properties
@@ -257,6 +359,67 @@ class TestLastLogged(unittest.TestCase):
         self.assertNotIn(-1, d)
 
 
+class TestFilteredFastPath(unittest.TestCase):
+    """log() must return before formatting when no sink receives the type."""
+
+    def _make(self, **kwargs):
+        L, buf = make_logger(**kwargs)
+        L.set_log_type_flags('debug', stdoutFlag=False, fileFlag=False)
+        return L, buf
+
+    def test_filtered_record_skips_formatting(self):
+        L, buf = self._make()
+        calls = []
+        original = L._format_message
+        L._format_message = lambda *a, **k: calls.append(1) or original(*a, **k)
+        self.assertEqual(L.debug('quiet'), 'quiet')
+        self.assertEqual(calls, [])
+        self.assertEqual(buf.getvalue(), '')
+
+    def test_filtered_record_does_not_update_lastLogged_by_default(self):
+        L, _ = self._make()
+        L.info('kept')
+        L.debug('quiet')
+        self.assertIsNone(L.lastLoggedDebug)
+        self.assertIn('kept', L.lastLoggedMessage)
+
+    def test_lastLoggedFiltered_true_records_filtered_message(self):
+        L, buf = self._make(lastLoggedFiltered=True)
+        L.debug('quiet')
+        self.assertIn('quiet', L.lastLoggedDebug)
+        self.assertIn('quiet', L.lastLoggedMessage)
+        self.assertEqual(buf.getvalue(), '')
+
+    def test_filtered_record_does_not_consume_countConstraint(self):
+        L, buf = self._make()
+        L.debug('once', countConstraint=1)
+        L.set_log_type_flags('debug', stdoutFlag=True, fileFlag=False)
+        L.debug('once', countConstraint=1)
+        self.assertEqual(buf.getvalue().count('once'), 1)
+
+    def test_set_last_logged_filtered_at_runtime(self):
+        L, _ = self._make()
+        L.update(lastLoggedFiltered=True)
+        self.assertTrue(L.lastLoggedFiltered)
+        self.assertTrue(L.parameters['lastLoggedFiltered'])
+        L.debug('now-recorded')
+        self.assertIn('now-recorded', L.lastLoggedDebug)
+        with self.assertRaises(TypeError):
+            L.set_last_logged_filtered('yes')
+
+    def test_undefined_log_type_raises(self):
+        L, _ = self._make()
+        with self.assertRaises(ValueError):
+            L.log('no-such-type', 'msg')
+
+    def test_filtered_callable_message_raises(self):
+        L, _ = self._make()
+        with self.assertRaises(TypeError):
+            L.debug(lambda: 'expensive')
+        with self.assertRaises(TypeError):
+            L.log('debug', len)
+
+
 # ═══════════════════════════════════════════════════════════════════════════
 # 5 — Stdout sink
 # ═══════════════════════════════════════════════════════════════════════════
@@ -586,7 +749,7 @@ class TestUserSinkLevelFilter(unittest.TestCase):
 
 class TestRebuildActiveSinks(unittest.TestCase):
     """
-    Accesses _Logger__activeSinks directly (name-mangled) to verify the
+    Accesses _Logger__sinkTable directly (name-mangled) to verify the
     cache structure is correct after configuration changes.
 
     These tests prove that __rebuild_active_sinks uses the enabled flag,
@@ -595,7 +758,7 @@ class TestRebuildActiveSinks(unittest.TestCase):
 
     def _active(self, logger, log_type):
         """Return the list of active _Sink objects for a given log type."""
-        return logger._Logger__activeSinks.get(log_type, [])
+        return logger._Logger__sinkTable.active.get(log_type, ())
 
     def test_disabled_user_sink_absent_from_cache(self):
         L, _ = make_logger(logToStdout=False)
@@ -1102,6 +1265,22 @@ class TestFlushAtexit(unittest.TestCase):
         L.flush()  # must not hang or raise
         self.assertEqual(len(sink.lines), 3)
 
+    def test_second_call_is_harmless(self):
+        tmp = tempfile.mkdtemp()
+        try:
+            L = Logger(name='x', logToStdout=False,
+                       logFileBasename=os.path.join(tmp, 'twice'))
+            L.info('first')
+            L._flush_atexit_logfile()
+            L._flush_atexit_logfile()
+            L.info('reopened')
+            L._flush_atexit_logfile()
+            with open(L.logFileName) as fd:
+                self.assertEqual(fd.read().count('\n'), 2)
+        finally:
+            import shutil
+            shutil.rmtree(tmp, ignore_errors=True)
+
 
 # ═══════════════════════════════════════════════════════════════════════════
 # 22 — Custom log types
@@ -1143,6 +1322,1863 @@ class TestCustomLogTypes(unittest.TestCase):
         self.assertLess(lvls['error'], lvls['critical'])
 
 
+# ═══════════════════════════════════════════════════════════════════════════
+# 23 — Durability
+# ═══════════════════════════════════════════════════════════════════════════
+
+class _FileBackedSink(_CaptureSink):
+    """Capture sink exposing a real file descriptor and counting flushes."""
+
+    def __init__(self):
+        super().__init__()
+        self._tmp    = tempfile.TemporaryFile()
+        self.flushes = 0
+
+    def flush(self):
+        self.flushes += 1
+
+    def fileno(self):
+        return self._tmp.fileno()
+
+
+class TestDurability(unittest.TestCase):
+    """Per-record flush/fsync behaviour selected by set_durability()."""
+
+    def setUp(self):
+        self.L, _ = make_logger(logToStdout=False)
+        self.sink = _FileBackedSink()
+        self.L.add_sink('disk', self.sink)
+
+    def _fsyncs(self, messages):
+        with mock.patch('SimpleLog.os.fsync') as fsync:
+            for logType, text in messages:
+                self.L.log(logType, text)
+        return fsync.call_count
+
+    def test_default_fsyncs_every_record(self):
+        self.assertEqual(self.L.durability, 'fsync')
+        self.assertEqual(self._fsyncs([('info', 'a'), ('info', 'b')]), 2)
+        self.assertEqual(self.sink.flushes, 2)
+
+    def test_none_neither_flushes_nor_fsyncs(self):
+        self.L.set_durability('none')
+        self.assertEqual(self._fsyncs([('info', 'a'), ('error', 'b')]), 0)
+        self.assertEqual(self.sink.flushes, 0)
+
+    def test_flush_only(self):
+        self.L.set_durability('flush')
+        self.assertEqual(self._fsyncs([('info', 'a'), ('error', 'b')]), 0)
+        self.assertEqual(self.sink.flushes, 2)
+
+    def test_fsync_every_n_records(self):
+        self.L.set_durability('flush', fsyncEvery=3)
+        self.assertEqual(self._fsyncs([('info', str(i)) for i in range(7)]), 2)
+
+    def test_fsync_on_level(self):
+        self.L.set_durability('flush', fsyncLevel='error')
+        msgs = [('debug', 'a'), ('info', 'b'), ('error', 'c'), ('critical', 'd')]
+        self.assertEqual(self._fsyncs(msgs), 2)
+
+    def test_fsync_interval(self):
+        self.L.set_durability('flush', fsyncInterval=3600)
+        self.assertEqual(self._fsyncs([('info', 'a'), ('info', 'b')]), 0)
+        self.L.sinks['disk'].lastSync -= 7200
+        self.assertEqual(self._fsyncs([('info', 'c')]), 1)
+
+    def test_per_sink_override(self):
+        self.L.set_durability('none')
+        self.L.set_durability('fsync', sinks=['disk'])
+        self.assertEqual(self._fsyncs([('info', 'a')]), 1)
+        other = _FileBackedSink()
+        self.L.add_sink('other', other, durability='flush')
+        self.L.info('b')
+        self.assertEqual(other.flushes, 1)
+        self.assertEqual(self.L.parameters['userSinks']['other']['durability'], 'flush')
+
+    def test_flush_false_disables_durability(self):
+        self.L.set_flush(False)
+        self.assertEqual(self._fsyncs([('error', 'a')]), 0)
+        self.assertEqual(self.sink.flushes, 0)
+
+    def test_invalid_settings_raise(self):
+        with self.assertRaises(ValueError):
+            self.L.set_durability('sometimes')
+        with self.assertRaises(ValueError):
+            self.L.set_durability('fsync', fsyncEvery=10)
+        with self.assertRaises(ValueError):
+            self.L.set_durability('flush', fsyncLevel='no-such-type')
+        with self.assertRaises(ValueError):
+            self.L.set_durability('flush', sinks=['missing'])
+        with self.assertRaises(TypeError):
+            self.L.set_durability('flush', fsyncEvery=1.5)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# 24 — Timestamp cache
+# ═══════════════════════════════════════════════════════════════════════════
+
+try:
+    import pytz
+except ImportError:
+    pytz = None
+
+
+class TestTimestampCache(unittest.TestCase):
+    """_get_datetimestamp() recomputes strftime only when the second changes."""
+
+    def setUp(self):
+        self.L, _ = make_logger()
+
+    def test_matches_strftime(self):
+        ts = 1700000000.75
+        expected = datetime.fromtimestamp(ts).strftime('%Y-%m-%d %H:%M:%S')
+        self.assertEqual(self.L._get_datetimestamp(timestamp=ts), expected)
+
+    def test_strftime_runs_once_per_second(self):
+        with mock.patch('SimpleLog.datetime', wraps=datetime) as dt:
+            first  = self.L._get_datetimestamp(timestamp=1700000000.1)
+            second = self.L._get_datetimestamp(timestamp=1700000000.9)
+            self.assertEqual(dt.strftime.call_count, 1)
+            third  = self.L._get_datetimestamp(timestamp=1700000001.0)
+            self.assertEqual(dt.strftime.call_count, 2)
+        self.assertEqual(first, second)
+        self.assertNotEqual(second, third)
+
+    def test_format_change_invalidates(self):
+        a = self.L._get_datetimestamp(timestamp=1700000000.0)
+        b = self.L._get_datetimestamp(format='%H:%M:%S', timestamp=1700000000.0)
+        self.assertEqual(len(b), 8)
+        self.assertNotEqual(a, b)
+
+    def test_fractional_digits(self):
+        self.L.set_timestamp_precision(3)
+        self.assertTrue(self.L._get_datetimestamp(timestamp=1700000000.25).endswith('.250'))
+        self.L.update(timestampPrecision=6)
+        self.assertTrue(self.L._get_datetimestamp(timestamp=1700000000.5).endswith('.500000'))
+        self.assertEqual(self.L.parameters['timestampPrecision'], 6)
+
+    def test_percent_f_bypasses_cache(self):
+        text = self.L._get_datetimestamp(format='%S.%f', timestamp=1700000000.5)
+        self.assertTrue(text.endswith('.500000'))
+
+    def test_invalid_precision_raises(self):
+        with self.assertRaises(ValueError):
+            self.L.set_timestamp_precision(7)
+        with self.assertRaises(TypeError):
+            self.L.set_timestamp_precision(1.5)
+
+    @unittest.skipIf(pytz is None, 'pytz not installed')
+    def test_set_timezone_invalidates(self):
+        ts = 1700000000.0
+        self.L._get_datetimestamp(timestamp=ts)
+        self.L.set_timezone('Asia/Tokyo')
+        expected = datetime.fromtimestamp(ts, pytz.timezone('Asia/Tokyo')).strftime('%Y-%m-%d %H:%M:%S')
+        self.assertEqual(self.L._get_datetimestamp(timestamp=ts), expected)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# 25 — Precompiled header templates
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestHeaderTemplates(unittest.TestCase):
+    """Cached header prefixes must be invalidated by every name change."""
+
+    def setUp(self):
+        self.L, self.buf = make_logger(name='svc')
+
+    def _header(self, logType):
+        return self.L._get_header(logType, '')
+
+    def test_default_header_layout(self):
+        self.assertTrue(self._header('info').endswith(' - svc <INFO> '))
+
+    def test_set_name_updates_header(self):
+        self.L.set_name('renamed')
+        self.assertTrue(self._header('warn').endswith(' - renamed <WARNING> '))
+
+    def test_set_log_type_name_updates_header(self):
+        self.L.set_log_type_name('info', 'NOTE')
+        self.L.info('hello')
+        self.assertIn(' - svc <NOTE> hello', self.buf.getvalue())
+
+    def test_update_and_add_log_type(self):
+        self.L.update_log_type('error', name='FAIL')
+        self.L.add_log_type('trace', name='TRACE', level=1)
+        self.assertTrue(self._header('error').endswith('<FAIL> '))
+        self.assertTrue(self._header('trace').endswith('<TRACE> '))
+
+    def test_record_with_all_fields(self):
+        self.L.info('msg', data='payload', tback='tb-line')
+        self.assertIn('<INFO> msg\npayload\ntb-line', self.buf.getvalue())
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# 26 — Frame-walking caller info
+# ═══════════════════════════════════════════════════════════════════════════
+
+def _log_through_helper(L, message):
+    L.info(message)
+
+
+class TestCallerFrameWalk(unittest.TestCase):
+    """callerInfo must name the user frame without inspect.stack()."""
+
+    def _line_of(self, marker):
+        with open(__file__) as fd:
+            for number, line in enumerate(fd, 1):
+                if marker in line and 'def ' not in line:
+                    return number
+
+    def test_reports_calling_line_and_function(self):
+        L, buf = make_logger(callerInfo=True)
+        L.info('here')  # caller-marker-1
+        tag = '[test_logger.py:%d in test_reports_calling_line_and_function]' % self._line_of('caller-marker-1')
+        self.assertIn(tag + ' here', buf.getvalue())
+
+    def test_offset_skips_wrapper_frame(self):
+        L, buf = make_logger(callerInfo=True, callerOffset=1)
+        _log_through_helper(L, 'wrapped')  # caller-marker-2
+        tag = '[test_logger.py:%d in test_offset_skips_wrapper_frame]' % self._line_of('caller-marker-2')
+        self.assertIn(tag, buf.getvalue())
+
+    def test_zero_offset_reports_wrapper(self):
+        L, buf = make_logger(callerInfo=True)
+        _log_through_helper(L, 'wrapped')
+        self.assertIn('in _log_through_helper]', buf.getvalue())
+
+    def test_bound_logger_reports_user_frame(self):
+        L, buf = make_logger(callerInfo=True)
+        L.bind(req='1').warn('bound')
+        self.assertIn('in test_bound_logger_reports_user_frame]', buf.getvalue())
+
+    def test_same_site_reuses_cached_string(self):
+        L, buf = make_logger(callerInfo=True)
+        tags = []
+        for _ in range(2):
+            L.info('loop')
+            tags.append(_get_caller_str())
+        self.assertIs(tags[0], tags[1])
+
+    def test_inspect_stack_not_used(self):
+        L, buf = make_logger(callerInfo=True)
+        with mock.patch('SimpleLog.inspect.stack', side_effect=AssertionError):
+            L.info('no stack')
+        self.assertIn('no stack', buf.getvalue())
+
+    def test_set_caller_offset_validation(self):
+        L, _ = make_logger()
+        with self.assertRaises(TypeError):
+            L.set_caller_offset(1.5)
+        with self.assertRaises(ValueError):
+            L.set_caller_offset(-1)
+        L.update(callerOffset=2)
+        self.assertEqual(L.callerOffset, 2)
+        self.assertEqual(L.parameters['callerOffset'], 2)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# 27 — Incremental rotation index
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestRotationIndex(unittest.TestCase):
+    """Rotation must not list the log directory once the index is seeded."""
+
+    def setUp(self):
+        self.tmp  = tempfile.mkdtemp()
+        self.base = os.path.join(self.tmp, 'rot')
+        # unrelated neighbours, including near-miss names
+        for name in ('other.log', 'rot.txt', 'rot_x.log', 'rotator_1.log'):
+            open(os.path.join(self.tmp, name), 'w').close()
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _make(self, **kwargs):
+        return Logger(name='rot', logToStdout=False, logFileBasename=self.base,
+                      logFileMaxSize=0.0005, durability='none', **kwargs)
+
+    def _numbers(self):
+        return sorted(int(f[len('rot_'):-len('.log')])
+                      for f in os.listdir(self.tmp)
+                      if f.startswith('rot_') and f[4:-4].isdigit())
+
+    def test_directory_listed_once(self):
+        L = self._make()
+        with mock.patch('SimpleLog.os.scandir', wraps=os.scandir) as scan:
+            for _ in range(60):
+                L.info('x' * 100)
+            L.flush()
+        self.assertGreater(len(self._numbers()), 3)
+        self.assertEqual(scan.call_count, 0)
+
+    def test_numbers_contiguous_and_neighbours_untouched(self):
+        L = self._make(logFileRoll=3)
+        for _ in range(60):
+            L.info('x' * 100)
+        L.flush()
+        numbers = self._numbers()
+        self.assertEqual(len(numbers), 3)
+        self.assertEqual(numbers, list(range(numbers[0], numbers[0] + 3)))
+        for name in ('other.log', 'rot.txt', 'rot_x.log', 'rotator_1.log'):
+            self.assertTrue(os.path.exists(os.path.join(self.tmp, name)))
+
+    def test_seeded_from_existing_files(self):
+        for n in (4, 5):
+            with open('%s_%d.log' % (self.base, n), 'w') as fd:
+                fd.write('x' * 1024)
+        L = self._make()
+        self.assertEqual(L.logFileName, '%s_6.log' % self.base)
+
+    def test_external_deletion_triggers_rescan(self):
+        L = self._make(logFileRoll=2)
+        for _ in range(30):
+            L.info('x' * 100)
+        for f in glob.glob(self.base + '_*.log'):
+            os.remove(f)
+        with mock.patch('SimpleLog.os.scandir', wraps=os.scandir) as scan:
+            # fill the now-unlinked current file until it rotates
+            for _ in range(10):
+                L.info('x' * 100)
+            L.flush()
+        # one rescan, after which numbering restarts from the first number
+        self.assertEqual(scan.call_count, 1)
+        self.assertEqual(self._numbers()[0], 0)
+        self.assertEqual(L.logFileName, '%s_%d.log' % (self.base, self._numbers()[-1]))
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# 28 — Byte-counted rotation
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestByteRotation(unittest.TestCase):
+    """Rotation compares a byte counter with an integer threshold."""
+
+    def setUp(self):
+        self.tmp  = tempfile.mkdtemp()
+        self.base = os.path.join(self.tmp, 'bytes')
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _make(self, **kwargs):
+        return Logger(name='b', logToStdout=False, logFileBasename=self.base,
+                      durability='none', **kwargs)
+
+    def test_size_strings(self):
+        L = self._make()
+        for size, expected in (('512KB', 512 * 1024), ('2 mb', 2 * 1024 ** 2),
+                               ('1.5G', int(1.5 * 1024 ** 3)), ('100B', 100)):
+            L.set_log_file_maximum_size(size)
+            self.assertEqual(L.logFileMaxBytes, expected)
+            self.assertEqual(L.logFileMaxSize, expected / 1024. ** 2)
+        L.set_log_file_maximum_size(3)
+        self.assertEqual(L.logFileMaxBytes, 3 * 1024 ** 2)
+        L.set_log_file_maximum_size('0KB')
+        self.assertIsNone(L.logFileMaxBytes)
+        with self.assertRaises(ValueError):
+            L.set_log_file_maximum_size('10 parsecs')
+        with self.assertRaises(TypeError):
+            L.set_log_file_maximum_size([10])
+
+    def test_rotates_on_byte_threshold_without_tell(self):
+        class NoTell(object):
+            def __init__(self, stream):
+                self.stream = stream
+            def tell(self):
+                raise AssertionError('tell() called')
+            def __getattr__(self, name):
+                return getattr(self.stream, name)
+
+        L = self._make(logFileMaxSize='1KB')
+        L.info('seed')
+        L._Logger__logFileStream = NoTell(L._Logger__logFileStream)
+        for _ in range(40):
+            L.info('x' * 100)
+        L.flush()
+        sizes = [os.path.getsize(f) for f in sorted(glob.glob(self.base + '_*.log'))]
+        self.assertGreater(len(sizes), 2)
+        for size in sizes[:-1]:
+            self.assertGreaterEqual(size, 1024)
+            self.assertLess(size, 1024 + 200)
+
+    def test_counter_seeded_from_existing_file(self):
+        with open(self.base + '_0.log', 'w') as fd:
+            fd.write('y' * 900)
+        L = self._make(logFileMaxSize='1KB')
+        for _ in range(2):
+            L.info('x' * 100)
+        L.flush()
+        # 900 + one record crosses 1 KB, so the second record rotates
+        self.assertTrue(os.path.exists(self.base + '_1.log'))
+
+    def test_non_ascii_counted_in_bytes(self):
+        L = self._make(logFileMaxSize='1KB')
+        for _ in range(12):
+            L.info('\u00e9' * 50)   # 100 bytes in UTF-8, 50 characters
+        L.flush()
+        self.assertTrue(os.path.exists(self.base + '_1.log'))
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# 29 — Time-based rotation policies
+# ═══════════════════════════════════════════════════════════════════════════
+
+class _FakeClock(object):
+    """Injectable clock returning a settable epoch."""
+
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class TestRotationPolicy(unittest.TestCase):
+    """RotationPolicy triggers are checked against a precomputed epoch."""
+
+    # 2023-11-14 22:13:20 UTC
+    T0 = 1700000000
+
+    def setUp(self):
+        self.tmp   = tempfile.mkdtemp()
+        self.base  = os.path.join(self.tmp, 'timed')
+        self.clock = _FakeClock(self.T0)
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _make(self, **kwargs):
+        policyArgs = dict(clock=self.clock)
+        policyArgs.update(kwargs.pop('policy', {}))
+        return Logger(name='t', logToStdout=False, logFileBasename=self.base,
+                      durability='none', rotationPolicy=RotationPolicy(**policyArgs),
+                      **kwargs)
+
+    def _files(self):
+        return sorted(glob.glob(self.base + '*.log'))
+
+    def test_next_rollover_aligned_to_timezone(self):
+        tokyo = timezone(timedelta(hours=9))
+        hourly = RotationPolicy(when='hour')
+        daily  = RotationPolicy(when='midnight')
+        # 2023-11-15 07:13:20 in UTC+9
+        self.assertEqual(hourly.next_rollover(self.T0, tokyo),
+                         datetime(2023, 11, 15, 8, tzinfo=tokyo).timestamp())
+        self.assertEqual(daily.next_rollover(self.T0, tokyo),
+                         datetime(2023, 11, 16, tzinfo=tokyo).timestamp())
+        self.assertEqual(RotationPolicy(when='minute', interval=15).next_rollover(self.T0, tokyo),
+                         datetime(2023, 11, 15, 7, 28, tzinfo=tokyo).timestamp())
+        local = datetime.fromtimestamp(self.T0).replace(minute=0, second=0) + timedelta(hours=1)
+        self.assertEqual(hourly.next_rollover(self.T0), local.timestamp())
+        self.assertIsNone(RotationPolicy(maxSize=5).next_rollover(self.T0))
+
+    def test_hourly_rotation(self):
+        L = self._make(policy=dict(when='hour'))
+        L.info('a')
+        boundary = L.nextRollover
+        self.clock.now = boundary - 1
+        L.info('b'); L.flush()
+        self.assertEqual(len(self._files()), 1)
+        self.clock.now = boundary
+        L.info('c'); L.flush()
+        files = self._files()
+        self.assertEqual(len(files), 2)
+        with open(files[-1]) as fd:
+            self.assertEqual(fd.read().count('\n'), 1)
+        self.assertEqual(L.nextRollover, boundary + 3600)
+
+    def test_hybrid_size_or_time(self):
+        L = self._make(policy=dict(maxSize='1KB', when='day'))
+        self.assertEqual(L.logFileMaxBytes, 1024)
+        for _ in range(20):
+            L.info('x' * 100)
+        sizeRotated = len(self._files())
+        self.assertGreater(sizeRotated, 1)
+        self.clock.now = L.nextRollover
+        L.info('next day'); L.flush()
+        self.assertEqual(len(self._files()), sizeRotated + 1)
+
+    def test_empty_period_does_not_rotate(self):
+        L = self._make(policy=dict(when='hour'))
+        self.clock.now += 5 * 3600   # nothing logged for five hours
+        L.info('first'); L.flush()
+        self.assertEqual(len(self._files()), 1)
+
+    def test_leftover_file_from_earlier_period(self):
+        with open(self.base + '.log', 'w') as fd:
+            fd.write('yesterday\n')
+        os.utime(self.base + '.log', (self.T0 - 86400, self.T0 - 86400))
+        L = self._make(policy=dict(when='day'))
+        L.info('today'); L.flush()
+        files = self._files()
+        self.assertEqual(len(files), 2)
+        with open(L.logFileName) as fd:
+            self.assertEqual(fd.read().count('today'), 1)
+
+    def test_reopened_file_age_read_on_rotation_clock(self):
+        with open(self.base + '.log', 'w') as fd:
+            fd.write('just now\n')
+        # the rotation clock runs ten days ahead of the file system
+        self.clock.now = time.time() + 10 * 86400
+        L = self._make(policy=dict(when='hour'))
+        L.info('same period'); L.flush()
+        self.assertEqual(len(self._files()), 1)
+        self.assertAlmostEqual(L._Logger__rolloverBase, self.clock.now, delta=60)
+
+    def test_roll_limit_applies(self):
+        L = self._make(policy=dict(when='hour'), logFileRoll=2)
+        for _ in range(5):
+            L.info('tick')
+            self.clock.now = L.nextRollover
+        L.flush()
+        self.assertEqual(len(self._files()), 2)
+
+    def test_set_and_remove_policy(self):
+        L = Logger(name='t', logToStdout=False, logFileBasename=self.base, durability='none')
+        L.info('open')
+        L.update(rotationPolicy=RotationPolicy(when='hour', clock=self.clock))
+        self.assertEqual(L.nextRollover, RotationPolicy(when='hour').next_rollover(self.T0))
+        self.assertIs(L.parameters['rotationPolicy'], L.rotationPolicy)
+        L.set_rotation_policy(None)
+        self.assertIsNone(L.nextRollover)
+        with self.assertRaises(TypeError):
+            L.set_rotation_policy('hourly')
+
+    def test_policy_validation(self):
+        with self.assertRaises(ValueError):
+            RotationPolicy(when='fortnight')
+        with self.assertRaises(ValueError):
+            RotationPolicy(when='hour', interval=0)
+        with self.assertRaises(TypeError):
+            RotationPolicy(clock=42)
+        with self.assertRaises(ValueError):
+            RotationPolicy(maxSize='big')
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# 30 — Compression of rotated files
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestCompression(unittest.TestCase):
+    """Rotated files are compressed off the logging path and still rolled."""
+
+    def setUp(self):
+        self.tmp  = tempfile.mkdtemp()
+        self.base = os.path.join(self.tmp, 'packed')
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _make(self, **kwargs):
+        kwargs.setdefault('logFileMaxSize', '1KB')
+        return Logger(name='c', logToStdout=False, logFileBasename=self.base,
+                      durability='none', **kwargs)
+
+    def _wait(self, L):
+        deadline = time.time() + 10
+        while L.pendingCompressions and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(L.pendingCompressions, 0)
+
+    def _names(self):
+        return sorted(os.listdir(self.tmp))
+
+    def test_rotated_files_gzipped(self):
+        L = self._make(compression='gzip')
+        for i in range(40):
+            L.info('record %03d %s' % (i, 'x' * 80))
+        L.flush()
+        self._wait(L)
+        names = [n for n in self._names() if not n.endswith('.lock')]
+        current = os.path.basename(L.logFileName)
+        self.assertIn(current, names)
+        rotated = [n for n in names if n != current]
+        self.assertGreater(len(rotated), 1)
+        self.assertTrue(all(n.endswith('.log.gz') for n in rotated), names)
+        content = ''
+        for n in sorted(rotated, key=lambda n: int(n.split('_')[1].split('.')[0])):
+            with gzip.open(os.path.join(self.tmp, n), 'rt') as fd:
+                content += fd.read()
+        with open(L.logFileName) as fd:
+            content += fd.read()
+        self.assertEqual([int(l.split('record ')[1][:3]) for l in content.splitlines()],
+                         list(range(40)))
+
+    def test_roll_counts_compressed_files(self):
+        L = self._make(compression='gzip', logFileRoll=3)
+        for i in range(80):
+            L.info('record %03d %s' % (i, 'x' * 80))
+            if i % 10 == 0:
+                self._wait(L)
+        L.flush()
+        self._wait(L)
+        self.assertLessEqual(len(glob.glob(self.base + '*.log*')), 3)
+        self.assertEqual(glob.glob(self.base + '*.tmp'), [])
+
+    def test_restart_skips_compressed_newest(self):
+        for n in range(2):
+            with gzip.open('%s_%d.log.gz' % (self.base, n), 'wt') as fd:
+                fd.write('old %d\n' % n)
+        L = self._make(logFileMaxSize=None, compression='gzip', logFileRoll=2)
+        L.info('after restart'); L.flush()
+        self.assertTrue(L.logFileName.endswith('_2.log'))
+        self.assertEqual(self._names(), ['packed_1.log.gz', 'packed_2.log'])
+
+    def test_leftover_files_compressed_on_listing(self):
+        for n in range(3):
+            with open('%s_%d.log' % (self.base, n), 'w') as fd:
+                fd.write('old %d\n' % n)
+        L = self._make(compression='bz2')
+        L.info('new'); L.flush()
+        self._wait(L)
+        self.assertTrue(L.logFileName.endswith('_2.log'))
+        self.assertEqual(sorted(glob.glob(self.base + '*.bz2')),
+                         ['%s_%d.log.bz2' % (self.base, n) for n in range(2)])
+
+    def test_lzma_suffix(self):
+        L = self._make(compression='lzma', compressionJobs=2)
+        for i in range(20):
+            L.info('x' * 100)
+        L.flush()
+        self._wait(L)
+        self.assertTrue(glob.glob(self.base + '*.log.xz'))
+
+    def test_set_compression_and_parameters(self):
+        L = self._make()
+        self.assertIsNone(L.compression)
+        L.update(compression='gzip', compressionJobs=3)
+        self.assertEqual((L.compression, L.compressionJobs), ('gzip', 3))
+        self.assertEqual(L.parameters['compression'], 'gzip')
+        self.assertIn('Compression (gzip)', str(L))
+        L.set_compression(None)
+        self.assertIsNone(L.compression)
+        self.assertEqual(L.compressionJobs, 3)
+
+    def test_validation(self):
+        L = self._make()
+        with self.assertRaises(ValueError):
+            L.set_compression('zip')
+        with self.assertRaises(TypeError):
+            L.set_compression(True)
+        with self.assertRaises(ValueError):
+            L.set_compression('gzip', compressionJobs=0)
+        with self.assertRaises(TypeError):
+            L.set_compression('gzip', compressionJobs=1.5)
+
+    @unittest.skipIf(SimpleLog.fcntl is None, 'multiprocess mode needs fcntl')
+    def test_multiprocess_excluded(self):
+        L = self._make(compression='gzip')
+        with self.assertRaises(ValueError):
+            L.set_multiprocess(True)
+        L.set_compression(None)
+        L.set_multiprocess(True)
+        with self.assertRaises(ValueError):
+            L.set_compression('gzip')
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# 31 — Binary buffered file mode
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestBinaryFileMode(unittest.TestCase):
+    """fileMode='binary' writes UTF-8 through a large buffer."""
+
+    def setUp(self):
+        self.tmp  = tempfile.mkdtemp()
+        self.base = os.path.join(self.tmp, 'bin')
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _make(self, **kwargs):
+        return Logger(name='b', logToStdout=False, logFileBasename=self.base,
+                      fileMode='binary', **kwargs)
+
+    def test_records_buffered_until_flush(self):
+        L = self._make(durability='none', fileBufferSize='64KB')
+        L.info('buffered')
+        self.assertEqual(os.path.getsize(L.logFileName), 0)
+        L.flush()
+        with open(L.logFileName, encoding='utf-8') as fd:
+            self.assertIn('buffered', fd.read())
+
+    def test_fsync_durability_writes_every_record(self):
+        L = self._make()
+        L.info('durable')
+        with open(L.logFileName, encoding='utf-8') as fd:
+            self.assertIn('durable', fd.read())
+
+    def test_utf8_bytes_counted_exactly(self):
+        L = self._make(durability='none', logFileMaxSize='1KB')
+        for i in range(30):
+            L.info('%02d %s' % (i, '\u00e9' * 50))   # 100 bytes of text
+        L.flush()
+        files = sorted(glob.glob(self.base + '*.log'),
+                       key=lambda p: int(p.rsplit('_', 1)[1].split('.')[0]))
+        self.assertGreater(len(files), 2)
+        records = []
+        for path in files[:-1]:
+            size = os.path.getsize(path)
+            self.assertGreaterEqual(size, 1024)
+            self.assertLess(size, 1024 + 200)
+        for path in files:
+            with open(path, encoding='utf-8') as fd:
+                records.extend(l.split('<INFO> ')[1][:2] for l in fd.read().splitlines())
+        self.assertEqual(records, ['%02d' % i for i in range(30)])
+
+    def test_chunks_keep_record_bytes(self):
+        L = self._make(durability='none', fileBufferSize=1024, logFileMaxSize=None)
+        messages = ['%03d %s' % (i, 'éx' * (i % 7 * 40)) for i in range(200)]
+        for message in messages:
+            L.info(message)
+        L.flush()
+        with open(L.logFileName, 'rb') as fd:
+            data = fd.read()
+        self.assertEqual(len(data), L._Logger__logFileBytes)
+        lines = data.decode('utf-8').split('\n')[:-1]
+        self.assertEqual([l.split('<INFO> ')[1] for l in lines], messages)
+
+    def test_switch_mode_at_runtime(self):
+        L = Logger(name='b', logToStdout=False, logFileBasename=self.base, durability='none')
+        L.info('as text')
+        L.set_file_mode('binary', fileBufferSize=4096)
+        L.info('as bytes')
+        L.update(fileMode='text')
+        L.info('text again')
+        L.flush()
+        with open(L.logFileName, encoding='utf-8') as fd:
+            lines = fd.read().splitlines()
+        self.assertEqual([l.split('<INFO> ')[1] for l in lines],
+                         ['as text', 'as bytes', 'text again'])
+        self.assertEqual((L.fileMode, L.fileBufferSize), ('text', 4096))
+        self.assertEqual(L.parameters['fileBufferSize'], 4096)
+
+    def test_validation(self):
+        L = self._make()
+        with self.assertRaises(ValueError):
+            L.set_file_mode('raw')
+        with self.assertRaises(TypeError):
+            L.set_file_mode(1)
+        with self.assertRaises(ValueError):
+            L.set_file_mode('binary', fileBufferSize=0)
+        with self.assertRaises(TypeError):
+            L.set_file_mode('binary', fileBufferSize=1.5)
+        with self.assertRaises(ValueError):
+            L.set_file_mode('binary', fileBufferSize='lots')
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# 32 — Memory-mapped file segments
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestMmapFileMode(unittest.TestCase):
+    """fileMode='mmap' preallocates segments and truncates them when done."""
+
+    def setUp(self):
+        self.tmp  = tempfile.mkdtemp()
+        self.base = os.path.join(self.tmp, 'seg')
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _make(self, **kwargs):
+        kwargs.setdefault('logFileMaxSize', '4KB')
+        return Logger(name='m', logToStdout=False, logFileBasename=self.base,
+                      durability='none', fileMode='mmap', **kwargs)
+
+    def _read(self, path):
+        with open(path, 'rb') as fd:
+            return fd.read()
+
+    def test_segment_preallocated_then_truncated(self):
+        L = self._make()
+        L.info('first')
+        L.flush()
+        self.assertEqual(os.path.getsize(L.logFileName), 4096)
+        self.assertTrue(self._read(L.logFileName).rstrip(b'\0').endswith(b'first\n'))
+        L._flush_atexit_logfile()
+        data = self._read(L.logFileName)
+        self.assertNotIn(b'\0', data)
+        self.assertTrue(data.endswith(b'first\n'))
+
+    def test_rotation_truncates_previous_segment(self):
+        L = self._make()
+        for i in range(120):
+            L.info('record %03d %s' % (i, 'x' * 60))
+        L._flush_atexit_logfile()
+        files = sorted(glob.glob(self.base + '*.log'),
+                       key=lambda p: int(p.rsplit('_', 1)[1].split('.')[0]))
+        self.assertGreater(len(files), 2)
+        records = []
+        for path in files:
+            data = self._read(path)
+            self.assertNotIn(b'\0', data)
+            records.extend(l.split(b'record ')[1][:3] for l in data.splitlines())
+        for path in files[:-1]:
+            self.assertGreaterEqual(os.path.getsize(path), 4096)
+            self.assertLess(os.path.getsize(path), 4096 + 200)
+        self.assertEqual([int(r) for r in records], list(range(120)))
+
+    def test_growth_without_size_limit(self):
+        L = self._make(logFileMaxSize=None, fileBufferSize=1024)
+        for i in range(50):
+            L.info('x' * 100)
+        L._flush_atexit_logfile()
+        self.assertEqual(len(glob.glob(self.base + '*.log')), 1)
+        self.assertEqual(self._read(L.logFileName).count(b'\n'), 50)
+
+    def test_padded_segment_resumed(self):
+        path = self.base + '_0.log'
+        with open(path, 'wb') as fd:
+            fd.write(b'before crash\n' + b'\0' * 4083)    # padded to 4096
+        L = self._make()
+        L.info('after restart')
+        L._flush_atexit_logfile()
+        self.assertEqual(L.logFileName, path)
+        lines = self._read(path).splitlines()
+        self.assertEqual(lines[0], b'before crash')
+        self.assertTrue(lines[1].endswith(b'after restart'))
+        self.assertEqual(len(lines), 2)
+
+    @unittest.skipUnless(hasattr(os, 'fork'), 'needs fork()')
+    def test_killed_process_recovered(self):
+        pid = os.fork()
+        if pid == 0:   # child: log, then die without closing anything
+            try:
+                L = self._make()
+                for i in range(10):
+                    L.info('child %d' % i)
+            finally:
+                os._exit(0)
+        os.waitpid(pid, 0)
+        path = self.base + '_0.log'
+        self.assertEqual(os.path.getsize(path), 4096)
+        L = self._make()
+        L.info('parent')
+        L._flush_atexit_logfile()
+        lines = self._read(path).splitlines()
+        self.assertEqual(len(lines), 11)
+        self.assertNotIn(b'\0', b''.join(lines))
+        self.assertTrue(lines[-1].endswith(b'parent'))
+
+    def test_roll_limit(self):
+        L = self._make(logFileRoll=2)
+        for i in range(200):
+            L.info('x' * 100)
+        L._flush_atexit_logfile()
+        self.assertEqual(len(glob.glob(self.base + '*.log')), 2)
+
+    @unittest.skipIf(SimpleLog.fcntl is None, 'multiprocess mode needs fcntl')
+    def test_multiprocess_excluded(self):
+        L = self._make()
+        with self.assertRaises(ValueError):
+            L.set_multiprocess(True)
+        L.set_file_mode('text')
+        L.set_multiprocess(True)
+        with self.assertRaises(ValueError):
+            L.set_file_mode('mmap')
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# 33 — JSON records
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestJsonRecords(unittest.TestCase):
+    """recordFormat='json' writes one parseable JSON object per line."""
+
+    def setUp(self):
+        self.L, self.buf = make_logger(recordFormat='json')
+
+    def records(self):
+        # NDJSON lines end at '\n' only; str.splitlines() also splits U+2028
+        return [json.loads(line) for line in self.buf.getvalue().split('\n') if line]
+
+    def test_plain_record_members(self):
+        self.L.info('hello')
+        record, = self.records()
+        self.assertEqual(sorted(record), ['level', 'logType', 'logger', 'message', 'timestamp'])
+        self.assertEqual((record['logger'], record['logType'], record['level'], record['message']),
+                         (self.L.name, 'info', 10, 'hello'))
+        self.assertEqual(record['timestamp'], self.L._get_datetimestamp()[:len(record['timestamp'])])
+
+    def test_escaping(self):
+        message = 'quote " backslash \\ tab \t newline \n unicode \u00e9\u4e2d \u2028'
+        self.L.info(message)
+        self.assertEqual(self.buf.getvalue().count('\n'), 1)
+        self.assertEqual(self.records()[0]['message'], message)
+
+    def test_bound_context_member(self):
+        bound = self.L.bind(requestId='abc', attempt=2)
+        bound.warn('slow')
+        bound.bind(table='orders').force_log('debug', 'forced', stdout=True, file=False)
+        first, second = self.records()
+        self.assertEqual(first['message'], 'slow')
+        self.assertEqual(first['context'], {'requestId': 'abc', 'attempt': 2})
+        self.assertEqual(second['context'], {'requestId': 'abc', 'attempt': 2, 'table': 'orders'})
+
+    def test_data_traceback_and_caller(self):
+        self.L.set_caller_info(True)
+        self.L.error('failed', data={'ids': [1, 2], 'when': datetime(2024, 1, 1)},
+                     tback=[('app.py', 3, 'main', 'run()')])
+        record, = self.records()
+        self.assertEqual(record['data'], {'ids': [1, 2], 'when': '2024-01-01 00:00:00'})
+        self.assertEqual(record['traceback'], '  File "app.py", line 3, in main\n    run()')
+        self.assertTrue(record['caller'].startswith('test_logger.py:'))
+
+    def test_unencodable_data_falls_back_to_str(self):
+        self.L.info('odd', data={(1, 2): float('nan')})
+        self.assertEqual(self.records()[0]['data'], str({(1, 2): float('nan')}))
+
+    def test_templates_follow_renames_and_levels(self):
+        self.L.set_name('renamed')
+        self.L.set_log_type_level('info', 15)
+        self.L.info('x')
+        record, = self.records()
+        self.assertEqual((record['logger'], record['level']), ('renamed', 15))
+
+    def test_switch_back_to_text(self):
+        self.L.update(recordFormat='text')
+        self.L.bind(k='v').info('plain')
+        self.assertIn('[k=v] plain', self.buf.getvalue())
+        self.assertEqual(self.L.parameters['recordFormat'], 'text')
+        with self.assertRaises(ValueError):
+            self.L.set_record_format('xml')
+        with self.assertRaises(TypeError):
+            self.L.set_record_format(None)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# 34 — Deferred formatting
+# ═══════════════════════════════════════════════════════════════════════════
+
+class _GateSink(_CaptureSink):
+    """Capture sink whose writes wait until the gate is opened."""
+
+    def __init__(self):
+        super().__init__()
+        self.gate = threading.Event()
+
+    def write(self, text):
+        self.gate.wait(5)
+        super().write(text)
+
+
+class TestDeferredFormatting(unittest.TestCase):
+    """args= merging and deferFormatting on the enqueue writer thread."""
+
+    def test_args_merged_eagerly(self):
+        L, buf = make_logger()
+        L.info('%d items in %s', args=(3, 'cart'))
+        L.warn('%(n)d left', args={'n': 2})
+        L.error('only %s', args='one')
+        text = buf.getvalue()
+        self.assertIn('3 items in cart', text)
+        self.assertIn('2 left', text)
+        self.assertIn('only one', text)
+        self.assertEqual(L.info('%d', args=(1,)), '%d')
+
+    def test_mismatched_args_do_not_raise(self):
+        for defer in (False, True):
+            L, buf = make_logger(enqueue=True, deferFormatting=defer)
+            L.info('%d and %d', args=(1,))
+            L.flush()
+            self.assertIn("%d and %d [args (1,) not formatted:", buf.getvalue())
+
+    def test_deferred_record_formatted_by_writer(self):
+        L, buf = make_logger(enqueue=True, deferFormatting=True)
+        L.info('%s=%d', args=('x', 1), data={'k': 'v'})
+        L.flush()
+        self.assertIn('x=1', buf.getvalue())
+        self.assertIn("'k': 'v'", buf.getvalue())
+
+    def test_timestamp_taken_at_call_time(self):
+        L, _ = make_logger(logToStdout=False, enqueue=True, deferFormatting=True,
+                           timestampPrecision=6)
+        sink = _GateSink()
+        L.add_sink('s', sink)
+        L.info('first')                      # parks the writer on the gate
+        callTime = time.time() - 3600
+        with mock.patch('time.time', return_value=callTime):
+            L.info('second')
+        sink.gate.set()
+        L.flush()
+        self.assertIn(L._get_datetimestamp(timestamp=callTime), sink.lines[1])
+
+    def test_mutable_arguments_formatted_at_call(self):
+        L, _ = make_logger(logToStdout=False, enqueue=True, deferFormatting=True)
+        sink = _GateSink()
+        L.add_sink('s', sink)
+        items, mapping = [1, 2], {'ids': [1]}
+        L.info('%s', args=(items,))
+        L.info('mapping %(ids)s', args=mapping)
+        L.info('data', data=items)
+        items.append(3)
+        mapping['ids'].append(2)
+        sink.gate.set()
+        L.flush()
+        self.assertIn('[1, 2]', sink.lines[0])
+        self.assertIn('mapping [1]', sink.lines[1])
+        self.assertIn('[1, 2]', sink.lines[2])
+        self.assertNotIn('3', sink.lines[2].split('data')[-1])
+
+    def test_immutable_mapping_is_copied(self):
+        L, _ = make_logger(logToStdout=False, enqueue=True, deferFormatting=True)
+        sink = _GateSink()
+        L.add_sink('s', sink)
+        mapping = {'user': 'ann'}
+        L.info('user %(user)s', args=mapping)
+        mapping['user'] = 'bob'
+        sink.gate.set()
+        L.flush()
+        self.assertIn('user ann', sink.lines[0])
+
+    def test_last_logged_current_after_flush(self):
+        L, _ = make_logger(logToStdout=False, enqueue=True, deferFormatting=True)
+        sink = _GateSink()
+        L.add_sink('s', sink)
+        L.info('first')
+        L.warn('n=%d', args=(5,))
+        self.assertIsNone(L.lastLoggedWarning)
+        sink.gate.set()
+        L.flush()
+        self.assertIn('n=5', L.lastLoggedWarning)
+        self.assertEqual(L.lastLoggedMessage, L.lastLoggedWarning)
+
+    def test_flat_immutable_args_skip_snapshot(self):
+        L, _ = make_logger(logToStdout=False, enqueue=True, deferFormatting=True)
+        sink = _GateSink()
+        L.add_sink('s', sink)
+        with mock.patch('SimpleLog._snapshot', wraps=SimpleLog._snapshot) as snapshot, \
+             mock.patch('SimpleLog._get_caller_str') as caller:
+            L.info('plain')
+            L.info('%d in %s', args=(1, 'cart'))
+            self.assertEqual(snapshot.call_count, 0)
+            L.info('%s', args=([1],))
+            L.info('%(n)d', args={'n': 1})
+            self.assertTrue(snapshot.called)
+            caller.assert_not_called()
+        sink.gate.set()
+        L.flush()
+        self.assertEqual([line.split('> ', 1)[1].strip() for line in sink.lines],
+                         ['plain', '1 in cart', '[1]', '1'])
+
+    def test_sync_logger_ignores_deferral(self):
+        L, buf = make_logger(deferFormatting=True)
+        L.info('now %d', args=(1,))
+        self.assertIn('now 1', buf.getvalue())
+        self.assertIn('now 1', L.lastLoggedInfo)
+
+    def test_bound_logger_escapes_context(self):
+        L, buf = make_logger(enqueue=True, deferFormatting=True)
+        L.bind(rate='50%').info('%d done', args=(7,))
+        L.bind(rate='50%').info('literal %d')
+        L.flush()
+        self.assertIn('[rate=50%] 7 done', buf.getvalue())
+        self.assertIn('[rate=50%] literal %d', buf.getvalue())
+
+    def test_json_records_and_force_log(self):
+        L, buf = make_logger(enqueue=True, deferFormatting=True, recordFormat='json')
+        L.bind(k='v').info('%s!', args=('hi',))
+        L.force_log('debug', 'forced %d', args=(9,), stdout=True, file=False)
+        L.flush()
+        first, second = [json.loads(l) for l in buf.getvalue().split('\n') if l]
+        self.assertEqual((first['message'], first['context']), ('hi!', {'k': 'v'}))
+        self.assertEqual(second['message'], 'forced 9')
+
+    def test_group_commit_and_sink_workers(self):
+        for kwargs in ({'groupCommit': True}, {'sinkWorkers': True}):
+            L, buf = make_logger(enqueue=True, deferFormatting=True, **kwargs)
+            sink = _CaptureSink()
+            L.add_sink('s', sink)
+            for i in range(200):
+                L.info('record %d', args=(i,))
+            L.flush()
+            written = ''.join(sink.lines)     # group commit joins a batch
+            self.assertEqual(written.count('<INFO>'), 200)
+            self.assertTrue(written.rstrip().endswith('record 199'))
+            self.assertEqual(buf.getvalue().count('<INFO>'), 200)
+
+    def test_setter_and_parameters(self):
+        L, _ = make_logger()
+        self.assertFalse(L.deferFormatting)
+        L.update(deferFormatting=True)
+        self.assertTrue(L.parameters['deferFormatting'])
+        self.assertIn('Defer formatting: True', str(L))
+        with self.assertRaises(TypeError):
+            L.set_defer_formatting('yes')
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# 35 — Queue records
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestLogRecord(unittest.TestCase):
+    """White-box: _LogRecord queue items and the versioned _SinkTable."""
+
+    def _queued(self, **kwargs):
+        """Return a logger whose writer is parked, its gate sink and its queue."""
+        L, _ = make_logger(logToStdout=False, enqueue=True, **kwargs)
+        sink = _GateSink()
+        L.add_sink('s', sink)
+        L.info('parks the writer')
+        deadline = time.time() + 5
+        while L._Logger__logQueue.qsize() and time.time() < deadline:
+            time.sleep(0.001)
+        return L, sink, L._Logger__logQueue
+
+    def test_record_is_slotted(self):
+        record = _LogRecord(0.0, 10, 'info', 'm', None, None, None, '', None, (), 1)
+        self.assertFalse(hasattr(record, '__dict__'))
+        self.assertIsNone(record.text)
+        with self.assertRaises(AttributeError):
+            record.extra = 1
+
+    def test_log_queues_record_sharing_active_tuple(self):
+        L, sink, logQueue = self._queued()
+        before = time.time()
+        L.warn('first %d', args=(1,))
+        L.warn('second')
+        first, second = list(logQueue.queue)
+        active = L._Logger__sinkTable.active['warn']
+        self.assertIsInstance(active, tuple)
+        self.assertIs(first.sinks, active)
+        self.assertIs(second.sinks, active)
+        self.assertEqual((first.logType, first.level), ('warn', L.logTypeLevels['warn']))
+        self.assertEqual(first.version, L._Logger__sinkTable.generation)
+        self.assertGreaterEqual(first.timestamp, before)
+        self.assertIn('first 1', first.text)
+        sink.gate.set()
+        L.flush()
+
+    def test_rebuild_swaps_table_and_bumps_generation(self):
+        L, sink, logQueue = self._queued()
+        L.info('queued')
+        record, = logQueue.queue
+        table = L._Logger__sinkTable
+        L.set_log_to_stdout_flag(True)
+        self.assertIsNot(L._Logger__sinkTable, table)
+        self.assertGreater(L._Logger__sinkTable.generation, table.generation)
+        self.assertIs(table.active['info'], record.sinks)   # old table untouched
+        self.assertEqual(len(record.sinks), 1)              # routed before the change
+        sink.gate.set()
+        L.flush()
+        self.assertEqual(len(sink.lines), 2)
+
+    def test_force_log_record_names_builtin_sinks(self):
+        L, sink, logQueue = self._queued()
+        L.force_log('debug', 'forced', stdout=True, file=False)
+        record, = logQueue.queue
+        self.assertEqual([s.sinkType for s in record.sinks], ['stdout'])
+        sink.gate.set()
+        L.flush()
+
+    def test_sink_worker_lanes_share_or_split_tuples(self):
+        L, _ = make_logger(enqueue=True, sinkWorkers=True, logToStdout=False)
+        L.add_sink('a', _CaptureSink())
+        (lane, sinks), = L._Logger__sinkTable.lanes['info']
+        self.assertIs(sinks, L._Logger__sinkTable.active['info'])
+        L.add_sink('b', _CaptureSink())
+        lanes = L._Logger__sinkTable.lanes['info']
+        self.assertEqual(len(lanes), 2)
+        self.assertTrue(all(isinstance(sinks, tuple) for _, sinks in lanes))
+        record = _LogRecord(0.0, 10, 'info', 'm', None, None, None, '', None,
+                            L._Logger__sinkTable.active['info'], 1)
+        self.assertIs(record.routed(record.sinks), record)
+        copy = record.routed(lanes[0][1])
+        self.assertIsNot(copy, record)
+        self.assertEqual((copy.logType, copy.version, copy.sinks), ('info', 1, lanes[0][1]))
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# 36 — Rate limits
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestRateLimit(unittest.TestCase):
+    """Token buckets drop records over the limit and summarise the drops."""
+
+    def setUp(self):
+        self.clock = _FakeClock(1000.0)
+        self.L, self.buf = make_logger()
+
+    def limit(self, rate=1, burst=2, **kwargs):
+        return RateLimit(rate, burst=burst, clock=self.clock, **kwargs)
+
+    def lines(self):
+        return self.buf.getvalue().splitlines()
+
+    def test_log_type_bucket(self):
+        self.L.set_rate_limit(self.limit(), logTypes=['error'])
+        for i in range(5):
+            self.L.error('loop %d' % i)
+            self.L.info('other %d' % i)
+        self.assertEqual(sum('loop' in l for l in self.lines()), 2)
+        self.assertEqual(sum('other' in l for l in self.lines()), 5)
+        self.assertEqual(self.L.rateLimits['logTypes']['error']['suppressed'], 3)
+        self.clock.now += 1.0                       # one token back
+        self.L.error('recovered')
+        tail = self.lines()[-2:]
+        self.assertIn('3 similar messages suppressed by the rate limit', tail[0])
+        self.assertIn('<ERROR>', tail[0])
+        self.assertIn('recovered', tail[1])
+
+    def test_refill_is_capped_at_burst(self):
+        self.L.set_rate_limit(self.limit(rate=10, burst=3), logTypes=['info'])
+        self.clock.now += 3600
+        for i in range(10):
+            self.L.info('x')
+        self.assertEqual(len(self.lines()), 3)
+
+    def test_per_call_site_buckets(self):
+        self.L.set_rate_limit(self.limit(burst=1, perCallSite=True), logTypes=['warn'])
+        siteA = lambda: self.L.warn('site A')
+        for _ in range(3):
+            siteA()
+        for _ in range(3):
+            self.L.warn('site B')
+        self.assertEqual(len(self.lines()), 2)
+        self.clock.now += 1.0
+        siteA()
+        summary = self.lines()[-2]
+        self.assertIn('2 similar messages from test_logger.py:', summary)
+
+    def test_dropped_call_site_records_build_no_tag(self):
+        self.L.set_rate_limit(self.limit(burst=1, perCallSite=True), logTypes=['warn'])
+        site = lambda: self.L.warn('loop')
+        with mock.patch('SimpleLog._caller_tag', wraps=SimpleLog._caller_tag) as tag:
+            for _ in range(4):
+                site()
+            self.assertFalse(tag.called)
+            self.clock.now += 1.0
+            site()
+        self.assertEqual(tag.call_count, 1)
+        self.assertIn('3 similar messages from test_logger.py:', self.lines()[1])
+
+    def test_summary_bypasses_sampling(self):
+        self.L.set_sampling(Sampling(firstN=3, window=60, clock=self.clock), logTypes=['info'])
+        self.L.set_rate_limit(self.limit(burst=1), logTypes=['info'])
+        self.L.info('first')
+        self.L.info('dropped')
+        self.clock.now += 1.0
+        self.L.info('third')
+        self.assertIn('1 similar messages suppressed by the rate limit', self.lines()[1])
+        self.assertIn('third', self.lines()[2])
+
+    def test_summary_is_queued_ahead_of_record(self):
+        L, _ = make_logger(enqueue=True, sinkWorkers=True, logToStdout=False)
+        sink = _CaptureSink()
+        L.add_sink('s', sink)
+        L.set_rate_limit(self.limit(burst=1), logTypes=['info'])
+        L.info('first')
+        L.info('dropped')
+        self.clock.now += 1.0
+        L.info('again')
+        L.flush()
+        self.assertEqual(len(sink.lines), 3)
+        self.assertIn('1 similar messages suppressed by the rate limit', sink.lines[1])
+        self.assertIn('again', sink.lines[2])
+
+    def test_flush_announces_burst_that_stopped(self):
+        self.L.set_rate_limit(self.limit(burst=1), logTypes=['error'])
+        for _ in range(1000):
+            self.L.error('loop')
+        self.L.flush()
+        self.assertEqual(len(self.lines()), 2)
+        self.assertIn('999 similar messages suppressed by the rate limit', self.lines()[1])
+        self.L.flush()                              # announced once
+        self.assertEqual(len(self.lines()), 2)
+        self.assertEqual(self.L.rateLimits['logTypes']['error']['suppressed'], 999)
+
+    def test_exit_announces_pending_drops(self):
+        L, _ = make_logger(enqueue=True, logToStdout=False)
+        sink, alerts = _CaptureSink(), _CaptureSink()
+        L.add_sink('s', sink)
+        L.add_sink('alerts', alerts, logTypeFlags={'error': False})
+        L.set_rate_limit(self.limit(burst=1), logTypes=['error'])
+        L.set_rate_limit(self.limit(burst=1), sinks=['alerts'])
+        for _ in range(3):
+            L.error('storm')
+            L.warn('noisy')
+        L._flush_atexit_logfile()
+        self.assertIn('2 similar messages suppressed by the rate limit', sink.lines[-1])
+        self.assertEqual(len(alerts.lines), 2)
+        self.assertIn('<WARNING> 2 similar messages suppressed by the sink rate limit',
+                      alerts.lines[1])
+
+    def test_summary_interval_timer(self):
+        self.L.set_rate_limit(RateLimit(1, burst=1, clock=self.clock, summaryInterval=0.05),
+                              logTypes=['error'])
+        for _ in range(5):
+            self.L.error('loop')
+        deadline = time.time() + 5
+        while len(self.lines()) < 2 and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertIn('4 similar messages suppressed by the rate limit', self.lines()[1])
+        with self.assertRaises(ValueError):
+            RateLimit(1, summaryInterval=0)
+        with self.assertRaises(TypeError):
+            RateLimit(1, summaryInterval='1s')
+        with self.assertRaises(ValueError):
+            self.L.set_rate_limit(RateLimit(1, summaryInterval=1), sinks=[_SINK_STDOUT])
+
+    def test_sink_bucket_and_summary(self):
+        sink = _CaptureSink()
+        self.L.add_sink('alerts', sink)
+        self.L.set_rate_limit(self.limit(), sinks=['alerts'])
+        for i in range(5):
+            self.L.info('event %d' % i)
+        self.assertEqual(len(self.lines()), 5)        # stdout is not limited
+        self.assertEqual(len(sink.lines), 2)
+        self.clock.now += 1.0
+        self.L.info('later')
+        self.assertIn('3 similar messages suppressed by the sink rate limit', sink.lines[2])
+        self.assertIn('later', sink.lines[3])
+        self.assertEqual(self.L.rateLimits['sinks']['alerts']['suppressed'], 3)
+
+    def test_sink_bucket_with_group_commit(self):
+        L, _ = make_logger(enqueue=True, groupCommit=True, logToStdout=False)
+        sink = _CaptureSink()
+        L.add_sink('s', sink)
+        L.set_rate_limit(self.limit(burst=5), sinks=['s'])
+        for i in range(50):
+            L.info('record %d' % i)
+        L.flush()
+        self.assertEqual(''.join(sink.lines).count('record'), 5)
+
+    def test_force_log_bypasses_log_type_limit_only(self):
+        self.L.set_rate_limit(self.limit(burst=1), logTypes=['info'])
+        self.L.info('first')
+        self.L.info('dropped')
+        self.L.force_log('info', 'forced', file=False)
+        self.assertEqual(len(self.lines()), 2)
+        self.assertIn('forced', self.lines()[1])
+        self.L.set_rate_limit(self.limit(burst=1), sinks=[_SINK_STDOUT])
+        self.L.force_log('info', 'forced again', file=False)
+        self.L.force_log('info', 'capped', file=False)
+        self.assertEqual(len(self.lines()), 3)
+
+    def test_remove_and_validation(self):
+        self.L.set_rate_limit(self.limit(burst=1))
+        self.assertEqual(sorted(self.L.rateLimits['logTypes']), sorted(self.L.logTypes))
+        self.L.set_rate_limit(None)
+        self.assertEqual(self.L.rateLimits, {'logTypes': {}, 'sinks': {}})
+        with self.assertRaises(TypeError):
+            self.L.set_rate_limit(5)
+        with self.assertRaises(ValueError):
+            self.L.set_rate_limit(self.limit(), logTypes=['nope'])
+        with self.assertRaises(ValueError):
+            self.L.set_rate_limit(self.limit(), sinks=['nope'])
+        with self.assertRaises(ValueError):
+            self.L.set_rate_limit(self.limit(perCallSite=True), sinks=[_SINK_STDOUT])
+        with self.assertRaises(ValueError):
+            self.L.set_rate_limit(self.limit(), logTypes=['info'], sinks=[_SINK_STDOUT])
+        with self.assertRaises(ValueError):
+            RateLimit(0)
+        with self.assertRaises(ValueError):
+            RateLimit(5, burst=0.5)
+        with self.assertRaises(TypeError):
+            RateLimit('5')
+        self.assertEqual(RateLimit(0.5).burst, 1.0)
+        self.assertEqual(RateLimit(20).burst, 20.0)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# 37 — Duplicate collapsing
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestDuplicateCollapsing(unittest.TestCase):
+    """Consecutive identical records become one 'last message repeated' line."""
+
+    def lines(self, buf):
+        return buf.getvalue().splitlines()
+
+    def test_burst_collapsed_on_every_dispatch_path(self):
+        for kwargs in ({}, {'enqueue': True}, {'enqueue': True, 'groupCommit': True},
+                       {'enqueue': True, 'sinkWorkers': True, 'deferFormatting': True}):
+            with self.subTest(**kwargs):
+                L, buf = make_logger(duplicateWindow=60, **kwargs)
+                for _ in range(5):
+                    L.error('disk full on %s', args=('/var',))
+                L.info('recovered')
+                L.flush()
+                lines = self.lines(buf)
+                self.assertEqual(len(lines), 3)
+                self.assertIn('disk full on /var', lines[0])
+                self.assertIn('<ERROR> last message repeated 4 times', lines[1])
+                self.assertIn('recovered', lines[2])
+                self.assertEqual(L.collapsedRecords[_SINK_STDOUT], 4)
+
+    def test_pending_run_written_on_flush(self):
+        L, buf = make_logger(duplicateWindow=60)
+        L.warn('retrying')
+        L.warn('retrying')
+        self.assertEqual(len(self.lines(buf)), 1)
+        L.flush()
+        self.assertIn('last message repeated 1 time', self.lines(buf)[1])
+        L.warn('retrying')      # the run was ended by flush()
+        self.assertEqual(len(self.lines(buf)), 3)
+
+    def test_window_restarts_run(self):
+        L, buf = make_logger(duplicateWindow=10)
+        with mock.patch('time.time', return_value=1000.0) as now:
+            L.info('tick')
+            now.return_value = 1009.0
+            L.info('tick')
+            now.return_value = 1010.0
+            L.info('tick')
+        lines = self.lines(buf)
+        self.assertEqual(len(lines), 3)
+        self.assertIn('last message repeated 1 time', lines[1])
+        self.assertTrue(lines[2].endswith('<INFO> tick'))
+
+    def test_only_identical_records_collapse(self):
+        L, buf = make_logger(duplicateWindow=60)
+        L.info('item %d', args=(1,))
+        L.info('item %d', args=(2,))
+        L.warn('item 2')
+        L.error('failed', data={'id': 1})
+        L.error('failed', data={'id': 1})
+        L.error('failed', tback='Traceback: boom')
+        L.error('failed', tback='Traceback: boom')
+        L.bind(requestId='a').info('done')
+        L.bind(requestId='b').info('done')
+        L.flush()
+        self.assertEqual(L.collapsedRecords[_SINK_STDOUT], 0)
+        self.assertNotIn('repeated', buf.getvalue())
+
+    def test_per_sink_window(self):
+        L, buf = make_logger()
+        sink = _CaptureSink()
+        L.add_sink('mem', sink)
+        L.set_duplicate_window(60, sinks=['mem'])
+        self.assertIsNone(L.duplicateWindow)
+        for _ in range(3):
+            L.info('same')
+        self.assertEqual(len(self.lines(buf)), 3)
+        self.assertEqual(len(sink.lines), 1)
+        L.remove_sink('mem')    # the run is reported before the sink goes
+        self.assertIn('last message repeated 2 times', sink.lines[1])
+        self.assertEqual(L.collapsedRecords, {})
+
+    def test_logger_wide_window_reaches_new_sinks(self):
+        L, _ = make_logger()
+        L.update(duplicateWindow=5)
+        L.add_sink('mem', _CaptureSink())
+        self.assertEqual(L.duplicateWindow, 5.0)
+        self.assertEqual(L.parameters['duplicateWindow'], 5.0)
+        self.assertEqual(sorted(L.collapsedRecords, key=str), [-1, 0, 'mem'])
+        self.assertIn('Duplicate window: 5.0', str(L))
+        L.set_duplicate_window(None)
+        self.assertEqual(L.collapsedRecords, {})
+
+    def test_validation(self):
+        L, _ = make_logger()
+        with self.assertRaises(TypeError):
+            L.set_duplicate_window('5')
+        with self.assertRaises(ValueError):
+            L.set_duplicate_window(0)
+        with self.assertRaises(ValueError):
+            L.set_duplicate_window(5, sinks=['nope'])
+        with self.assertRaises(TypeError):
+            L.set_duplicate_window(5, sinks='mem')
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# 38 — Sampling
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestSampling(unittest.TestCase):
+    """Ratio, first-N and context-hash sampling of logTypes and sinks."""
+
+    def setUp(self):
+        self.clock = _FakeClock(1000.0)
+        self.L, self.buf = make_logger()
+
+    def lines(self):
+        return self.buf.getvalue().splitlines()
+
+    def test_ratio_keeps_a_fraction(self):
+        self.L.set_sampling(Sampling(ratio=0.25), logTypes=['debug'])
+        with mock.patch('SimpleLog._random', side_effect=[0.1, 0.3, 0.2, 0.9] * 5):
+            for i in range(20):
+                self.L.debug('d %d' % i)
+        self.L.info('kept')
+        self.assertEqual(len(self.lines()), 11)
+        self.assertEqual(self.L.sampling['logTypes']['debug']['sampledOut'], 10)
+        self.assertNotIn('info', self.L.sampling['logTypes'])
+
+    def test_sampled_out_records_are_not_formatted(self):
+        self.L.set_sampling(Sampling(ratio=0.5), logTypes=['info'])
+        with mock.patch('SimpleLog._random', return_value=0.9), \
+             mock.patch.object(Logger, '_format_message', side_effect=AssertionError):
+            self.L.info('dropped %s', args=('x',))
+        self.assertEqual(self.lines(), [])
+
+    def test_first_n_per_window(self):
+        self.L.set_sampling(Sampling(firstN=3, window=10, clock=self.clock), logTypes=['info'])
+        for i in range(10):
+            self.L.info('a %d' % i)
+        self.clock.now += 10
+        for i in range(10):
+            self.L.info('b %d' % i)
+        self.assertEqual([l.rsplit(' ', 2)[-2:] for l in self.lines()],
+                         [['a', '0'], ['a', '1'], ['a', '2'], ['b', '0'], ['b', '1'], ['b', '2']])
+        self.assertEqual(self.L.sampling['logTypes']['info']['sampledOut'], 14)
+
+    def test_context_key_keeps_whole_requests(self):
+        self.L.set_sampling(Sampling(ratio=0.5, contextKey='requestId'), logTypes=['info', 'warn'])
+        kept = set()
+        for i in range(40):
+            bound = self.L.bind(requestId='req-%d' % i)
+            for step in range(3):
+                bound.info('step %d' % step)
+            bound.warn('done')
+        for line in self.lines():
+            kept.add(line.split('[requestId=')[1].split(']')[0])
+        # every kept request has all four records, in both record formats
+        self.assertEqual(len(self.lines()), 4 * len(kept))
+        self.assertTrue(0 < len(kept) < 40)
+        L, buf = make_logger(recordFormat='json')
+        L.set_sampling(Sampling(ratio=0.5, contextKey='requestId'), logTypes=['info'])
+        for i in range(40):
+            L.bind(requestId='req-%d' % i).info('step')
+        ids = set(json.loads(l)['context']['requestId'] for l in buf.getvalue().split('\n') if l)
+        self.assertEqual(ids, kept)
+
+    def test_context_key_missing_falls_back_to_ratio(self):
+        self.L.set_sampling(Sampling(ratio=0.5, contextKey='requestId'), logTypes=['info'])
+        with mock.patch('SimpleLog._random', side_effect=[0.1, 0.9]):
+            self.L.info('one')
+            self.L.bind(user='x').info('two')
+        self.assertEqual(len(self.lines()), 1)
+
+    def test_sink_sampling(self):
+        sink = _CaptureSink()
+        self.L.add_sink('mem', sink)
+        self.L.set_sampling(Sampling(firstN=2, clock=self.clock), sinks=['mem'])
+        for i in range(5):
+            self.L.info('r %d' % i)
+        self.assertEqual(len(sink.lines), 2)
+        self.assertEqual(len(self.lines()), 5)
+        self.assertEqual(self.L.sampling['sinks']['mem']['sampledOut'], 3)
+        L, _ = make_logger(enqueue=True, groupCommit=True)
+        sink = _CaptureSink()
+        L.add_sink('mem', sink)
+        L.set_sampling(Sampling(firstN=2, clock=self.clock), sinks=['mem'])
+        for i in range(5):
+            L.info('r %d' % i)
+        L.flush()
+        self.assertEqual(''.join(sink.lines).count('<INFO>'), 2)
+
+    def test_remove_and_validation(self):
+        self.L.set_sampling(Sampling(ratio=0.1))
+        self.assertEqual(sorted(self.L.sampling['logTypes']), sorted(self.L.logTypes))
+        self.L.set_sampling(None)
+        self.assertEqual(self.L.sampling, {'logTypes': {}, 'sinks': {}})
+        with self.assertRaises(TypeError):
+            self.L.set_sampling(0.5)
+        with self.assertRaises(ValueError):
+            self.L.set_sampling(Sampling(ratio=0.5), logTypes=['nope'])
+        with self.assertRaises(ValueError):
+            self.L.set_sampling(Sampling(ratio=0.5, contextKey='id'), sinks=[_SINK_STDOUT])
+        with self.assertRaises(ValueError):
+            self.L.set_sampling(Sampling(ratio=0.5), logTypes=['info'], sinks=[_SINK_STDOUT])
+        for kwargs, error in (({}, ValueError), ({'ratio': 0.5, 'firstN': 2}, ValueError),
+                              ({'ratio': 0}, ValueError), ({'ratio': 1.5}, ValueError),
+                              ({'ratio': '1'}, TypeError), ({'firstN': 0}, ValueError),
+                              ({'firstN': 2.5}, TypeError), ({'firstN': 2, 'window': 0}, ValueError),
+                              ({'firstN': 2, 'contextKey': 'id'}, ValueError)):
+            with self.subTest(**kwargs):
+                with self.assertRaises(error):
+                    Sampling(**kwargs)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# 39 — Flight recorder
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestFlightRecorder(unittest.TestCase):
+    """Records kept off disk are written out when an error is logged."""
+
+    def setUp(self):
+        self.tmp  = tempfile.mkdtemp()
+        self.base = os.path.join(self.tmp, 'fr')
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _make(self, **kwargs):
+        L = Logger(name='fr', logToStdout=False, logFileBasename=self.base,
+                   fileMinLevel=10, durability='none', **kwargs)
+        self.addCleanup(L._flush_atexit_logfile)
+        return L
+
+    def messages(self, L):
+        L.flush()
+        with open(L.logFileName) as fd:
+            return [line.split('> ', 1)[1] for line in fd.read().splitlines()]
+
+    def test_dump_precedes_trigger_on_every_path(self):
+        for kwargs in ({}, {'enqueue': True}, {'enqueue': True, 'groupCommit': True},
+                       {'enqueue': True, 'sinkWorkers': True}):
+            with self.subTest(**kwargs):
+                L = self._make(logFileMaxSize=None, **kwargs)
+                L.set_flight_recorder(3)
+                for i in range(5):
+                    L.debug('step %d', args=(i,))
+                L.info('on disk')
+                L.error('boom')
+                L.debug('after')
+                self.assertEqual(self.messages(L)[-6:],
+                                 ['on disk', 'flight recorder: 3 earlier records follow',
+                                  'step 2', 'step 3', 'step 4', 'boom'])
+                stats = L.flightRecorder
+                self.assertEqual((stats['logTypes'], stats['recorded'], stats['overwritten'],
+                                  stats['dumps'], stats['buffered']), (['debug'], 6, 2, 1, 1))
+                os.remove(L.logFileName)
+
+    def test_records_keep_call_time_and_are_formatted_on_dump(self):
+        L = self._make()
+        L.set_flight_recorder(10)
+        callTime = datetime(2024, 1, 1, 8, 0, 0).timestamp()
+        with mock.patch('time.time', return_value=callTime), \
+             mock.patch.object(Logger, '_format_message', side_effect=AssertionError):
+            L.debug('kept %s', args=('unformatted',))
+        self.assertIsNone(L._Logger__recorder.rings[None].slots[0].text)
+        L.error('boom')
+        L.flush()
+        with open(L.logFileName) as fd:
+            kept = [l for l in fd.read().splitlines() if 'kept' in l]
+        self.assertEqual(kept, ['2024-01-01 08:00:00 - fr <DEBUG> kept unformatted'])
+
+    def test_mutable_args_are_formatted_when_kept(self):
+        L = self._make()
+        L.set_flight_recorder(10)
+        items = [1]
+        L.debug('items %s', args=(items,))
+        items.append(2)
+        L.error('boom')
+        self.assertIn('items [1]', self.messages(L))
+
+    def test_per_context_rings(self):
+        L = self._make()
+        L.set_flight_recorder(10, contextKey='requestId')
+        a, b = L.bind(requestId='a'), L.bind(requestId='b')
+        a.debug('a1')
+        b.debug('b1')
+        a.debug('a2')
+        b.error('failed')
+        messages = self.messages(L)
+        self.assertEqual(messages, ['flight recorder: 1 earlier records follow',
+                                    '[requestId=b] b1', '[requestId=b] failed'])
+        self.assertEqual(L.flightRecorder['buffered'], 2)
+
+    def test_per_thread_rings(self):
+        L = self._make()
+        L.set_flight_recorder(10, perThread=True)
+        worker = threading.Thread(target=lambda: L.debug('other thread'))
+        worker.start()
+        worker.join()
+        L.debug('this thread')
+        L.error('boom')
+        self.assertEqual(self.messages(L)[1:], ['this thread', 'boom'])
+
+    def test_recorded_types_follow_routing(self):
+        L = self._make()
+        L.set_flight_recorder(5, triggerLevel='critical')
+        self.assertEqual(L.flightRecorder['logTypes'], ['debug'])
+        L.set_minimum_level(30, stdoutFlag=False, fileFlag=True)
+        self.assertEqual(L.flightRecorder['logTypes'], ['debug', 'info', 'warn'])
+        L.error('written, no dump')
+        self.assertEqual(L.flightRecorder['dumps'], 0)
+        L.set_log_to_file_flag(False)
+        self.assertEqual(L.flightRecorder['logTypes'], [])
+        L.set_flight_recorder(None)
+        self.assertIsNone(L.flightRecorder)
+
+    def test_validation(self):
+        L = self._make()
+        for args, kwargs, error in (((0,), {}, ValueError), (('5',), {}, TypeError),
+                                    ((5,), {'triggerLevel': 'nope'}, ValueError),
+                                    ((5,), {'triggerLevel': []}, TypeError),
+                                    ((5,), {'perThread': 1}, TypeError),
+                                    ((5,), {'perThread': True, 'contextKey': 'id'}, ValueError)):
+            with self.subTest(args=args, **kwargs):
+                with self.assertRaises(error):
+                    L.set_flight_recorder(*args, **kwargs)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# 40 — AsyncLogger
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestAsyncLogger(unittest.TestCase):
+    """Awaitable logging that never parks the event loop thread."""
+
+    def _make(self, cleanup=True, **kwargs):
+        defaults = dict(name='aio', logToFile=False, logToStdout=False)
+        defaults.update(kwargs)
+        L = AsyncLogger(**defaults)
+        if cleanup:
+            self.addCleanup(L._flush_atexit_logfile)
+        sink = _GateSink()
+        L.add_sink('s', sink)
+        return L, sink
+
+    def run_loop(self, coroutine):
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(coroutine)
+        finally:
+            loop.close()
+
+    def test_enqueue_mode_required(self):
+        L, _ = self._make()
+        self.assertTrue(L.enqueue)
+        self.assertIsInstance(L, Logger)
+        with self.assertRaises(ValueError):
+            AsyncLogger(name='aio', logToFile=False, enqueue=False)
+
+    def test_awaitable_methods(self):
+        L, sink = self._make()
+        sink.gate.set()
+
+        async def main():
+            self.assertEqual(await L.ainfo('info %d', args=(1,)), 'info %d')
+            await L.ainformation('information')
+            await L.awarn('warn')
+            await L.awarning('warning')
+            await L.aerror('error')
+            await L.acritical('critical')
+            await L.adebug('debug')
+            await L.alog('info', 'log')
+            await L.aforce_log('debug', 'forced', stdout=False, file=False)
+            await L.aflush()
+        self.run_loop(main())
+        messages = [line.split('> ', 1)[1].strip() for line in sink.lines]
+        self.assertEqual(messages, ['info 1', 'information', 'warn', 'warning', 'error',
+                                    'critical', 'debug', 'log'])
+        self.assertIn('forced', L.lastLoggedDebug)
+
+    def test_full_queue_waits_without_blocking_loop(self):
+        L, sink = self._make(maxQueueSize=1, queueFullPolicy='block')
+
+        async def writer():
+            for i in range(6):
+                await L.ainfo('record %d' % i)
+
+        async def main():
+            task  = asyncio.ensure_future(writer())
+            ticks = 0
+            while L.backlog == 0 and ticks < 1000:
+                await asyncio.sleep(0.001)
+                ticks += 1
+            # the loop keeps running while the writer task waits
+            for _ in range(5):
+                await asyncio.sleep(0.001)
+            self.assertFalse(task.done())
+            self.assertGreater(L.backlog, 0)
+            sink.gate.set()
+            await task
+            await L.aflush()
+        self.run_loop(main())
+        self.assertEqual(L.backlog, 0)
+        self.assertEqual(L.droppedMessages, 0)
+        self.assertEqual([line.split('> ', 1)[1].strip() for line in sink.lines],
+                         ['record %d' % i for i in range(6)])
+        self.assertIsNone(SimpleLog._ASYNC_BACKLOG.records)
+
+    def test_writer_wakes_waiting_task(self):
+        L, sink = self._make(maxQueueSize=1, queueFullPolicy='block')
+
+        async def main():
+            await L.ainfo('record 0')
+            while L.queueSize:                 # the writer holds record 0
+                await asyncio.sleep(0.001)
+            await L.ainfo('record 1')
+            with mock.patch.object(L, '_drain_backlog', wraps=L._drain_backlog) as drain:
+                task = asyncio.ensure_future(L.ainfo('record 2'))
+                await asyncio.sleep(0.2)
+                self.assertEqual(drain.call_count, 1)   # no polling while stalled
+                sink.gate.set()
+                await asyncio.wait_for(task, 5)
+            await L.aflush()
+        self.run_loop(main())
+        self.assertEqual(len(sink.lines), 3)
+        self.assertEqual(L._Logger__roomWaiters, [])
+
+    def test_block_timeout_drops_waiting_records(self):
+        L, sink = self._make(maxQueueSize=1, queueFullPolicy='block',
+                             queueBlockTimeout=0.05)
+
+        async def main():
+            for i in range(4):
+                await L.ainfo('record %d' % i)
+        with mock.patch('sys.stderr', new_callable=io.StringIO) as stderr:
+            self.run_loop(main())
+        sink.gate.set()
+        L.flush()
+        self.assertEqual(L.droppedMessages, 2)
+        self.assertEqual(len(sink.lines), 2)
+        self.assertIn('record dropped (2 total dropped)', stderr.getvalue())
+
+    def test_other_policies_do_not_wait(self):
+        L, sink = self._make(maxQueueSize=1, queueFullPolicy='raise')
+
+        async def main():
+            await L.ainfo('first')
+            while L.queueSize:
+                await asyncio.sleep(0.001)
+            await L.ainfo('queued')
+            await L.ainfo('full')
+        with self.assertRaises(queue.Full):
+            self.run_loop(main())
+        self.assertIsNone(SimpleLog._ASYNC_BACKLOG.records)
+        self.assertEqual(L.backlog, 0)
+        sink.gate.set()
+
+    def test_bound_logger_awaitable(self):
+        L, sink = self._make()
+        sink.gate.set()
+        B = L.bind(requestId='r1').bind(user='ann')
+
+        async def main():
+            await B.ainfo('bound')
+            await B.aerror('failed %s', args=('again',))
+            await B.aflush()
+        self.run_loop(main())
+        self.assertTrue(sink.contains('[requestId=r1 user=ann] bound'))
+        self.assertTrue(sink.contains('[requestId=r1 user=ann] failed again'))
+        self.assertFalse(hasattr(Logger('plain', logToFile=False, logToStdout=False)
+                                 .bind(a=1), 'ainfo'))
+
+    def test_cancelled_backlog_written_at_exit(self):
+        # the test stops the writer itself, as the interpreter would
+        L, sink = self._make(cleanup=False, maxQueueSize=1, queueFullPolicy='block')
+
+        async def main():
+            await L.ainfo('record 0')
+            while L.queueSize:                 # the writer holds record 0
+                await asyncio.sleep(0.001)
+            tasks = [asyncio.ensure_future(L.ainfo('record %d' % i)) for i in range(1, 5)]
+            await asyncio.sleep(0.001)
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        self.run_loop(main())
+        self.assertEqual(L.backlog, 3)
+        sink.gate.set()
+        L._flush_atexit_logfile()
+        self.assertEqual(L.backlog, 0)
+        self.assertEqual(len(sink.lines), 5)
+
+
 # ═══════════════════════════════════════════════════════════════════════════
 # entry point
 # ═══════════════════════════════════════════════════════════════════════════
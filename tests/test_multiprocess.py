@@ -0,0 +1,282 @@
+"""Multiprocess file-sharing tests for pysimplelog.
+
+Run from the repo root:
+    python3 -m pytest tests/test_multiprocess.py -v
+    python3 tests/test_multiprocess.py
+
+Several processes log to the same rotating file set with
+``multiprocess=True``. After they exit the files are parsed and checked
+for the same properties tests/test_integrity.py checks across threads:
+
+  * every line is one complete record (O_APPEND writes never interleave),
+  * no record is lost or duplicated while no roll limit deletes files,
+  * each process's records are in order,
+  * file numbers are contiguous -- no number was skipped or claimed twice.
+
+Test structure
+--------------
+TestSharedRotation   -- independent loggers in N processes, size rotation
+TestSharedRoll       -- the same with logFileRoll deleting old files
+TestForkedLogger     -- a logger created before fork() used by the children
+TestMultiprocessFlag -- set_multiprocess() validation and parameters
+TestSharedTimeRotation -- every process crosses an hourly boundary
+"""
+
+import glob
+import multiprocessing
+import os
+import re
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import SimpleLog  # noqa: E402
+from SimpleLog import Logger, RotationPolicy  # noqa: E402
+
+
+# ── tuning ──────────────────────────────────────────────────────────────────
+
+N_PROCESSES  = 4
+N_PER_PROC   = 400
+MAX_SIZE_MB  = 0.01          # ~10 KB per file -> many rotations
+PADDING      = 'x' * 60      # makes each record ~110 bytes
+JOIN_TIMEOUT = 30.0
+
+MSG_PATTERN = re.compile(r'P(\d{2}):S(\d{6}) ')
+RECORD_RE   = re.compile(
+    r'^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2} - \S+ <\w+> P\d{2}:S\d{6} x{60}$'
+)
+
+CAN_FORK = (SimpleLog.fcntl is not None and
+            'fork' in multiprocessing.get_all_start_methods())
+
+
+# ── helpers ─────────────────────────────────────────────────────────────────
+
+def _make_logger(basename, **kwargs):
+    return Logger(name='mp', logToStdout=False, logFileBasename=basename,
+                  logFileMaxSize=MAX_SIZE_MB, multiprocess=True,
+                  durability='none', **kwargs)
+
+
+def _hammer(basename, index, kwargs):
+    """Child process body: a fresh logger writing N_PER_PROC records."""
+    L = _make_logger(basename, **kwargs)
+    for seq in range(N_PER_PROC):
+        L.info('P%02d:S%06d %s' % (index, seq, PADDING))
+    L.flush()
+
+
+def _hammer_shared(L, index):
+    """Child process body: reuse the logger inherited from the parent."""
+    for seq in range(N_PER_PROC):
+        L.info('P%02d:S%06d %s' % (index, seq, PADDING))
+    L.flush()
+
+
+def _hammer_timed(basename, index, boundary, barrier):
+    """Child process body: the injected clock crosses *boundary* halfway.
+
+    The barrier keeps the processes' clocks in step, as a real clock would.
+    """
+    crossed = [False]
+    L = Logger(name='mp', logToStdout=False, logFileBasename=basename,
+               multiprocess=True, durability='none',
+               rotationPolicy=RotationPolicy(when='hour',
+                   clock=lambda: boundary if crossed[0] else boundary - 1))
+    for seq in range(N_PER_PROC):
+        if seq == N_PER_PROC // 2:
+            barrier.wait(JOIN_TIMEOUT)
+            crossed[0] = True
+        L.info('P%02d:S%06d %s' % (index, seq, PADDING))
+    L.flush()
+
+
+def _run(target, argsList):
+    ctx   = multiprocessing.get_context('fork')
+    procs = [ctx.Process(target=target, args=args) for args in argsList]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join(JOIN_TIMEOUT)
+    return [p.exitcode for p in procs]
+
+
+def _log_files(basename):
+    """Return {number: path} of every log file of *basename*."""
+    files = {}
+    for path in glob.glob(basename + '*.log'):
+        m = re.match(r'^%s_(\d+)\.log$' % re.escape(basename), path)
+        if m is not None:
+            files[int(m.group(1))] = path
+    return files
+
+
+def _records(files):
+    """Return ({process: [sequence, ...]}, malformed lines) across *files* in order."""
+    perProcess = {}
+    malformed  = []
+    for number in sorted(files):
+        with open(files[number]) as fd:
+            for line in fd.read().splitlines():
+                if RECORD_RE.match(line) is None:
+                    malformed.append(line)
+                    continue
+                proc, seq = MSG_PATTERN.search(line).groups()
+                perProcess.setdefault(int(proc), []).append(int(seq))
+    return perProcess, malformed
+
+
+@unittest.skipUnless(CAN_FORK, 'multiprocess mode needs fcntl and fork()')
+class _TempDirCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp      = tempfile.mkdtemp()
+        self.basename = os.path.join(self.tmp, 'shared')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# 1 — independent loggers, size rotation
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestSharedRotation(_TempDirCase):
+
+    def test_no_loss_no_interleaving(self):
+        codes = _run(_hammer, [(self.basename, i, {}) for i in range(N_PROCESSES)])
+        self.assertEqual(codes, [0] * N_PROCESSES)
+        files = _log_files(self.basename)
+        perProcess, malformed = _records(files)
+        self.assertEqual(malformed, [])
+        self.assertEqual(sorted(perProcess), list(range(N_PROCESSES)))
+        for proc, seqs in perProcess.items():
+            self.assertEqual(seqs, list(range(N_PER_PROC)),
+                             'process %d lost, duplicated or reordered records' % proc)
+
+    def test_file_numbers_contiguous(self):
+        _run(_hammer, [(self.basename, i, {}) for i in range(N_PROCESSES)])
+        numbers = sorted(_log_files(self.basename))
+        self.assertGreater(len(numbers), 1, 'no rotation happened')
+        self.assertEqual(numbers, list(range(numbers[0], numbers[-1] + 1)))
+
+    def test_files_close_to_max_size(self):
+        _run(_hammer, [(self.basename, i, {}) for i in range(N_PROCESSES)])
+        files = _log_files(self.basename)
+        limit = MAX_SIZE_MB * 1024 ** 2
+        # every process may append one record after another one filled the file
+        slack = N_PROCESSES * 200
+        for number in sorted(files)[:-1]:
+            size = os.path.getsize(files[number])
+            self.assertGreaterEqual(size, limit)
+            self.assertLess(size, limit + slack)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# 2 — rolling deletes old files
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestSharedRoll(_TempDirCase):
+
+    def test_roll_limit_respected(self):
+        codes = _run(_hammer, [(self.basename, i, {'logFileRoll': 3})
+                               for i in range(N_PROCESSES)])
+        self.assertEqual(codes, [0] * N_PROCESSES)
+        files = _log_files(self.basename)
+        self.assertLessEqual(len(files), 3)
+        numbers = sorted(files)
+        self.assertEqual(numbers, list(range(numbers[0], numbers[-1] + 1)))
+        _, malformed = _records(files)
+        self.assertEqual(malformed, [])
+
+    def test_surviving_records_contiguous(self):
+        _run(_hammer, [(self.basename, i, {'logFileRoll': 3})
+                       for i in range(N_PROCESSES)])
+        perProcess, _ = _records(_log_files(self.basename))
+        self.assertTrue(perProcess)
+        # rolling drops the oldest records only; what survives of every
+        # process must be one unbroken run ending at its last record
+        # unless the process finished before the surviving files began
+        for proc, seqs in perProcess.items():
+            self.assertEqual(seqs, list(range(seqs[0], seqs[0] + len(seqs))),
+                             'process %d has holes in its surviving records' % proc)
+        self.assertIn(N_PER_PROC - 1, max(perProcess.values(), key=len))
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# 3 — logger inherited across fork()
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestForkedLogger(_TempDirCase):
+
+    def test_children_reopen_inherited_logger(self):
+        L = _make_logger(self.basename)
+        L.info('P99:S000000 %s' % PADDING)   # parent opens the file before forking
+        codes = _run(_hammer_shared, [(L, i) for i in range(N_PROCESSES)])
+        self.assertEqual(codes, [0] * N_PROCESSES)
+        L.info('P99:S000001 %s' % PADDING)
+        L.flush()
+        perProcess, malformed = _records(_log_files(self.basename))
+        self.assertEqual(malformed, [])
+        self.assertEqual(perProcess[99], [0, 1])
+        for proc in range(N_PROCESSES):
+            self.assertEqual(perProcess[proc], list(range(N_PER_PROC)))
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# 4 — flag validation
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestMultiprocessFlag(_TempDirCase):
+
+    def test_toggle_at_runtime(self):
+        L = Logger(name='mp', logToStdout=False, logFileBasename=self.basename)
+        L.info('text mode')
+        L.set_multiprocess(True)
+        L.info('shared mode')
+        L.update(multiprocess=False)
+        L.info('text mode again')
+        L.flush()
+        with open(L.logFileName) as fd:
+            content = fd.read()
+        for text in ('text mode', 'shared mode', 'text mode again'):
+            self.assertIn(text, content)
+        self.assertFalse(L.parameters['multiprocess'])
+
+    def test_invalid_flag_raises(self):
+        L = Logger(name='mp', logToStdout=False, logFileBasename=self.basename)
+        with self.assertRaises(TypeError):
+            L.set_multiprocess('yes')
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# 5 — time-based rotation
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestSharedTimeRotation(_TempDirCase):
+
+    def test_one_new_file_per_boundary(self):
+        boundary = RotationPolicy(when='hour').next_rollover(1700000000)
+        barrier  = multiprocessing.get_context('fork').Barrier(N_PROCESSES)
+        codes = _run(_hammer_timed, [(self.basename, i, boundary, barrier)
+                                     for i in range(N_PROCESSES)])
+        self.assertEqual(codes, [0] * N_PROCESSES)
+        files = sorted(glob.glob(self.basename + '*.log'))
+        self.assertEqual(len(files), 2, 'each boundary must be rolled exactly once')
+        half = N_PER_PROC // 2
+        for path, expected in zip(files, (range(half), range(half, N_PER_PROC))):
+            perProcess, malformed = _records({0: path})
+            self.assertEqual(malformed, [])
+            for proc in range(N_PROCESSES):
+                self.assertEqual(perProcess[proc], list(expected))
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# entry point
+# ═══════════════════════════════════════════════════════════════════════════
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -31,8 +31,15 @@ TestCrashingSink        -- a sink that raises on every write must not
                            starve sibling sinks in the same dispatch batch
 TestRuntimePolicyChange -- hot-swap queueFullPolicy while queue is active
 TestQueueSizeProperty   -- queueSize reflects live depth accurately
-TestConcurrentSinkMutate -- add / remove sinks while worker is flooding
+TestConcurrentSinkMutate -- add / remove sinks while worker is flooding,
+                           32 logging threads against concurrent sink churn
 TestClearSinksUnderLoad -- clear_sinks() mid-flood leaves logger coherent
+TestGroupCommit         -- batched writer: one write per sink per batch,
+                           ordering, force_log items, batch statistics
+TestSinkWorkers         -- per-sink queues: a slow sink no longer stalls its
+                           siblings, per-sink drop counters, worker groups
+TestRingQueueBackend    -- queueBackend='ring': FIFO, Full/Empty, join(),
+                           every queueFullPolicy and queueSize
 """
 
 import io
@@ -44,7 +51,7 @@ import unittest
 import os
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
-from SimpleLog import Logger  # noqa: E402
+from SimpleLog import Logger, _RingQueue  # noqa: E402
 
 
 # ── tuneable constants ──────────────────────────────────────────────────────
@@ -61,7 +68,8 @@ SMALL_QUEUE = 3
 # ── helpers ─────────────────────────────────────────────────────────────────
 
 def make_enqueue_logger(maxQueueSize=None, queueFullPolicy='block',
-                        queueBlockTimeout=None, logToStdout=False):
+                        queueBlockTimeout=None, logToStdout=False,
+                        queueBackend='queue'):
     """Return an enqueue-mode Logger with stdout captured in a StringIO."""
     buf = io.StringIO()
     L = Logger(
@@ -73,6 +81,7 @@ def make_enqueue_logger(maxQueueSize=None, queueFullPolicy='block',
         maxQueueSize    = maxQueueSize,
         queueFullPolicy = queueFullPolicy,
         queueBlockTimeout = queueBlockTimeout,
+        queueBackend    = queueBackend,
     )
     return L, buf
 
@@ -790,6 +799,66 @@ class TestConcurrentSinkMutate(unittest.TestCase):
         self.assertEqual(late.count(), AFTER,
                          f'late sink got {late.count()}/{AFTER} post-add messages')
 
+    def test_32_threads_log_while_sinks_churn(self):
+        """32 logging threads race two threads adding and removing sinks.
+
+        The sink that is never touched must get every record exactly once,
+        no thread may raise, and the final routing table must hold both
+        sinks added last -- a rebuild lost to a concurrent one would drop
+        one of them.
+        """
+        N_THREADS, N_MSGS, N_CHURN = 32, 200, 100
+        L, _ = make_enqueue_logger(logToStdout=False)
+        stable = _CountSink()
+        L.add_sink('stable', stable)
+        first   = L._Logger__sinkTable.generation
+        finals  = {}
+        errors  = []
+        barrier = threading.Barrier(N_THREADS + 2)
+
+        def log(tid):
+            barrier.wait()
+            try:
+                for i in range(N_MSGS):
+                    L.info(f'T{tid}-M{i}')
+            except Exception as exc:
+                errors.append(exc)
+
+        def churn(prefix):
+            barrier.wait()
+            try:
+                for i in range(N_CHURN):
+                    name = f'{prefix}{i % 4}'
+                    L.add_sink(name, _CountSink(), minLevel=i % 3 * 10)
+                    L.remove_sink(name)
+                finals[prefix] = _CountSink()
+                L.add_sink(prefix + 'final', finals[prefix])
+            except Exception as exc:
+                errors.append(exc)
+
+        threads  = [threading.Thread(target=log, args=(t,)) for t in range(N_THREADS)]
+        threads += [threading.Thread(target=churn, args=(p,)) for p in ('a', 'b')]
+        # switch threads far more often than the 5 ms default so the
+        # rebuilds interleave with each other and with log()
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-5)
+        try:
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join(timeout=TIMEOUT_BLOCK)
+        finally:
+            sys.setswitchinterval(interval)
+        self.assertFalse(any(t.is_alive() for t in threads), 'a thread hung')
+        L.flush()
+
+        self.assertFalse(errors, f'exception while sinks churned: {errors}')
+        self.assertEqual(stable.count(), N_THREADS * N_MSGS)
+        handlers = [s.handler for s in L.activeSinks['info']]
+        self.assertIn(finals['a'], handlers)
+        self.assertIn(finals['b'], handlers)
+        self.assertGreaterEqual(L._Logger__sinkTable.generation - first, 4 * N_CHURN + 2)
+
 
 # ═══════════════════════════════════════════════════════════════════════════
 # 12 — clear_sinks() under load
@@ -857,6 +926,343 @@ class TestClearSinksUnderLoad(unittest.TestCase):
                          'logger non-functional after clear_sinks() under load')
 
 
+# ═══════════════════════════════════════════════════════════════════════════
+# 13 — group commit
+# ═══════════════════════════════════════════════════════════════════════════
+
+class _WriteCallSink(_GateSink):
+    """Gate sink that also records the number of lines in each write()."""
+
+    def __init__(self):
+        super().__init__()
+        self.writes  = []
+        self.entered = threading.Event()
+
+    def write(self, text):
+        self.entered.set()
+        super().write(text)
+        with self._lock:
+            self.writes.append(text.count('\n'))
+
+
+class TestGroupCommit(unittest.TestCase):
+
+    def _stalled_batch(self, L, sink, n):
+        """Hold the worker on the first record while n more are queued."""
+        sink.close_gate()
+        L.info('first')
+        # wait until the worker is parked inside write('first')
+        self.assertTrue(sink.entered.wait(TIMEOUT_FAST))
+        for i in range(n):
+            L.info('batched %d' % i)
+        sink.open_gate()
+        L.flush()
+
+    def test_queued_records_written_in_one_call(self):
+        L, _ = make_enqueue_logger()
+        L.set_group_commit(True)
+        sink = _WriteCallSink()
+        L.add_sink('batch', sink)
+        self._stalled_batch(L, sink, 50)
+        self.assertEqual(sink.writes, [1, 50])
+        stats = L.batchStatistics
+        self.assertEqual(stats['records'], 51)
+        self.assertEqual(stats['maxBatchSize'], 50)
+        self.assertEqual(stats['batches'], 2)
+
+    def test_batch_preserves_order(self):
+        L, _ = make_enqueue_logger()
+        L.set_group_commit(True)
+        sink = _WriteCallSink()
+        L.add_sink('batch', sink)
+        self._stalled_batch(L, sink, 20)
+        text = ''.join(sink.lines)
+        positions = [text.index('batched %d\n' % i) for i in range(20)]
+        self.assertEqual(positions, sorted(positions))
+
+    def test_batchMaxRecords_caps_batch(self):
+        L, _ = make_enqueue_logger()
+        L.set_group_commit(True, batchMaxRecords=8)
+        sink = _WriteCallSink()
+        L.add_sink('batch', sink)
+        self._stalled_batch(L, sink, 20)
+        self.assertEqual(sum(sink.writes), 21)
+        self.assertTrue(max(sink.writes) <= 8, sink.writes)
+
+    def test_force_log_items_join_the_batch(self):
+        L, buf = make_enqueue_logger(logToStdout=True)
+        L.set_group_commit(True)
+        for i in range(10):
+            L.force_log('debug', 'forced %d' % i, file=False)
+        L.flush()
+        for i in range(10):
+            self.assertIn('forced %d' % i, buf.getvalue())
+
+    def test_group_commit_disabled_by_default(self):
+        L, _ = make_enqueue_logger()
+        self.assertFalse(L.groupCommit)
+        L.info('x'); L.flush()
+        self.assertEqual(L.batchStatistics['batches'], 0)
+
+    def test_invalid_settings_raise(self):
+        L, _ = make_enqueue_logger()
+        with self.assertRaises(TypeError):
+            L.set_group_commit('yes')
+        with self.assertRaises(ValueError):
+            L.set_group_commit(True, batchMaxRecords=0)
+        with self.assertRaises(ValueError):
+            L.set_group_commit(True, batchLatency=-1)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# 14 — per-sink worker lanes
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestSinkWorkers(unittest.TestCase):
+    """sinkWorkers=True gives each sink its own bounded queue and thread."""
+
+    def _make(self, **kwargs):
+        buf = io.StringIO()
+        L = Logger(name='lanes', logToFile=False, stdout=buf,
+                   enqueue=True, sinkWorkers=True, **kwargs)
+        return L, buf
+
+    def test_slow_sink_does_not_stall_siblings(self):
+        """The TestSlowSink scenario: stdout and the fast sink keep flowing."""
+        L, buf = self._make(maxQueueSize=SMALL_QUEUE, queueFullPolicy='drop')
+        gate = _GateSink()
+        fast = _CountSink()
+        L.add_sink('slow', gate)
+        L.add_sink('fast', fast)
+        gate.close_gate()
+        N = SMALL_QUEUE * 4
+        for i in range(N):
+            L.info('msg %d' % i)
+            # the fast and stdout lanes keep up while 'slow' is stalled
+            deadline = time.monotonic() + TIMEOUT_FAST
+            while ((fast.count() < i + 1 or buf.getvalue().count('\n') < i + 1)
+                   and time.monotonic() < deadline):
+                time.sleep(0.001)
+        self.assertEqual(fast.count(), N)
+        self.assertEqual(buf.getvalue().count('\n'), N)
+        gate.open_gate()
+        L.flush()
+        queues = L.sinkQueues
+        self.assertGreater(queues['slow']['droppedMessages'], 0)
+        self.assertEqual(queues['fast']['droppedMessages'], 0)
+        self.assertEqual(L.droppedMessages, queues['slow']['droppedMessages'])
+
+    def test_worker_group_shares_one_lane(self):
+        L, _ = self._make()
+        a, b = _CountSink(), _CountSink()
+        L.add_sink('a', a, workerGroup='disk')
+        L.add_sink('b', b, workerGroup='disk')
+        queues = L.sinkQueues
+        self.assertEqual(queues['a']['worker'], 'disk')
+        self.assertEqual(queues['b']['worker'], 'disk')
+        names = [t.name for t in threading.enumerate()]
+        self.assertEqual(names.count('pysimplelog-writer-disk'), 1)
+        for _ in range(10):
+            L.info('x')
+        L.flush()
+        self.assertEqual((a.count(), b.count()), (10, 10))
+
+    def test_remove_sink_stops_its_lane(self):
+        L, _ = self._make()
+        sink = _CountSink()
+        L.add_sink('gone', sink)
+        L.info('before')
+        worker = [t for t in threading.enumerate() if t.name == 'pysimplelog-writer-gone'][0]
+        L.remove_sink('gone')
+        worker.join(TIMEOUT_FAST)
+        self.assertFalse(worker.is_alive())
+        self.assertEqual(sink.count(), 1)
+        self.assertNotIn('gone', L.sinkQueues)
+
+    def test_record_queued_on_retired_lane_is_written(self):
+        """A log() call that read the table before remove_sink() loses nothing."""
+        L, _ = self._make(logToStdout=False)
+        sink = _CountSink()
+        L.add_sink('late', sink)
+        stale = L._Logger__sinkTable
+        (lane, _), = stale.lanes['info']
+        L.remove_sink('late')
+        lane.worker.join(TIMEOUT_FAST)
+        self.assertTrue(lane.retired)
+        current, L._Logger__sinkTable = L._Logger__sinkTable, stale
+        try:
+            L.info('queued behind the sentinel')
+        finally:
+            L._Logger__sinkTable = current
+        self.assertEqual(sink.count(), 1)
+        self.assertEqual(lane.queue.qsize(), 0)
+        self.assertEqual(lane.queue.unfinished_tasks, 0)
+
+    def test_force_log_reaches_builtin_lanes(self):
+        L, buf = self._make(logToStdout=False)
+        L.force_log('info', 'forced', stdout=True, file=False)
+        L.flush()
+        self.assertIn('forced', buf.getvalue())
+
+    def test_group_commit_per_lane(self):
+        L, _ = self._make(groupCommit=True)
+        sink = _WriteCallSink()
+        L.add_sink('batch', sink)
+        sink.close_gate()
+        L.info('first')
+        self.assertTrue(sink.entered.wait(TIMEOUT_FAST))
+        for i in range(20):
+            L.info('batched %d' % i)
+        sink.open_gate()
+        L.flush()
+        self.assertEqual(sink.writes, [1, 20])
+
+    def test_disabled_without_enqueue(self):
+        L = Logger(name='sync', logToFile=False, stdout=io.StringIO(), sinkWorkers=True)
+        self.assertFalse(L.sinkWorkers)
+        self.assertEqual(L.sinkQueues, {})
+        with self.assertRaises(TypeError):
+            Logger(name='bad', logToFile=False, enqueue=True, sinkWorkers='yes')
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# 15 — ring buffer queue backend
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestRingQueueBackend(unittest.TestCase):
+    """queueBackend='ring' must keep every policy of the queue.Queue backend."""
+
+    def _make(self, **kwargs):
+        return make_enqueue_logger(queueBackend='ring', **kwargs)
+
+    def _fill(self, L, gate, n):
+        """Park the worker inside the gate sink, then log n more records."""
+        gate.close_gate()
+        L.info('parked')
+        deadline = time.monotonic() + TIMEOUT_FAST
+        while L.queueSize and time.monotonic() < deadline:
+            time.sleep(0.001)
+        for _ in range(n):
+            L.info('flood')
+
+    def test_ring_queue_fifo_and_bounds(self):
+        q = _RingQueue(maxsize=2)
+        q.put(1); q.put_nowait(2)
+        with self.assertRaises(queue.Full):
+            q.put_nowait(3)
+        with self.assertRaises(queue.Full):
+            q.put(3, timeout=0.01)
+        self.assertEqual(q.qsize(), 2)
+        self.assertEqual([q.get(), q.get_nowait()], [1, 2])
+        with self.assertRaises(queue.Empty):
+            q.get_nowait()
+        with self.assertRaises(queue.Empty):
+            q.get(timeout=0.01)
+
+    def test_ring_queue_join_waits_for_task_done(self):
+        q    = _RingQueue()
+        seen = []
+
+        def consume():
+            for _ in range(100):
+                seen.append(q.get())
+                q.task_done()
+
+        worker = threading.Thread(target=consume)
+        worker.start()
+        for i in range(100):
+            q.put(i)
+        q.join()
+        self.assertEqual(seen, list(range(100)))
+        worker.join(TIMEOUT_FAST)
+
+    def test_order_preserved_across_producers(self):
+        L, _ = self._make()
+        sink = _GateSink()
+        L.add_sink('ordered', sink)
+
+        def produce(tid):
+            for i in range(200):
+                L.info('%d-%d' % (tid, i))
+
+        threads = [threading.Thread(target=produce, args=(t,)) for t in range(8)]
+        for t in threads: t.start()
+        for t in threads: t.join()
+        L.flush()
+        self.assertEqual(sink.count(), 1600)
+        for tid in range(8):
+            seq = [int(l.rsplit('-', 1)[1]) for l in sink.lines if (' %d-' % tid) in l]
+            self.assertEqual(seq, list(range(200)))
+
+    def test_drop_policy_counts(self):
+        L, _ = self._make(maxQueueSize=SMALL_QUEUE, queueFullPolicy='drop')
+        gate = _GateSink()
+        L.add_sink('gate', gate)
+        self._fill(L, gate, SMALL_QUEUE + 4)
+        self.assertEqual(L.queueSize, SMALL_QUEUE)
+        gate.open_gate()
+        L.flush()
+        self.assertEqual(L.droppedMessages, 4)
+        self.assertEqual(gate.count(), SMALL_QUEUE + 1)
+        self.assertEqual(L.queueSize, 0)
+
+    def test_raise_policy_propagates_full(self):
+        L, _ = self._make(maxQueueSize=SMALL_QUEUE, queueFullPolicy='raise')
+        gate = _GateSink()
+        L.add_sink('gate', gate)
+        self._fill(L, gate, SMALL_QUEUE)
+        with self.assertRaises(queue.Full):
+            L.info('overflow')
+        gate.open_gate()
+        L.flush()
+
+    def test_block_policy_waits_for_slot(self):
+        L, _ = self._make(maxQueueSize=SMALL_QUEUE, queueFullPolicy='block')
+        gate = _GateSink()
+        L.add_sink('gate', gate)
+        self._fill(L, gate, SMALL_QUEUE)
+        done = threading.Event()
+        blocked = threading.Thread(target=lambda: (L.info('late'), done.set()))
+        blocked.start()
+        self.assertFalse(done.wait(0.05))
+        gate.open_gate()
+        self.assertTrue(done.wait(TIMEOUT_FAST))
+        L.flush()
+        self.assertEqual(L.droppedMessages, 0)
+        self.assertEqual(gate.count(), SMALL_QUEUE + 2)
+
+    def test_block_timeout_drops_and_warns(self):
+        L, _ = self._make(maxQueueSize=SMALL_QUEUE, queueFullPolicy='block',
+                          queueBlockTimeout=0.05)
+        gate = _GateSink()
+        L.add_sink('gate', gate)
+        self._fill(L, gate, SMALL_QUEUE)
+        captured, sys.stderr = sys.stderr, io.StringIO()
+        try:
+            L.info('timed out')
+        finally:
+            captured, sys.stderr = sys.stderr, captured
+        gate.open_gate()
+        L.flush()
+        self.assertEqual(L.droppedMessages, 1)
+        self.assertIn('still full', captured.getvalue())
+
+    def test_ring_with_sink_workers_and_group_commit(self):
+        buf = io.StringIO()
+        L = Logger(name='ring', logToFile=False, stdout=buf, enqueue=True,
+                   queueBackend='ring', sinkWorkers=True, groupCommit=True)
+        for i in range(500):
+            L.info('r%d' % i)
+        L.flush()
+        self.assertEqual(buf.getvalue().count('\n'), 500)
+
+    def test_invalid_backend_raises(self):
+        with self.assertRaises(ValueError):
+            Logger(name='bad', logToFile=False, enqueue=True, queueBackend='lmax')
+        with self.assertRaises(TypeError):
+            Logger(name='bad', logToFile=False, enqueue=True, queueBackend=1)
+
+
 # ═══════════════════════════════════════════════════════════════════════════
 # entry point
 # ═══════════════════════════════════════════════════════════════════════════